@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""HW 1 - Tetrominos: Batch solving
+
+CS542
+Michael Lane
+Homework 1: Tetrominos
+Due: 10 April 2017
+
+Solve many instances from one file with a pool of worker processes, so the interpreter and library startup is paid once
+per worker instead of once per instance. Two input formats are understood:
+
+    1. Plain pairs of lines, exactly like the single instance input. Blank lines are ignored. The instance id is its
+       position in the file, starting from 1.
+
+            4 6
+            ITT5LP
+            6 8
+            OOI22TTLLPPP
+
+    2. JSON lines, one instance per line. The id defaults to the line number.
+
+            {"id": "talos", "size": [6, 8], "tiles": "OOI22TTLLPPP"}
+
+The format is picked from the first non-blank character of the file. An instance that can't be read gets an error
+result like an invalid one, and the rest of the batch is solved as usual. Results are streamed back as they are solved,
+either in input order or in completion order, tagged with the instance id:
+
+    $ python3 batch.py instances.txt --workers 8 --unordered --format json
+"""
+
+import argparse
+import json
+import multiprocessing
+import sys
+
+from typing import Iterable, Iterator, Tuple, Union
+
+from tetrominos import BACKENDS, ENGINES, solve
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+__all__ = ['read_instances', 'solve_many']
+
+Instance = Tuple[Union[int, str], Union[Tuple[int, int], None], str]
+
+
+def _read_pairs(lines: Iterator[str]) -> Iterator[Instance]:
+    """
+    Parse plain pairs of lines.
+    :param lines: (iter) The non-blank lines of the file, stripped
+    :return:      (iter) (id, size, tile string) for each instance, with size None and the lines read for one that
+                         can't be read
+    """
+    for number, size_line in enumerate(lines, start=1):
+        tile_string = next(lines, None)
+        if tile_string is None:
+            yield number, None, size_line
+            return
+        try:
+            size = tuple(map(int, size_line.split(' ')))
+        except ValueError:
+            size = ()
+        if len(size) != 2:
+            yield number, None, '{}\n{}'.format(size_line, tile_string)
+            continue
+        yield number, size, tile_string
+
+
+def _read_json_lines(lines: Iterator[str]) -> Iterator[Instance]:
+    """
+    Parse JSON lines.
+    :param lines: (iter) The non-blank lines of the file, stripped
+    :return:      (iter) (id, size, tile string) for each instance, with size None and the line for one that can't be
+                         read
+    """
+    for number, line in enumerate(lines, start=1):
+        try:
+            record = json.loads(line)
+            instance_id, size, tile_string = record.get('id', number), tuple(record['size']), record['tiles']
+        except (ValueError, KeyError, TypeError, AttributeError):
+            yield number, None, line
+            continue
+        if len(size) != 2 or not all(isinstance(n, int) for n in size) or not isinstance(tile_string, str):
+            yield instance_id, None, line
+            continue
+        yield instance_id, size, tile_string
+
+
+def read_instances(lines: Iterable[str]) -> Iterator[Instance]:
+    """
+    Stream the instances from a multi-instance file. See the module docstring for the formats.
+    :param lines: (iter) The lines of the file, e.g. an open file object
+    :return:      (iter) (id, size, tile string) for each instance
+    """
+    lines = (line.strip() for line in lines)
+    lines = (line for line in lines if line)
+    try:
+        first = next(lines)
+    except StopIteration:
+        return
+    lines = _chain(first, lines)
+    if first.startswith('{'):
+        yield from _read_json_lines(lines)
+    else:
+        yield from _read_pairs(lines)
+
+
+def _chain(first: str, rest: Iterator[str]) -> Iterator[str]:
+    yield first
+    yield from rest
+
+
+def _solve_instance(job: Tuple[Instance, str, str]) -> Tuple[Union[int, str], str, Union[str, None]]:
+    """
+    Worker: solve one instance.
+    :param job: (tuple) ((id, size, tile string), backend, engine)
+    :return:    (tuple) (id, output, error). Output is the diagram or '?', error is None unless the instance is invalid.
+    """
+    (instance_id, size, tile_string), backend, engine = job
+    if size is None:
+        return instance_id, '', 'ERROR: could not read instance {} {!r}'.format(instance_id, tile_string)
+    try:
+        return instance_id, solve(size, tile_string, backend=backend, engine=engine), None
+    except ValueError as e:
+        return instance_id, '', str(e)
+
+
+def solve_many(instances: Iterable[Instance], workers: int = None, backend: str = 'bitboard', engine: str = 'tiles',
+               ordered: bool = True, chunksize: int = 1) -> Iterator[Tuple[Union[int, str], str, Union[str, None]]]:
+    """
+    Solve a stream of instances over a pool of worker processes.
+    :param instances: (iter) (id, size, tile string) for each instance, see read_instances
+    :param workers:   (int)  Number of worker processes. Defaults to the number of CPUs.
+    :param backend:   (str)  Board implementation, one of tetrominos.BACKENDS
+    :param engine:    (str)  Search to run, one of tetrominos.ENGINES
+    :param ordered:   (bool) Yield results in input order if True, otherwise as soon as each one is solved
+    :param chunksize: (int)  Number of instances handed to a worker at a time
+    :return:          (iter) (id, output, error) for each instance
+    """
+    jobs = ((instance, backend, engine) for instance in instances)
+    with multiprocessing.Pool(workers) as pool:
+        results = pool.imap(_solve_instance, jobs, chunksize) if ordered \
+            else pool.imap_unordered(_solve_instance, jobs, chunksize)
+        yield from results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Solve many tetromino tiling instances in parallel')
+    parser.add_argument('input', nargs='?', help='Multi-instance file. Read from stdin if omitted.')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: number of CPUs)')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='bitboard',
+                        help='Board implementation to search with (default: bitboard)')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='tiles', help='Search to run (default: tiles)')
+    parser.add_argument('--unordered', action='store_true', help='Print results as they complete')
+    parser.add_argument('--chunksize', type=int, default=1, help='Instances sent to a worker at a time (default: 1)')
+    parser.add_argument('--format', choices=('text', 'json'), default='text',
+                        help='text prints "# id" followed by the diagram, json prints one object per line')
+    args = parser.parse_args()
+
+    source = open(args.input) if args.input else sys.stdin
+    try:
+        results = solve_many(read_instances(source), workers=args.workers, backend=args.backend,
+                             engine=args.engine, ordered=not args.unordered, chunksize=args.chunksize)
+        for instance_id, output, error in results:
+            if args.format == 'json':
+                record = {'id': instance_id, 'output': output}
+                if error is not None:
+                    record['error'] = error
+                print(json.dumps(record), flush=True)
+            else:
+                print('# {}'.format(instance_id))
+                print(error if error is not None else output, flush=True)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+
+if __name__ == '__main__':
+    main()
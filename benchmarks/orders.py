@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark: branching heuristics compared by search nodes
+
+Runs a depth first engine with every combination of cell and value ordering (see heuristics.py) on the benchmark
+corpus and reports the search nodes (tiles placed on the board) per size and outcome bucket. Each search is cut off
+after a node limit. A search that hits it counts the limit as its nodes and is reported as unsettled, so one badly
+ordered instance can't hold up the whole comparison.
+
+Usage:
+
+    $ python3 benchmarks/orders.py [--engine cells] [--limit N]
+"""
+
+import argparse
+import os
+import sys
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from heuristics import CELL_ORDERS, VALUE_ORDERS, SearchOrder  # noqa: E402
+from suite import NodeLimitReached, load_corpus, run_instance, size_bucket  # noqa: E402
+from tetrominos import DFS_ENGINES  # noqa: E402
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+
+
+def orders(engine):
+    """
+    :param engine: (str)           One of tetrominos.DFS_ENGINES
+    :return:       ([SearchOrder]) Every search order the engine accepts
+    """
+    cells = CELL_ORDERS if engine == 'cells' else ('first',)
+    return [SearchOrder(cell, value) for cell in cells for value in VALUE_ORDERS]
+
+
+def compare(instances, engine='cells', limit=20000):
+    """
+    :param instances: ([dict]) The instances, with 'size' and 'tiles' (see suite.load_corpus)
+    :param engine:    (str)    One of tetrominos.DFS_ENGINES
+    :param limit:     (int)    The node limit per search
+    :return:          ({str: {str: [int, int]}}) By order ('cell/value') and bucket: the total nodes and the number of
+                               searches that hit the limit
+    """
+    results = {}
+    for order in orders(engine):
+        totals = defaultdict(lambda: [0, 0])
+        for instance in instances:
+            size = tuple(instance['size'])
+            try:
+                nodes, solved = run_instance(size, instance['tiles'], engine=engine, node_limit=limit, order=order)
+                bucket, unsettled = '{}/{}'.format(size_bucket(size), 'solvable' if solved else 'unsolvable'), 0
+            except NodeLimitReached:
+                bucket, nodes, unsettled = '{}/unsettled'.format(size_bucket(size)), limit, 1
+            for key in (bucket, 'total'):
+                totals[key][0] += nodes
+                totals[key][1] += unsettled
+        results['{}/{}'.format(order.cell, order.value)] = dict(totals)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--engine', choices=DFS_ENGINES, default='cells', help='Search to run (default: cells)')
+    parser.add_argument('--limit', type=int, default=20000, help='Node limit per search (default: 20000)')
+    args = parser.parse_args()
+
+    results = compare(load_corpus(), args.engine, args.limit)
+    print('{:<16} {:<24} {:>10} {:>10}'.format('order', 'bucket', 'nodes', 'unsettled'))
+    for order, totals in results.items():
+        for bucket, (nodes, unsettled) in sorted(totals.items()):
+            print('{:<16} {:<24} {:>10} {:>10}'.format(order, bucket, nodes, unsettled))
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark: full vs incremental partition check
+
+Runs tettile on each instance and, at every search node, times both the full is_valid() check and the incremental
+is_valid(tile, position) check on the same board state. The two results are compared as a sanity check. Reports the
+mean cost per node of each check for both board backends.
+
+Usage:
+
+    $ python3 benchmarks/partition_check.py [--nodes N] [instance files...]
+
+Defaults to the tests/large-test-*.txt instances.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tetrominos import BACKENDS, tettile  # noqa: E402
+from tile import gen_tiles  # noqa: E402
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+
+
+class NodeLimitReached(Exception):
+    pass
+
+
+def timed_board(backend, size, node_limit):
+    """
+    Build a board of the given backend whose is_valid runs and times both the full and the incremental check.
+    :param backend:    (type)       The board class
+    :param size:       (int, int)   The board size
+    :param node_limit: (int)        Stop the search after this many placements
+    :return:           (board)      The instrumented board. Its timings are in board.full_time and board.partial_time
+    """
+    class TimedBoard(backend):
+        nodes = 0
+        full_time = 0.0
+        partial_time = 0.0
+
+        def is_valid(self, tile=None, position=None):
+            start = time.perf_counter()
+            full = super().is_valid()
+            middle = time.perf_counter()
+            partial = super().is_valid(tile, position)
+            end = time.perf_counter()
+            assert full == partial, 'incremental check disagrees with the full check'
+            self.full_time += middle - start
+            self.partial_time += end - middle
+            self.nodes += 1
+            if self.nodes >= node_limit:
+                raise NodeLimitReached()
+            return partial
+
+    return TimedBoard(size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('files', nargs='*', help='Instance files (default: tests/large-test-*.txt)')
+    parser.add_argument('--nodes', type=int, default=20000, help='Search nodes to sample per instance')
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    files = args.files or sorted(glob.glob(os.path.join(root, 'tests', 'large-test-*.txt')))
+
+    print('{:<28} {:<9} {:>7} {:>13} {:>13} {:>8}'.format('instance', 'backend', 'nodes', 'full us/node',
+                                                          'incr us/node', 'speedup'))
+    for path in files:
+        with open(path) as f:
+            size, tile_string = f.read().strip().split('\n')
+        size = tuple(map(int, size.split(' ')))
+        for name, backend in sorted(BACKENDS.items()):
+            board = timed_board(backend, size, args.nodes)
+            try:
+                tettile(board, gen_tiles(tile_string))
+            except NodeLimitReached:
+                pass
+            full = board.full_time / board.nodes * 1e6
+            partial = board.partial_time / board.nodes * 1e6
+            print('{:<28} {:<9} {:>7} {:>13.2f} {:>13.2f} {:>7.1f}x'.format(os.path.basename(path), name, board.nodes,
+                                                                          full, partial, full / partial))
+
+
+if __name__ == '__main__':
+    main()
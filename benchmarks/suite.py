@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark suite: solver timings over a fixed corpus, with a regression baseline
+
+Runs the solver in process on every instance of the corpus and records, per instance, the best wall time over a few
+runs, the number of search nodes (tiles placed on the board) and the peak memory allocated during the search (measured
+with tracemalloc in a separate run, so that tracing doesn't skew the timings).
+
+The corpus is made of
+    - the fixtures in tests/: tests/*-in.txt and tests/*-test-*.txt
+    - generated instances, stored in benchmarks/corpus.json. They are generated from a fixed seed by randomly tiling
+      boards of several sizes (solvable), then changing a few tiles of each until the instance can't be solved
+      (unsolvable, see fuzz.near_miss). Any change to the generated instances must bump CORPUS_VERSION.
+
+Every instance belongs to a size bucket (small, medium, large by board area), an outcome bucket (solvable, unsolvable)
+and a source bucket (fixture, generated). Totals are kept per bucket. Save a baseline, change the code, then check
+against the baseline: any bucket whose time, nodes or peak memory grew by more than the threshold fails the check.
+
+Usage:
+
+    $ python3 benchmarks/suite.py --save benchmarks/baseline.json
+    $ python3 benchmarks/suite.py --check benchmarks/baseline.json --threshold 0.2
+    $ python3 benchmarks/suite.py --generate    # rebuild benchmarks/corpus.json
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fuzz import near_miss, random_tiling  # noqa: E402
+from tetrominos import BACKENDS, ENGINES, passes_prechecks  # noqa: E402
+from tile import gen_tiles  # noqa: E402
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORPUS = os.path.join(ROOT, 'benchmarks', 'corpus.json')
+CORPUS_VERSION = 2
+SEED = 542
+
+# Board sizes of the generated instances, by size bucket
+SIZES = {
+    'small': [(4, 4), (4, 6), (3, 8)],
+    'medium': [(6, 6), (6, 8), (4, 10)],
+    'large': [(8, 8), (8, 10), (10, 10)],
+}
+
+# Generated instances are kept only if the reference search settles them within this many nodes
+NODE_LIMIT = 200000
+
+
+class NodeLimitReached(Exception):
+    pass
+
+
+def counting_board(backend, size, node_limit=None):
+    """
+    Build a board of the given backend that counts the tiles placed on it.
+    :param backend:    (type)       The board class
+    :param size:       (int, int)   The board size
+    :param node_limit: (int)        Raise NodeLimitReached after this many placements, optional
+    :return:           (board)      The board. The count is in board.nodes
+    """
+    class CountingBoard(backend):
+        nodes = 0
+
+        def place_tile(self, tile, position):
+            self.nodes += 1
+            if node_limit is not None and self.nodes > node_limit:
+                raise NodeLimitReached()
+            super().place_tile(tile, position)
+
+    return CountingBoard(size)
+
+
+def size_bucket(size):
+    """
+    :param size: (int, int) The board size
+    :return:     (str)      The size bucket the board falls in
+    """
+    area = size[0] * size[1]
+    if area <= 32:
+        return 'small'
+    if area <= 48:
+        return 'medium'
+    return 'large'
+
+
+def run_instance(size, tile_string, backend='bitboard', engine='cells', node_limit=None, order=None):
+    """
+    Solve one instance in process.
+    :param size:        (int, int) The board size in (row, col) format
+    :param tile_string: (str)      The tile types to place
+    :param backend:     (str)      One of tetrominos.BACKENDS
+    :param engine:      (str)      One of tetrominos.ENGINES
+    :param node_limit:  (int)      Give up after this many nodes, optional (see counting_board)
+    :param order:       (SearchOrder) The branching heuristics of a depth first engine, optional (see heuristics.py)
+    :return:            (int, bool)  The number of nodes and whether a solution was found
+    """
+    if not passes_prechecks(size, tile_string):
+        return 0, False
+    board = counting_board(BACKENDS[backend], size, node_limit)
+    options = {'order': order} if order is not None else {}
+    solution = ENGINES[engine](board, gen_tiles(tile_string), **options)
+    return board.nodes, bool(solution)
+
+
+def measure(instance, backend, engine, repeat):
+    """
+    :param instance: (dict)  The instance, with 'size' and 'tiles'
+    :param backend:  (str)   One of tetrominos.BACKENDS
+    :param engine:   (str)   One of tetrominos.ENGINES
+    :param repeat:   (int)   Keep the best wall time over this many runs
+    :return:         (dict)  wall (s), nodes, peak_bytes and solved
+    """
+    size, tile_string = tuple(instance['size']), instance['tiles']
+    wall = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        nodes, solved = run_instance(size, tile_string, backend, engine)
+        elapsed = time.perf_counter() - start
+        wall = elapsed if wall is None else min(wall, elapsed)
+    tracemalloc.start()
+    run_instance(size, tile_string, backend, engine)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'wall': wall, 'nodes': nodes, 'peak_bytes': peak, 'solved': solved}
+
+
+def settled_unsolvable(size, tile_string):
+    """
+    The reference search's say on a near miss (see fuzz.near_miss), within NODE_LIMIT nodes.
+    :param size:        (int, int) The board size
+    :param tile_string: (str)      The tile types to place
+    :return:            (bool)     True if the search found no solution in time
+    """
+    try:
+        _, solved = run_instance(size, tile_string, node_limit=NODE_LIMIT)
+    except NodeLimitReached:
+        return False
+    return not solved
+
+
+def generate_corpus(seed=SEED, per_size=2):
+    """
+    :param seed:     (int)  The random seed
+    :param per_size: (int)  Solvable (and as many unsolvable) instances per board size
+    :return:         (dict) The corpus, as stored in benchmarks/corpus.json
+    """
+    rng = random.Random(seed)
+    instances = []
+    for sizes in SIZES.values():
+        for size in sizes:
+            for number in range(per_size):
+                tile_string = random_tiling(size, rng)
+                name = 'gen-{}x{}-{}'.format(size[0], size[1], number)
+                instances.append({'id': name + '-pass', 'size': list(size), 'tiles': tile_string})
+                unsolvable = near_miss(size, tile_string, rng, confirm=settled_unsolvable)
+                if unsolvable is not None:
+                    instances.append({'id': name + '-fail', 'size': list(size), 'tiles': unsolvable})
+    return {'version': CORPUS_VERSION, 'seed': seed, 'instances': instances}
+
+
+def load_corpus(path=CORPUS):
+    """
+    :param path: (str)   The generated corpus file
+    :return:     ([dict]) The fixtures followed by the generated instances, each with an id, size, tiles and source
+    """
+    instances = []
+    patterns = [os.path.join(ROOT, 'tests', '*-in.txt'), os.path.join(ROOT, 'tests', '*-test-*.txt')]
+    for name in sorted({f for pattern in patterns for f in glob.glob(pattern)}):
+        with open(name) as f:
+            size, tile_string = f.read().strip().split('\n')
+        instances.append({'id': os.path.basename(name), 'size': list(map(int, size.split(' '))),
+                          'tiles': tile_string, 'source': 'fixture'})
+    with open(path) as f:
+        corpus = json.load(f)
+    if corpus['version'] != CORPUS_VERSION:
+        raise ValueError('ERROR: corpus version {} but the suite expects {}'.format(corpus['version'], CORPUS_VERSION))
+    for instance in corpus['instances']:
+        instances.append(dict(instance, source='generated'))
+    return instances
+
+
+def run_suite(instances, backend='bitboard', engine='cells', repeat=3, report=None):
+    """
+    :param instances: ([dict]) The corpus (see load_corpus)
+    :param backend:   (str)    One of tetrominos.BACKENDS
+    :param engine:    (str)    One of tetrominos.ENGINES
+    :param repeat:    (int)    Runs per instance for the wall time
+    :param report:    (func)   Called with each instance and its result as they finish, optional
+    :return:          (dict)   The results, in the baseline format
+    """
+    results = {}
+    buckets = {}
+    for instance in instances:
+        result = measure(instance, backend, engine, repeat)
+        results[instance['id']] = result
+        outcome = 'solvable' if result['solved'] else 'unsolvable'
+        for bucket in (size_bucket(instance['size']), outcome, instance['source']):
+            total = buckets.setdefault(bucket, {'count': 0, 'wall': 0.0, 'nodes': 0, 'peak_bytes': 0})
+            total['count'] += 1
+            total['wall'] += result['wall']
+            total['nodes'] += result['nodes']
+            total['peak_bytes'] = max(total['peak_bytes'], result['peak_bytes'])
+        if report is not None:
+            report(instance, result)
+    return {'corpus_version': CORPUS_VERSION, 'backend': backend, 'engine': engine,
+            'python': platform.python_version(), 'instances': results, 'buckets': buckets}
+
+
+def regressions(baseline, current, threshold=0.2, min_wall=0.01):
+    """
+    Compare the bucket totals of two runs.
+    :param baseline:  (dict)  The saved results (see run_suite)
+    :param current:   (dict)  The new results
+    :param threshold: (float) Allowed relative growth of each metric, e.g. 0.2 for 20%
+    :param min_wall:  (float) Ignore wall time growth smaller than this many seconds, which is mostly noise
+    :return:          ([str]) One message per regressed bucket and metric
+    """
+    for field in ('corpus_version', 'backend', 'engine'):
+        if baseline[field] != current[field]:
+            raise ValueError('ERROR: the baseline was recorded with {} {}, not {}'.format(field, baseline[field],
+                                                                                          current[field]))
+    found = []
+    for bucket, old in sorted(baseline['buckets'].items()):
+        new = current['buckets'].get(bucket)
+        if new is None:
+            continue
+        for metric in ('wall', 'nodes', 'peak_bytes'):
+            if new[metric] > old[metric] * (1 + threshold):
+                if metric == 'wall' and new[metric] - old[metric] < min_wall:
+                    continue
+                found.append('{}: {} {:.6g} -> {:.6g} (+{:.0%})'.format(bucket, metric, old[metric], new[metric],
+                                                                        new[metric] / old[metric] - 1
+                                                                        if old[metric] else float('inf')))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='bitboard',
+                        help='Board implementation to search with (default: bitboard)')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='cells', help='Search to run (default: cells)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per instance, the best wall time is kept')
+    parser.add_argument('--save', metavar='PATH', help='Write the results to this baseline file')
+    parser.add_argument('--check', metavar='PATH', help='Compare the results to this baseline file')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Allowed relative growth per bucket and metric (default: 0.2)')
+    parser.add_argument('--generate', action='store_true', help='Rebuild {} and exit'.format(CORPUS))
+    args = parser.parse_args()
+
+    if args.generate:
+        with open(CORPUS, 'w') as f:
+            json.dump(generate_corpus(), f, indent=1)
+            f.write('\n')
+        return
+
+    print('{:<28} {:<10} {:>10} {:>10} {:>12} {:>8}'.format('instance', 'bucket', 'wall ms', 'nodes', 'peak KiB',
+                                                            'solved'))
+
+    def report(instance, result):
+        print('{:<28} {:<10} {:>10.2f} {:>10} {:>12.1f} {:>8}'.format(
+            instance['id'], size_bucket(instance['size']), result['wall'] * 1e3, result['nodes'],
+            result['peak_bytes'] / 1024, 'yes' if result['solved'] else 'no'))
+
+    results = run_suite(load_corpus(), args.backend, args.engine, args.repeat, report)
+    print()
+    for bucket, total in sorted(results['buckets'].items()):
+        print('{:<28} {:<10} {:>10.2f} {:>10} {:>12.1f}'.format(bucket, total['count'], total['wall'] * 1e3,
+                                                               total['nodes'], total['peak_bytes'] / 1024))
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=1)
+            f.write('\n')
+    if args.check:
+        with open(args.check) as f:
+            found = regressions(json.load(f), results, args.threshold)
+        for message in found:
+            print('REGRESSION ' + message, file=sys.stderr)
+        if found:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""HW 1 - Tetrominos: Bitboard management
+
+CS542
+Michael Lane
+Homework 1: Tetrominos
+Due: 10 April 2017
+
+An alternative to the numpy backed Board. A board has at most 100 cells, so the whole grid fits comfortably into a
+single Python integer where bit (row * cols + col) is set when that cell is still free. This mirrors the numpy Board
+where a 1 means free and a 0 means covered.
+
+Every legal placement of every orientation of every tile type is precomputed once per board size as an integer mask.
+The table is indexed by the board cell that the tile's anchor (its most northern, most western cell) lands on, so that
+
+    tile_fits:   (free & mask) == mask
+    place_tile:  free ^= mask
+    remove_tile: free |= mask
+
+The search order of tile_can_be_placed is the same as the numpy Board, so tettile produces identical solutions with
+either backend.
+"""
+
+from functools import lru_cache
+
+from typing import Dict, Iterable, List, Tuple, Union
+
+from output import gen_board_output
+from tile import Orientation, Tile, SHAPES, TILE_TYPES
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+__all__ = ['BitBoard', 'placement_table']
+
+
+def popcount(bits: int) -> int:
+    """
+    Count the set bits of a non-negative integer.
+    :param bits: (int) The bitmask
+    :return:     (int) The number of 1 bits
+    """
+    return bin(bits).count('1')
+
+
+def iter_bits(bits: int):
+    """
+    Yield the index of every set bit from least to most significant. For a board mask this is the same northwest to
+    southeast scan order that numpy's argwhere uses.
+    :param bits: (int) The bitmask
+    :return:     (generator) Bit indices
+    """
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+@lru_cache(maxsize=None)
+def placement_table(size: Tuple[int, int]) -> Dict[Orientation, Tuple[Tuple[int, int], Tuple[int, ...]]]:
+    """
+    Precompute every legal placement mask for a board of a given size. The result maps each Orientation in the shape
+    library to (anchor, masks) where anchor is the (row, col) offset of the anchor inside the tile and masks has one
+    entry per board cell: the set of cells covered when the tile's anchor lands on that cell, or 0 if the tile would
+    hang off the board. Computed once per board size.
+    :param size: (int, int) The board size in (row, col) format
+    :return:     (dict)     {Orientation: ((anchor_row, anchor_col), (mask, ...))}
+    """
+    rows, cols = size
+    table = {}
+    for orientations in SHAPES.values():
+        for orientation in orientations:
+            anchor_row, anchor_col = orientation.cells[0]
+            offsets = [(r - anchor_row, c - anchor_col) for r, c in orientation.cells]
+            masks = []
+            for cell in range(rows * cols):
+                row, col = divmod(cell, cols)
+                mask = 0
+                for dr, dc in offsets:
+                    r, c = row + dr, col + dc
+                    if not (0 <= r < rows and 0 <= c < cols):
+                        mask = 0
+                        break
+                    mask |= 1 << (r * cols + c)
+                masks.append(mask)
+            table[orientation] = ((anchor_row, anchor_col), tuple(masks))
+    return table
+
+
+class BitBoard:
+    """The game board class, backed by a single integer bitmask
+
+    Drop in replacement for Board. Positions are (row, col) tuples of the top left corner of the tile's bounding box
+    just like the numpy Board. Tiles may be passed either as Tile objects or as Orientation records.
+    """
+
+    def __init__(self, size: Tuple[int, int] = (4, 6)) -> None:
+        """
+        Initialize the game board for a given size
+        :param size: Size is a tuple that corresponds to the shape of the board in (row, col) format.
+        """
+        self.board_size = size
+        self.rows, self.cols = size
+        self.num_cells = self.rows * self.cols
+        self.full = (1 << self.num_cells) - 1
+        self.free = self.full
+        self.placements = placement_table(size)
+        # Masks used to stop the flood fill from wrapping around from one row onto the next
+        first_col = sum(1 << (r * self.cols) for r in range(self.rows))
+        self.not_first_col = self.full & ~first_col
+        self.not_last_col = self.full & ~(first_col << (self.cols - 1))
+
+    def __str__(self) -> str:
+        """
+        Outputs the current board in the same format as Board.
+        :return: (str) Printable representation of the board
+        """
+        return '\n'.join(''.join('1' if self.free >> (r * self.cols + c) & 1 else '0' for c in range(self.cols))
+                         for r in range(self.rows))
+
+    def is_solved(self) -> bool:
+        return self.free == 0
+
+    def occupancy(self) -> int:
+        """
+        :return: (int) The free cells as an integer bitmask, see Board.occupancy
+        """
+        return self.free
+
+    def free_cells(self) -> List[Tuple[int, int]]:
+        """
+        :return: ([(int, int)]) The (row, col) of every free cell in a left-to-right, top-to-bottom scan of the board
+        """
+        return [divmod(cell, self.cols) for cell in iter_bits(self.free)]
+
+    def first_empty(self) -> Union[Tuple[int, int], None]:
+        """
+        Find the first free cell in a left-to-right, top-to-bottom scan of the board.
+        :return: (int, int) The (row, col) of the first free cell or None if the board is full
+        """
+        if not self.free:
+            return None
+        return divmod((self.free & -self.free).bit_length() - 1, self.cols)
+
+    def _mask(self, tile: Tile, position: Tuple[int, int]) -> int:
+        """
+        Look up the placement mask for a tile whose bounding box has its top left corner at position.
+        :param tile:     (Tile)     The Tile object
+        :param position: (int, int) The location of the top left cell in (row, col) format
+        :return:         (int)      The placement mask, or 0 if the tile does not lie on the board
+        """
+        (anchor_row, anchor_col), masks = self.placements[tile.orientation]
+        row = position[0] + anchor_row
+        col = position[1] + anchor_col
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return 0
+        return masks[row * self.cols + col]
+
+    def tile_can_be_placed(self, tile: Tile) -> Union[Tuple[int, int], bool]:
+        (anchor_row, anchor_col), masks = self.placements[tile.orientation]
+        free = self.free
+        for cell in iter_bits(free):
+            mask = masks[cell]
+            if mask and free & mask == mask:
+                row, col = divmod(cell, self.cols)
+                return row - anchor_row, col - anchor_col
+        return False
+
+    def get_potential_locations(self, tile: Tile) -> List[Tuple[int, int]]:
+        """
+        See Board.get_potential_locations. Every free cell shifted by the tile's anchor, dropping any that fall off the
+        left or top edge of the board.
+        :param tile: (Tile)               The tile to consider
+        :return:     ([(int, int), ...])  A list of placement points for a given tile
+        """
+        anchor_row, anchor_col = tile.cells[0]
+        locations = []
+        for cell in iter_bits(self.free):
+            row, col = divmod(cell, self.cols)
+            if row >= anchor_row and col >= anchor_col:
+                locations.append((row - anchor_row, col - anchor_col))
+        return locations
+
+    def _fitting_masks(self, tile_types: Iterable[str]):
+        """
+        :param tile_types: (str)       The tile types to consider
+        :return:           (generator) (Orientation, mask) for every placement of those types that fits
+        """
+        free = self.free
+        for tile_type in set(tile_types):
+            for orientation in SHAPES[tile_type]:
+                masks = self.placements[orientation][1]
+                for cell in iter_bits(free):
+                    mask = masks[cell]
+                    if mask and free & mask == mask:
+                        yield orientation, mask
+
+    def coverage_counts(self, tile_types: Iterable[str] = TILE_TYPES) -> List[List[int]]:
+        """
+        See Board.coverage_counts.
+        :param tile_types: (str)     The tile types to consider. Defaults to all of them.
+        :return:           ([[int]]) The counts, indexed [row][col]
+        """
+        counts = [0] * self.num_cells
+        for _, mask in self._fitting_masks(tile_types):
+            for cell in iter_bits(mask):
+                counts[cell] += 1
+        return [counts[r * self.cols:(r + 1) * self.cols] for r in range(self.rows)]
+
+    def placement_counts(self, tile_types: Iterable[str] = TILE_TYPES) -> Dict[str, int]:
+        """
+        See Board.placement_counts.
+        :param tile_types: (str)  The tile types to consider. Defaults to all of them.
+        :return:           (dict) {tile type: the number of placements of that type that fit}
+        """
+        totals = dict.fromkeys(set(tile_types), 0)
+        for orientation, _ in self._fitting_masks(totals):
+            totals[orientation.type] += 1
+        return totals
+
+    def tile_fits(self, tile: Tile, position: Tuple[int, int]) -> bool:
+        """
+        Determines if a given Tile fits at a given board location.
+        :param tile:     (Tile)     The Tile object to be checked
+        :param position: (int, int) The location of the top left cell in (row, col) format
+        :return:         (bool)     True if the Tile fits at the location, otherwise False
+        """
+        mask = self._mask(tile, position)
+        return mask != 0 and self.free & mask == mask
+
+    def place_tile(self, tile: Tile, position: Tuple[int, int]) -> None:
+        """
+        Places a Tile at a desired position. This modifies the object's board.
+        :param tile:     (Tile)     The Tile object to be placed
+        :param position: (int, int) The location of the top left cell in (row, col) format
+        :return:         (None)
+        """
+        self.free ^= self._mask(tile, position)
+
+    def remove_tile(self, tile: Tile, position: Tuple[int, int]) -> Tile:
+        """
+        Removes a Tile at a desired position. This modifies the object's board.
+        :param tile:     (Tile)     The Tile object to be removed
+        :param position: (int, int) The location of the top left cell in (row, col) format
+        :return:         (Tile)     The removed tile
+        """
+        self.free |= self._mask(tile, position)
+        return tile
+
+    def grow(self, region: int) -> int:
+        """
+        Grow a region by one cell in all four directions.
+        :param region: (int) Bitmask of the region
+        :return:       (int) Bitmask of the region and all of its neighbors
+        """
+        return (region | ((region << 1) & self.not_first_col) | ((region >> 1) & self.not_last_col)
+                | (region << self.cols) | (region >> self.cols)) & self.full
+
+    def flood(self, seed: int, free: int) -> int:
+        """
+        Grow a region from the seed bits through the free cells, one step in all four directions at a time.
+        :param seed: (int) Bitmask of the starting cell(s)
+        :param free: (int) Bitmask of the cells the region may grow into
+        :return:     (int) Bitmask of the connected region
+        """
+        region = seed & free
+        while True:
+            grown = self.grow(region) & free
+            if grown == region:
+                return region
+            region = grown
+
+    def is_valid(self, tile: Tile = None, position: Tuple[int, int] = None) -> bool:
+        """
+        Determine if we should keep searching for a fit for a given board state. Every connected group of free cells
+        must contain a multiple of 4 cells.
+
+        If the tile that was just placed and its position are given, only the groups of free cells touching that tile
+        are checked (see partition_is_valid). Otherwise every group on the board is flood filled.
+        :param tile:     (Tile)     The tile that was just placed, optional
+        :param position: (int, int) Where that tile was placed, optional
+        :return:         (bool)     False if the search should not continue, otherwise True
+        """
+        if tile is not None:
+            return self.partition_is_valid(tile, position)
+        remaining = self.free
+        while remaining:
+            region = self.flood(remaining & -remaining, remaining)
+            if popcount(region) % 4 != 0:
+                return False
+            remaining ^= region
+        return True
+
+    def partition_is_valid(self, tile: Tile, position: Tuple[int, int]) -> bool:
+        """
+        Incremental version of is_valid, see Board.partition_is_valid. Only the groups touching the tile that was just
+        placed are flood filled, and the fill stops as soon as the current group has absorbed every remaining free
+        neighbor of the tile since the last group is then known to be a multiple of 4.
+
+        NOTE: This relies on the board having been valid before the tile was placed.
+        :param tile:     (Tile)     The tile that was just placed
+        :param position: (int, int) Where that tile was placed
+        :return:         (bool)     False if the search should not continue, otherwise True
+        """
+        free = self.free
+        seeds = self.grow(self._mask(tile, position)) & free
+        while seeds:
+            region = seeds & -seeds
+            while seeds & ~region:
+                grown = self.grow(region) & free
+                if grown == region:
+                    break
+                region = grown
+            else:
+                # This group holds every remaining neighbor so it is the last group to check
+                return True
+            if popcount(region) % 4 != 0:
+                return False
+            seeds &= ~region
+        return True
+
+    gen_board_output = staticmethod(gen_board_output)
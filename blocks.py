@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""HW 1 - Tetrominos: Constructive tiling of large boards
+
+CS542
+Michael Lane
+Homework 1: Tetrominos
+Due: 10 April 2017
+
+The exact searches are hopeless on a 100x100 board, but such a board doesn't need to be searched as a whole. Cut it
+into blocks of about 6x6, deal every block its share of the tiles, tile each block on its own and put the pieces back
+together. A 6x6 block with an ordinary mix of 9 tiles is solved by the cells engine in a few milliseconds.
+
+    1. Cut. Each side is split into parts of 6 (or 8, and a few other sizes where 6 and 8 don't add up). When one side
+       is odd the other is a multiple of 4 and is split into parts of 8 or 4 instead, so every block has a number of
+       cells divisible by 4 and an even side, which means it needs an even number of Ts.
+    2. Deal. The blocks are dealt their tiles in turn, each getting the remaining tiles of each type in proportion to
+       its size (rounded, with the Ts kept in pairs). The last block gets whatever is left.
+    3. Solve. Every distinct (block shape, tiles) pair is solved once by the cells engine with the region pruner and a
+       node budget, over a pool of worker processes when there are several.
+    4. Repair. A block whose tiles can't be placed within the budget swaps tiles of one type for another type with the
+       other blocks, a tile at a time (a pair at a time for Ts), until both blocks of a swap can be solved.
+    5. Fall back. A block that still fails is merged with its neighbors in its band of blocks, and the merged
+       rectangle is searched exactly with a larger budget, growing to the whole band if need be.
+    6. Stitch. The placements of each block are moved to where the block sits on the board.
+
+The result is a list of placements like any other engine's, and the output module labels any number of tiles. The
+tiler can't prove that a large instance has no solution: unless the failing rectangle is the whole board, giving up
+means UNKNOWN rather than '?'.
+"""
+
+import argparse
+import multiprocessing
+
+from typing import Dict, List, Tuple, Union
+
+from bitboard import BitBoard
+from limits import SearchInterrupted, SearchLimits, limited
+from output import gen_board_output
+from pruning import RegionPruner
+from tile import gen_tiles, tile_counts, Orientation, Tile, SHAPES, TILE_TYPES
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+__all__ = ['tettile_blocks', 'solve_blocks', 'split_board', 'deal']
+
+# (position, tile type, orientation index), which pickles much smaller than Orientation objects
+Placement = Tuple[Tuple[int, int], str, int]
+Block = Tuple[int, int, int, int]
+
+# The cost of each part size when splitting a side of the board, lower is better. 6x6 blocks are the sweet spot:
+# big enough to take almost any mix of tiles, small enough to search in milliseconds.
+EVEN_PARTS = {6: 0, 8: 1, 4: 4, 10: 4, 2: 8}
+QUAD_PARTS = {8: 0, 4: 2, 12: 3}
+ANY_PARTS = {6: 0, 5: 1, 7: 1, 8: 2, 4: 3, 9: 4, 3: 6, 2: 8, 1: 10}
+# Search budgets in nodes: for a block, and for a merged rectangle (per block in it)
+BLOCK_NODES = 20000
+MERGE_NODES = 100000
+# The most exact solves spent swapping tiles between blocks, per failing block
+REPAIR_TRIES = 60
+# Fewer distinct blocks than this are solved in this process, a pool would take longer to start than they take to solve
+PARALLEL_JOBS = 8
+T_INDEX = TILE_TYPES.index('T')
+
+
+def _parts(n: int, costs: Dict[int, int]) -> List[int]:
+    """
+    :param n:     (int)        The length of a side of the board
+    :param costs: ({int: int}) The allowed part sizes and their costs
+    :return:      ([int])      The cheapest split of the side into parts, or [n] if it can't be split
+    """
+    best = {0: (0, [])}
+    for length in range(1, n + 1):
+        options = [(best[length - part][0] + cost, best[length - part][1] + [part])
+                   for part, cost in costs.items() if part <= length and length - part in best]
+        if options:
+            best[length] = min(options)
+    return sorted(best[n][1], reverse=True) if n in best else [n]
+
+
+def split_board(size: Tuple[int, int]) -> List[List[Block]]:
+    """
+    Cut the board into blocks that each have a number of cells divisible by 4 and an even side.
+    :param size: (int, int) The board size in (row, col) format. rows * cols must be divisible by 4.
+    :return:     ([[(int, int, int, int)]]) The (top, left, rows, cols) of each block, as a list of bands of blocks
+    """
+    rows, cols = size
+    if rows % 2 == 0 and cols % 2 == 0:
+        row_parts, col_parts = _parts(rows, EVEN_PARTS), _parts(cols, EVEN_PARTS)
+    elif cols % 4 == 0:
+        row_parts, col_parts = _parts(rows, ANY_PARTS), _parts(cols, QUAD_PARTS)
+    else:
+        row_parts, col_parts = _parts(rows, QUAD_PARTS), _parts(cols, ANY_PARTS)
+    bands = []
+    top = 0
+    for height in row_parts:
+        band = []
+        left = 0
+        for width in col_parts:
+            band.append((top, left, height, width))
+            left += width
+        bands.append(band)
+        top += height
+    return bands
+
+
+def deal(blocks: List[Block], counts: List[int]) -> List[List[int]]:
+    """
+    Deal the tiles to the blocks in proportion to their sizes, keeping the Ts in pairs.
+    :param blocks: ([(int, int, int, int)]) The blocks, see split_board
+    :param counts: ([int])  The number of tiles of each type, indexed like tile.TILE_TYPES. The Ts must be even.
+    :return:       ([[int]]) The tile counts of each block
+    """
+    remaining = list(counts)
+    hands = []
+    for number, (_, _, rows, cols) in enumerate(blocks):
+        size = rows * cols // 4
+        total = sum(remaining)
+        if number == len(blocks) - 1 or total == size:
+            hands.append(remaining)
+            break
+        shares = [count * size / total for count in remaining]
+        hand = [0] * len(TILE_TYPES)
+        # Ts in pairs, rounded to the nearest pair
+        hand[T_INDEX] = min(2 * round(shares[T_INDEX] / 2), remaining[T_INDEX], size - size % 2)
+        # The rest by largest remainder
+        others = [index for index in range(len(TILE_TYPES)) if index != T_INDEX]
+        for index in others:
+            hand[index] = min(int(shares[index]), remaining[index])
+        if sum(hand) > size:
+            hand[T_INDEX] -= 2
+        order = sorted(others, key=lambda index: shares[index] - hand[index], reverse=True)
+        while sum(hand) < size:
+            for index in order:
+                if sum(hand) < size and hand[index] < remaining[index]:
+                    hand[index] += 1
+            if all(hand[index] == remaining[index] for index in others):
+                hand[T_INDEX] += size - sum(hand)
+        hands.append(hand)
+        remaining = [left - dealt for left, dealt in zip(remaining, hand)]
+    return hands
+
+
+def _solve_block(shape: Tuple[int, int], counts: Tuple[int, ...], max_nodes: int) -> Union[List[Placement], None]:
+    """
+    Tile a rectangle exactly, within a node budget.
+    :param shape:     (int, int) The rectangle's size in (row, col) format
+    :param counts:    ((int, ))  The tiles to place, indexed like tile.TILE_TYPES
+    :param max_nodes: (int)      The search budget
+    :return:          ([((int, int), str, int)]) The placements, [] if there are none or None if the budget ran out
+    """
+    # Imported here because tetrominos registers this module as an engine
+    from tetrominos import tettile_cells
+    board = limited(BitBoard, SearchLimits(max_nodes=max_nodes))(shape)
+    tiles = gen_tiles(''.join(tile_type * count for tile_type, count in zip(TILE_TYPES, counts)))
+    try:
+        solution = tettile_cells(board, tiles, pruner=RegionPruner(shape))
+    except SearchInterrupted:
+        return None
+    return [((int(row), int(col)), tile.orientation.type, tile.orientation.index) for (row, col), tile in solution]
+
+
+def _solve_job(job: Tuple[Tuple[int, int], Tuple[int, ...], int]) -> Union[List[Placement], None]:
+    return _solve_block(*job)
+
+
+class _Tiler:
+    """The state of one constructive tiling: the blocks, their tiles and their solutions"""
+
+    def __init__(self, size: Tuple[int, int], counts: List[int], workers: int) -> None:
+        self.size = size
+        self.bands = split_board(size)
+        self.blocks = [block for band in self.bands for block in band]
+        self.hands = deal(self.blocks, counts)
+        self.workers = workers
+        # Every job solved so far, by (shape, tiles, budget). Kept here rather than in a cache of _solve_block so it
+        # goes away with the tiling instead of growing for as long as the process lives.
+        self.solved = {}  # type: Dict[Tuple[Tuple[int, int], Tuple[int, ...], int], Union[List[Placement], None]]
+        # The merged rectangles, by the numbers of the blocks they cover. Their tiles are fixed once merged.
+        self.merged = {}  # type: Dict[Tuple[int, ...], Tuple[Block, List[Placement]]]
+        # Whether the failed merge covered the whole board, proving there is no solution
+        self.proved_dead = False
+
+    def solve_all(self, jobs: List[Tuple[Tuple[int, int], Tuple[int, ...], int]]) -> None:
+        """Solve the jobs that haven't been solved yet, in parallel if there are several"""
+        jobs = [job for job in dict.fromkeys(jobs) if job not in self.solved]
+        if len(jobs) >= PARALLEL_JOBS and self.workers != 1:
+            with multiprocessing.Pool(self.workers) as pool:
+                results = pool.map(_solve_job, jobs)
+        else:
+            results = [_solve_job(job) for job in jobs]
+        self.solved.update(zip(jobs, results))
+
+    def job(self, block: Block, hand: List[int], max_nodes: int = BLOCK_NODES):
+        return (block[2], block[3]), tuple(hand), max_nodes
+
+    def solution(self, number: int) -> Union[List[Placement], None]:
+        """The solution of a block with its current tiles, [] or None if it has none"""
+        job = self.job(self.blocks[number], self.hands[number])
+        if job not in self.solved:
+            self.solve_all([job])
+        return self.solved[job]
+
+    def repair(self, number: int) -> bool:
+        """
+        Swap tiles between a failing block and the others until both blocks of a swap can be solved.
+        :return: (bool) True if the block was repaired
+        """
+        tries = 0
+        hand = self.hands[number]
+        covered = {block for numbers in self.merged for block in numbers}
+        for other, other_hand in enumerate(self.hands):
+            # The tiles of a merged block went into its rectangle's solution, they can't be swapped any more
+            if other == number or other in covered:
+                continue
+            for give in range(len(TILE_TYPES)):
+                for take in range(len(TILE_TYPES)):
+                    step = 2 if T_INDEX in (give, take) else 1
+                    if give == take or hand[give] < step or other_hand[take] < step:
+                        continue
+                    new_hand, new_other = list(hand), list(other_hand)
+                    new_hand[give] -= step
+                    new_hand[take] += step
+                    new_other[take] -= step
+                    new_other[give] += step
+                    tries += 1
+                    self.hands[number], self.hands[other] = new_hand, new_other
+                    if self.solution(number) and self.solution(other):
+                        return True
+                    self.hands[number], self.hands[other] = hand, other_hand
+                    if tries >= REPAIR_TRIES:
+                        return False
+        return False
+
+    def merge(self, number: int) -> Union[Tuple[List[int], Block, List[Placement]], None]:
+        """
+        Search the block together with its neighbors in its band, growing the merged rectangle to the whole band. A
+        rectangle that reaches into an earlier merged rectangle takes all of it in.
+        :return: (([int], block, placements)) The numbers of the blocks the merged rectangle covers, the rectangle and
+                                              its placements, or None if it couldn't be solved
+        """
+        band = next(band for band in self.bands if self.blocks[number] in band)
+        first = band.index(self.blocks[number])
+        start, stop = first, first + 1
+        while True:
+            start, stop = max(start - 1, 0), min(stop + 1, len(band))
+            for numbers in self.merged:
+                members = [band.index(self.blocks[n]) for n in numbers if self.blocks[n] in band]
+                if members and min(members) < stop and max(members) >= start:
+                    start, stop = min(start, min(members)), max(stop, max(members) + 1)
+            numbers = [self.blocks.index(block) for block in band[start:stop]]
+            top, left, rows, _ = band[start]
+            cols = sum(block[3] for block in band[start:stop])
+            hand = [sum(counts) for counts in zip(*[self.hands[n] for n in numbers])]
+            job = self.job((top, left, rows, cols), hand, MERGE_NODES * len(numbers))
+            self.solve_all([job])
+            placements = self.solved[job]
+            if placements:
+                return numbers, (top, left, rows, cols), placements
+            if start == 0 and stop == len(band):
+                self.proved_dead = placements == [] and len(self.bands) == 1
+                return None
+
+    def run(self) -> Union[List[Tuple[Tuple[int, int], Orientation]], None]:
+        self.solve_all([self.job(block, hand) for block, hand in zip(self.blocks, self.hands)])
+        for number in range(len(self.blocks)):
+            # A merged block's tiles are part of its rectangle, changing them here would change the tiles on the board
+            if any(number in numbers for numbers in self.merged):
+                continue
+            if self.solution(number) or self.repair(number):
+                continue
+            result = self.merge(number)
+            if result is None:
+                return [] if self.proved_dead else None
+            numbers, block, placements = result
+            # Earlier rectangles the new one took in
+            for group in [group for group in self.merged if set(group) <= set(numbers)]:
+                del self.merged[group]
+            self.merged[tuple(numbers)] = (block, placements)
+        covered = {number for numbers in self.merged for number in numbers}
+        pieces = [(block, self.solution(number)) for number, block in enumerate(self.blocks) if number not in covered]
+        pieces.extend(self.merged.values())
+        # Stitch
+        solution = []
+        for (top, left, _, _), placements in pieces:
+            for (row, col), tile_type, index in placements:
+                solution.append(((top + row, left + col), SHAPES[tile_type][index]))
+        return solution
+
+
+def tettile_blocks(board: BitBoard, tiles: List[Tile], workers: int = None) -> Union[
+        List[Tuple[Tuple[int, int], Orientation]], None]:
+    """Tile a large board block by block, see the module docstring
+
+    :param board:   (BitBoard) The board to tile, only its size is used
+    :param tiles:   ([Tile])   The tiles to place
+    :param workers: (int)      Number of worker processes. Defaults to the number of CPUs, 1 solves in this process.
+    :return:        ([((int, int), Orientation)]) The placements, [] if there is certainly no solution or None if the
+                               tiler gave up
+    """
+    counts = tile_counts(tiles)
+    if counts[T_INDEX] % 2:
+        return []
+    return _Tiler(board.board_size, counts, workers).run()
+
+
+def solve_blocks(size: Tuple[int, int], tile_string: str, workers: int = None) -> str:
+    """
+    Solve a single instance block by block and return the printable result.
+    :return: (str) The solution diagram, '?' if there is certainly no solution or UNKNOWN if the tiler gave up
+    """
+    # Imported here because tetrominos registers this module as an engine
+    from tetrominos import passes_prechecks
+    if not passes_prechecks(size, tile_string):
+        return '?'
+    return gen_board_output(size, tettile_blocks(BitBoard(size), gen_tiles(tile_string), workers=workers))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tile a large board block by block')
+    parser.add_argument('input', nargs='?', help='Instance file. Read from stdin if omitted.')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: number of CPUs)')
+    args = parser.parse_args()
+
+    from tetrominos import read_instance
+    size, tile_string = read_instance(args.input)
+    print(solve_blocks(size, tile_string, workers=args.workers))
+
+
+if __name__ == '__main__':
+    main()
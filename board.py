@@ -27,10 +27,11 @@ import re
 import string
 
 import numpy as np
-from scipy.ndimage.measurements import label
-from typing import Tuple, List, Union
+from numpy.lib.stride_tricks import as_strided
+from typing import Dict, Iterable, Tuple, List, Union
 
-from tile import Tile, tile_factory
+from output import gen_board_output
+from tile import Orientation, Tile, SHAPES, TILE_TYPES, tile_factory
 
 __author__ = "Michael Lane"
 __email__ = "mikelane@gmail.com"
@@ -65,11 +66,109 @@ class Board:
     def is_solved(self):
         return self.board.sum() == 0
 
-    def tile_can_be_placed(self, tile: Tile) -> Union[np.ndarray, bool]:
-        for location in self.get_potential_locations(tile):
-            if self.tile_fits(tile, location):
-                return location
-        return False
+    def occupancy(self) -> int:
+        """
+        The free cells as an integer bitmask, bit (row * cols + col) set when that cell is free. Same as BitBoard.free.
+        :return: (int) The bitmask
+        """
+        cells = self.board.ravel()[::-1].astype(np.uint8)
+        return int.from_bytes(np.packbits(cells).tobytes(), 'big') >> (-cells.size % 8)
+
+    def free_cells(self) -> List[Tuple[int, int]]:
+        """
+        :return: ([(int, int)]) The (row, col) of every free cell in a left-to-right, top-to-bottom scan of the board
+        """
+        return [(int(r), int(c)) for r, c in np.argwhere(self.board == 1)]
+
+    def first_empty(self) -> Union[Tuple[int, int], None]:
+        """
+        Find the first free cell in a left-to-right, top-to-bottom scan of the board.
+        :return: (int, int) The (row, col) of the first free cell or None if the board is full
+        """
+        index = int(self.board.argmax())
+        if self.board.flat[index] != 1:
+            return None
+        return divmod(index, self.board_size[1])
+
+    def tile_can_be_placed(self, tile: Tile) -> Union[Tuple[int, int], bool]:
+        """
+        Find the first position, in a left-to-right, top-to-bottom scan, where the tile fits. This is the first of the
+        candidates from get_potential_locations that passes tile_fits, found with a single fit_map.
+        :param tile: (Tile)       The tile to place
+        :return:     ((int, int)) The position or False if the tile fits nowhere
+        """
+        fits = self.fit_map(tile)
+        if not fits.any():
+            return False
+        return divmod(int(fits.argmax()), fits.shape[1])
+
+    def _windows(self, shape: Tuple[int, int]) -> np.ndarray:
+        """
+        Every tile sized window of the board, as a read only view (the same view as numpy's sliding_window_view, without
+        its argument checking, which costs more than the fit test itself on a 10x10 board).
+        :param shape: (int, int)  The (rows, cols) of the window
+        :return:      (np.ndarray) Array of shape (rows - shape[0] + 1, cols - shape[1] + 1, shape[0], shape[1])
+        """
+        rows, cols = self.board.shape
+        return as_strided(self.board, (rows - shape[0] + 1, cols - shape[1] + 1) + tuple(shape),
+                          self.board.strides * 2, writeable=False)
+
+    def fit_map(self, tile: Tile) -> np.ndarray:
+        """
+        Where does the tile fit? Correlates the board with the tile's face: a tile fits where all 4 of its cells are
+        free.
+        :param tile: (Tile)       The tile to consider
+        :return:     (np.ndarray) Boolean array, True at each (row, col) position where tile_fits would be True
+        """
+        rows, cols = self.board.shape
+        if tile.shape[0] > rows or tile.shape[1] > cols:
+            return np.zeros((max(rows - tile.shape[0] + 1, 0), max(cols - tile.shape[1] + 1, 0)), dtype=bool)
+        return np.einsum('ijkl,kl->ij', self._windows(tile.shape), tile.face) == 4
+
+    def fit_maps(self, tile_types: Iterable[str] = TILE_TYPES) -> Dict[Orientation, np.ndarray]:
+        """
+        fit_map for every orientation of the given tile types. Orientations with the same bounding box are correlated
+        with the board together, in one pass.
+        :param tile_types: (str)  The tile types to consider, e.g. the remaining ones. Defaults to all of them.
+        :return:           (dict) {Orientation: fit map}
+        """
+        by_shape = {}
+        for tile_type in set(tile_types):
+            for orientation in SHAPES[tile_type]:
+                by_shape.setdefault(orientation.shape, []).append(orientation)
+        maps = {}
+        rows, cols = self.board.shape
+        for shape, orientations in by_shape.items():
+            if shape[0] > rows or shape[1] > cols:
+                maps.update((orientation, self.fit_map(orientation)) for orientation in orientations)
+                continue
+            faces = np.stack([orientation.face for orientation in orientations])
+            fits = np.einsum('ijkl,nkl->nij', self._windows(shape), faces) == 4
+            maps.update(zip(orientations, fits))
+        return maps
+
+    def coverage_counts(self, tile_types: Iterable[str] = TILE_TYPES) -> np.ndarray:
+        """
+        For every cell, the number of placements of the given tile types that fit and cover it. A free cell with a
+        count of 0 can't be covered any more.
+        :param tile_types: (str)        The tile types to consider. Defaults to all of them.
+        :return:           (np.ndarray) The counts, shaped like the board
+        """
+        counts = np.zeros(self.board.shape, dtype=int)
+        for orientation, fits in self.fit_maps(tile_types).items():
+            for r, c in orientation.cells:
+                counts[r:r + fits.shape[0], c:c + fits.shape[1]] += fits
+        return counts
+
+    def placement_counts(self, tile_types: Iterable[str] = TILE_TYPES) -> Dict[str, int]:
+        """
+        :param tile_types: (str)  The tile types to consider. Defaults to all of them.
+        :return:           (dict) {tile type: the number of placements of that type that fit}
+        """
+        totals = dict.fromkeys(set(tile_types), 0)
+        for orientation, fits in self.fit_maps(totals).items():
+            totals[orientation.type] += int(fits.sum())
+        return totals
 
     def get_potential_locations(self, tile: Tile) -> np.ndarray:
         """
@@ -149,12 +248,21 @@ class Board:
         self.board[position[0]:position[0] + tile.shape[0], position[1]:position[1] + tile.shape[1]] += tile.face
         return tile
 
-    def is_valid(self) -> bool:
+    def is_valid(self, tile: Tile = None, position: Tuple[int, int] = None) -> bool:
         """
         Determine if we should keep searching for a fit for a given board state. That is to say, check to see if we can
         short circuit the search.
-        :return: (bool, string) False, and the reason if the search should not continue, otherwise True and ""
+
+        If the tile that was just placed and its position are given, only the groups of free cells touching that tile
+        are checked (see partition_is_valid). Otherwise the whole board is labeled.
+        :param tile:     (Tile)     The tile that was just placed, optional
+        :param position: (int, int) Where that tile was placed, optional
+        :return:         (bool)     False if the search should not continue, otherwise True
         """
+        if tile is not None:
+            return self.partition_is_valid(tile, position)
+        # scipy is slow to import and only needed here, so it is imported on first use
+        from scipy.ndimage.measurements import label
         # If a Tile splits the available cells into multiple groups and if
         # the groups do not each have a multiple of 4 cells, then no
         labeled_board, num_groups = label(self.board)
@@ -163,21 +271,53 @@ class Board:
                 return False
         return True
 
-    @staticmethod
-    def gen_board_output(board_size, solution:Union[List[Tuple[Tuple[np.ndarray], Tile]], List]) -> str:
-        if solution == []:
-            return '?'
-        to_print = list(zip(string.ascii_lowercase, sorted(solution, key=lambda x: (x[0][0], x[0][1]))))
-        helper_board = np.ones(board_size, dtype=np.int)
-        result = np.ones(board_size, dtype='U0')
-        result[np.where(helper_board == 1)] = '.'
-        for label, (position, tile) in to_print:
-            helper_board[position[0]:position[0] + tile.shape[0], position[1]:position[1] + tile.shape[1]] -= tile.face
-            result[np.where(helper_board == 0)] = label
-            helper_board[position[0]:position[0] + tile.shape[0], position[1]:position[1] + tile.shape[1]] += tile.face
+    def partition_is_valid(self, tile: Tile, position: Tuple[int, int]) -> bool:
+        """
+        Incremental version of is_valid. Every group of free cells that doesn't touch the tile that was just placed is
+        exactly the same as it was before the placement, so if the board was valid before, only the groups touching
+        the new tile need to be checked. Those groups are flood filled from the free neighbors of the tile's 4 cells.
+
+        The fill stops early: the free cells always add up to a multiple of 4, so once every other touched group is
+        known to be a multiple of 4 the last one must be too. In particular, as soon as one group has absorbed every
+        remaining neighbor (or every remaining free cell) the board is valid, which is the common case when the tile
+        doesn't split the board at all.
 
-        return re.sub(r'[^{}]'.format(string.ascii_lowercase + string.digits + '.\n'), '', str(result))
+        NOTE: This relies on the board having been valid before the tile was placed.
+        :param tile:     (Tile)     The tile that was just placed
+        :param position: (int, int) Where that tile was placed
+        :return:         (bool)     False if the search should not continue, otherwise True
+        """
+        rows, cols = self.board_size
+        grid = self.board.tolist()
+        seeds = set()
+        for r, c in tile.cells:
+            r, c = r + position[0], c + position[1]
+            for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                if 0 <= nr < rows and 0 <= nc < cols and grid[nr][nc] == 1:
+                    seeds.add((nr, nc))
+        while len(seeds) > 1:
+            # Flood fill the group containing one of the neighbors, marking visited cells with a 2
+            start = seeds.pop()
+            grid[start[0]][start[1]] = 2
+            stack = [start]
+            size = 0
+            while stack:
+                r, c = stack.pop()
+                size += 1
+                seeds.discard((r, c))
+                if not seeds:
+                    # This group holds every remaining neighbor so it is the last group to check
+                    return True
+                for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                    if 0 <= nr < rows and 0 <= nc < cols and grid[nr][nc] == 1:
+                        grid[nr][nc] = 2
+                        stack.append((nr, nc))
+            if size % 4 != 0:
+                return False
+        return True
 
+    # See output.gen_board_output
+    gen_board_output = staticmethod(gen_board_output)
 
 
 if __name__ == '__main__':
@@ -189,6 +329,7 @@ if __name__ == '__main__':
     print(board, '\n')
     board.place_tile(tile_factory('2'), [1, 3])
     print(board, '\n')
+    from scipy.ndimage.measurements import label
     components, num_groups = label(board.board)
     print(components)
     for i in range(4):
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""HW 1 - Tetrominos: Persistent solution cache
+
+CS542
+Michael Lane
+Homework 1: Tetrominos
+Due: 10 April 2017
+
+The same instances come up again and again, often with the tiles listed in a different order or the board turned on
+its side. A SolutionCache remembers the answer to every instance it is given in an SQLite database, so a repeated
+instance is a single indexed lookup instead of a search.
+
+Instances are stored under a canonical key. The order of the tiles doesn't matter, so the key holds the count of each
+tile type, and a board with more rows than columns is the same problem as the board rotated a quarter turn, so the key
+always has the short side first. Rotating keeps every tile type (unlike a reflection, which would swap the 5 and the 2
+and the L and the P), so a solution of the rotated board is turned back with the board on the way out.
+
+Both solutions and proven '?' results are stored. The cache is bounded by a number of entries and/or an approximate
+number of bytes, and when full, the least recently used entries are evicted. Only the Python standard library is
+needed.
+"""
+
+import sqlite3
+
+from typing import List, Tuple, Union
+
+from tile import Orientation, SHAPES, TILE_TYPES, find_orientation
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+__all__ = ['SolutionCache', 'canonical_key', 'rotate_solution']
+
+Solution = List[Tuple[Tuple[int, int], Orientation]]
+
+# Rough cost of a row on top of its key and solution: the rowid, the other columns and the index entries
+ENTRY_OVERHEAD = 40
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS solutions (
+    key TEXT PRIMARY KEY,
+    solution TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS solutions_used ON solutions (used);
+'''
+
+def canonical_key(size: Tuple[int, int], tile_string: str) -> Tuple[str, bool]:
+    """
+    :param size:        (int, int)   The board size in (row, col) format
+    :param tile_string: (str)        The tile types to place
+    :return:            (str, bool)  The key, and whether the board has to be rotated to match it
+    """
+    rows, cols = size
+    counts = ','.join(str(tile_string.count(tile_type)) for tile_type in TILE_TYPES)
+    return '{}x{}:{}'.format(min(rows, cols), max(rows, cols), counts), rows > cols
+
+
+def rotate_solution(size: Tuple[int, int], solution: Solution, clockwise: bool) -> Solution:
+    """
+    Turn a solution with its board by a quarter turn.
+    :param size:      (int, int) The board size in (row, col) format, before the turn
+    :param solution:  ([((int, int), Orientation)]) The placements, Tile objects are accepted too
+    :param clockwise: (bool)     Which way to turn
+    :return:          ([((int, int), Orientation)]) The placements on the turned (col, row) board
+    """
+    rows, cols = size
+    rotated = []
+    for (row, col), tile in solution:
+        if clockwise:
+            cells = [(col + c, rows - 1 - row - r) for r, c in tile.orientation.cells]
+        else:
+            cells = [(cols - 1 - col - c, row + r) for r, c in tile.orientation.cells]
+        rotated.append(find_orientation(cells))
+    return rotated
+
+
+def _encode(solution: Solution) -> str:
+    return ';'.join('{}{}@{},{}'.format(tile.orientation.type, tile.orientation.index, int(row), int(col))
+                    for (row, col), tile in solution)
+
+
+def _decode(text: str) -> Solution:
+    solution = []
+    for placement in text.split(';') if text else []:
+        orientation, position = placement.split('@')
+        row, col = position.split(',')
+        solution.append(((int(row), int(col)), SHAPES[orientation[0]][int(orientation[1:])]))
+    return solution
+
+
+class SolutionCache:
+    """A bounded, least recently used store of solved instances in an SQLite database"""
+
+    def __init__(self, path: str = ':memory:', max_entries: int = None, max_bytes: int = None) -> None:
+        """
+        Open the cache, creating the database if needed. With no limits the cache grows without bound.
+        :param path:        (str) The database file, in memory if omitted
+        :param max_entries: (int) Maximum number of instances to remember
+        :param max_bytes:   (int) Approximate maximum size of the stored instances in bytes
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.connection = sqlite3.connect(path, isolation_level=None)
+        # A write-ahead log without a sync per commit keeps a hit, which updates its entry's recency, in microseconds
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(SCHEMA)
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM solutions').fetchone()[0]
+
+    @property
+    def bytes(self) -> int:
+        return self.connection.execute('SELECT COALESCE(SUM(bytes), 0) FROM solutions').fetchone()[0]
+
+    def __str__(self) -> str:
+        lookups = self.hits + self.misses
+        return 'solution cache: {} entries (~{} bytes), {} hits, {} misses ({:.1%} hit rate), {} evictions'.format(
+            len(self), self.bytes, self.hits, self.misses, self.hits / lookups if lookups else 0, self.evictions)
+
+    def _next_use(self) -> int:
+        return self.connection.execute('SELECT COALESCE(MAX(used), 0) + 1 FROM solutions').fetchone()[0]
+
+    def get(self, size: Tuple[int, int], tile_string: str) -> Union[Solution, None]:
+        """
+        Look up an instance, counting the hit or miss. A hit makes the entry the most recently used.
+        :param size:        (int, int) The board size in (row, col) format
+        :param tile_string: (str)      The tile types to place
+        :return:            ([((int, int), Orientation)]) The solution, [] if the instance has none or None if it is
+                                       not in the cache
+        """
+        key, rotated = canonical_key(size, tile_string)
+        row = self.connection.execute('SELECT solution FROM solutions WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.connection.execute('UPDATE solutions SET used = ? WHERE key = ?', (self._next_use(), key))
+        solution = _decode(row[0])
+        if rotated:
+            solution = rotate_solution((size[1], size[0]), solution, clockwise=True)
+        return solution
+
+    def put(self, size: Tuple[int, int], tile_string: str, solution: Solution) -> None:
+        """
+        Remember the answer to an instance, evicting the least recently used instances if the cache is over budget.
+        :param size:        (int, int) The board size in (row, col) format
+        :param tile_string: (str)      The tile types to place
+        :param solution:    ([((int, int), Orientation)]) The solution, or [] if the instance has none
+        """
+        key, rotated = canonical_key(size, tile_string)
+        if rotated:
+            solution = rotate_solution(size, solution, clockwise=False)
+        text = _encode(solution)
+        # One write transaction, taken up front, so processes sharing the file don't interleave their evictions
+        self.connection.execute('BEGIN IMMEDIATE')
+        try:
+            self.connection.execute('INSERT OR REPLACE INTO solutions (key, solution, bytes, used) VALUES (?, ?, ?, ?)',
+                                    (key, text, len(key) + len(text) + ENTRY_OVERHEAD, self._next_use()))
+            evict = self._overflow()
+            if evict:
+                self.connection.execute('DELETE FROM solutions WHERE key IN '
+                                        '(SELECT key FROM solutions ORDER BY used LIMIT ?)', (evict,))
+            self.connection.execute('COMMIT')
+        except BaseException:
+            self.connection.execute('ROLLBACK')
+            raise
+        self.stores += 1
+        self.evictions += evict
+
+    def _overflow(self) -> int:
+        """
+        :return: (int) How many of the least recently used entries have to go to bring the cache back within budget
+        """
+        count, total = self.connection.execute('SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM solutions').fetchone()
+        evict = 0
+        if self.max_entries is not None:
+            evict = max(count - self.max_entries, 0)
+        if self.max_bytes is not None and total > self.max_bytes:
+            freed = 0
+            for number, (size,) in enumerate(self.connection.execute('SELECT bytes FROM solutions ORDER BY used'), 1):
+                freed += size
+                if total - freed <= self.max_bytes:
+                    evict = max(evict, number)
+                    break
+            else:
+                evict = count
+        return evict
+
+    def clear(self) -> None:
+        self.connection.execute('DELETE FROM solutions')
+
+    def close(self) -> None:
+        self.connection.close()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""HW 1 - Tetrominos: Solver daemon client
+
+CS542
+Michael Lane
+Homework 1: Tetrominos
+Due: 10 April 2017
+
+A drop-in replacement for tetrominos.py that hands the instance to a running solver daemon (see daemon.py) instead of
+solving it. It reads the same input and prints the same output:
+
+    $ python3 daemon.py &
+    $ python3 client.py < input-file.txt
+
+This only uses the socket module, so it starts in a fraction of the time tetrominos.py takes, and the daemon's workers
+already have everything imported and warmed up.
+"""
+
+import argparse
+import os
+import socket
+import sys
+import tempfile
+
+from typing import Tuple
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+__all__ = ['connect', 'request', 'DEFAULT_SOCKET']
+
+# Where the daemon listens unless told otherwise
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), 'tetrominos.sock')
+
+
+def connect(path: str = None, host: str = None, port: int = None) -> socket.socket:
+    """
+    :param path: (str) The daemon's Unix socket, DEFAULT_SOCKET if no port is given
+    :param host: (str) The daemon's host, with port. Defaults to localhost.
+    :param port: (int) The daemon's TCP port
+    :return:     (socket.socket) A connected socket
+    """
+    if port is not None:
+        return socket.create_connection((host or '127.0.0.1', port))
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    connection.connect(path or DEFAULT_SOCKET)
+    return connection
+
+
+def request(connection: socket.socket, text: str) -> str:
+    """
+    Send requests, then read every response until the daemon closes the connection.
+    :param connection: (socket.socket) A connected socket
+    :param text:       (str)           The requests, in the daemon's input format
+    :return:           (str)           The responses
+    """
+    connection.sendall(text.encode())
+    connection.shutdown(socket.SHUT_WR)
+    chunks = []
+    while True:
+        chunk = connection.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return b''.join(chunks).decode()
+
+
+def read_input(path: str = None) -> str:
+    if path:
+        with open(path) as f:
+            return f.read()
+    return sys.stdin.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Solve a tetromino tiling instance with a running solver daemon')
+    parser.add_argument('input', nargs='?', help='Instance file. Read from stdin if omitted.')
+    parser.add_argument('--socket', help='The daemon\'s Unix socket (default: {})'.format(DEFAULT_SOCKET))
+    parser.add_argument('--host', help='The daemon\'s host, with --port (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, help='The daemon\'s TCP port, instead of a Unix socket')
+    args = parser.parse_args()
+
+    with connect(args.socket, args.host, args.port) as connection:
+        response = request(connection, read_input(args.input))
+    # A single instance gets a single response, which is printed exactly like tetrominos.py prints it
+    sys.stdout.write(response.rstrip('\n') + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""HW 1 - Tetrominos: Solver daemon
+
+CS542
+Michael Lane
+Homework 1: Tetrominos
+Due: 10 April 2017
+
+Running tetrominos.py pays for the interpreter, the imports and the placement tables every time, and most instances
+solve in far less time than that. The daemon pays once: it keeps a pool of warmed up worker processes and answers
+instances sent to a Unix socket or a localhost TCP port. client.py is a drop-in replacement for tetrominos.py that
+talks to it.
+
+    $ python3 daemon.py --workers 4 &
+    $ python3 client.py < input-file.txt
+
+A connection carries any number of requests, in either of the batch.py input formats (picked from the first non-blank
+character the client sends):
+
+    1. Plain pairs of lines, exactly like the single instance input. Each response is the usual output followed by a
+       blank line, in the order of the requests.
+
+    2. JSON lines. Besides the size and tiles, a request may give an id, an output format (see output.py, binary
+       excepted) and a timeout in seconds. Each response is a JSON line with the id and the output, or an error, sent
+       as soon as that instance is solved.
+
+            {"id": 7, "size": [6, 8], "tiles": "OOI22TTLLPPP", "timeout": 2}
+            {"id": 7, "output": "aabbcc..."}
+
+The responses stream back while the client is still sending, and the daemon closes the connection once the client has
+closed its side and every response is sent. Instances are solved by at most max_active workers at a time and at most
+max_pending requests may wait for one, beyond which a request is turned away with an error. A request that runs past
+its timeout gets the UNKNOWN result of tetrominos.solve (the tiles and cells engines stop the search at the deadline, a
+dlx search runs on in its worker). A malformed request is answered with an error before it reaches a worker, and a
+request whose worker dies with an error while the daemon starts new workers. On SIGTERM or ^C the daemon stops its
+workers and removes its Unix socket.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from typing import Tuple, Union
+
+from cache import SolutionCache
+from client import DEFAULT_SOCKET
+from limits import SearchLimits
+from output import FORMATS, UNKNOWN
+from tetrominos import BACKENDS, ENGINES, LIMITED_ENGINES, solve
+from tile import tile_factory
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+__all__ = ['SolverDaemon']
+
+# How long past a request's timeout the daemon waits for a worker before answering UNKNOWN itself
+TIMEOUT_GRACE = 0.5
+
+# The worker's solution cache, opened by _init_worker
+_cache = None
+
+# Workers are started fresh rather than forked: a pool replaced after a worker died would otherwise be forked while the
+# broken pool's threads hold their locks, and hang
+_CONTEXT = multiprocessing.get_context('spawn')
+
+
+def _init_worker(cache_path: str, cache_entries: int) -> None:
+    """
+    Open the worker's connection to the solution cache, if any, and solve a small instance so that the imports and
+    the placement tables are ready before the first request.
+    """
+    global _cache
+    if cache_path is not None:
+        _cache = SolutionCache(cache_path, max_entries=cache_entries)
+    solve((4, 6), 'ITT5LP')
+
+
+def _ready() -> bool:
+    return True
+
+
+def _solve_request(size: Tuple[int, int], tile_string: str, backend: str, engine: str, output_format: str,
+                   timeout: Union[float, None]) -> str:
+    """
+    Worker: solve one instance.
+    :return: (str) The output, UNKNOWN if the timeout ran out
+    """
+    limits = SearchLimits(deadline=timeout) if timeout is not None and engine in LIMITED_ENGINES else None
+    return solve(size, tile_string, backend=backend, engine=engine, limits=limits, output_format=output_format,
+                 cache=_cache)
+
+
+class SolverDaemon:
+    """A pool of warm solver processes behind an asyncio server"""
+
+    def __init__(self, workers: int = None, backend: str = 'bitboard', engine: str = 'tiles', max_active: int = None,
+                 max_pending: int = 1000, timeout: float = None, cache_path: str = None,
+                 cache_entries: int = None) -> None:
+        """
+        :param workers:       (int)   Number of worker processes. Defaults to the number of CPUs.
+        :param backend:       (str)   Board implementation, one of tetrominos.BACKENDS
+        :param engine:        (str)   Search to run, one of tetrominos.ENGINES
+        :param max_active:    (int)   Most instances being solved at once. Defaults to the number of workers.
+        :param max_pending:   (int)   Most requests waiting for a worker before new ones are turned away
+        :param timeout:       (float) Default seconds allowed per request, optional
+        :param cache_path:    (str)   Solution cache database shared by the workers (see cache.py), optional
+        :param cache_entries: (int)   Most instances kept in the cache, optional
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.backend = backend
+        self.engine = engine
+        self.max_active = max_active or self.workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.initargs = (cache_path, cache_entries)
+        self.pool = self._new_pool()
+        self.path = None
+        self.active = None
+        self.pending = 0
+        self.requests = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.server = None
+
+    def __str__(self) -> str:
+        return 'solver daemon: {} requests, {} rejected, {} timed out'.format(self.requests, self.rejected,
+                                                                              self.timeouts)
+
+    async def start(self, path: str = None, host: str = None, port: int = None) -> None:
+        """
+        Start the workers and listen on a Unix socket or, if a port is given, on TCP.
+        :param path: (str) The Unix socket, DEFAULT_SOCKET if no port is given
+        :param host: (str) The TCP host, with port. Defaults to localhost.
+        :param port: (int) The TCP port
+        """
+        loop = asyncio.get_running_loop()
+        self.active = asyncio.Semaphore(self.max_active)
+        await asyncio.gather(*[loop.run_in_executor(self.pool, _ready) for _ in range(self.workers)])
+        if port is not None:
+            self.server = await asyncio.start_server(self.handle, host or '127.0.0.1', port)
+        else:
+            path = path or DEFAULT_SOCKET
+            if os.path.exists(path):
+                os.unlink(path)
+            self.server = await asyncio.start_unix_server(self.handle, path)
+            self.path = path
+
+    async def close(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        # shutdown doesn't interrupt a worker deep in a search, so stop the workers (the daemon's only children) and
+        # wait for them before the daemon goes
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        for process in multiprocessing.active_children():
+            process.terminate()
+            process.join()
+        self.pool.shutdown(wait=True)
+        if self.path is not None and os.path.exists(self.path):
+            os.unlink(self.path)
+            self.path = None
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(self.workers, mp_context=_CONTEXT, initializer=_init_worker, initargs=self.initargs)
+
+    def _restart(self, pool: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        """
+        Replace a broken pool, unless another request has already done so.
+        :param pool: (ProcessPoolExecutor) The pool a worker died in
+        :return:     (ProcessPoolExecutor) The working pool
+        """
+        if pool is self.pool:
+            pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = self._new_pool()
+        return self.pool
+
+    async def solve(self, size: Tuple[int, int], tile_string: str, output_format: str = 'diagram',
+                    timeout: float = None) -> str:
+        """
+        Solve one instance on the pool.
+        :param size:          (int, int) The board size in (row, col) format
+        :param tile_string:   (str)      The tile types to place
+        :param output_format: (str)      One of output.FORMATS, except binary
+        :param timeout:       (float)    Seconds allowed, the daemon's timeout if omitted
+        :return:              (str)      The output, UNKNOWN if the timeout ran out
+        :raises ValueError: if the request is malformed, before it takes up a worker
+        :raises BrokenProcessPool: if the worker died, the daemon carries on with a new pool
+        """
+        _check_request(size, tile_string, timeout)
+        if output_format not in FORMATS or output_format == 'binary':
+            raise ValueError('ERROR: unknown output format {!r}'.format(output_format))
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise ValueError('ERROR: the daemon is busy, {} requests are waiting'.format(self.pending))
+        timeout = self.timeout if timeout is None else timeout
+        self.requests += 1
+        self.pending += 1
+        try:
+            await self.active.acquire()
+        finally:
+            self.pending -= 1
+        loop = asyncio.get_running_loop()
+        arguments = (_solve_request, size, tile_string, self.backend, self.engine, output_format, timeout)
+        pool = self.pool
+        try:
+            try:
+                future = loop.run_in_executor(pool, *arguments)
+            except BrokenProcessPool:
+                # A worker died since the last request, which lost nothing, so start a new pool and carry on
+                pool = self._restart(pool)
+                future = loop.run_in_executor(pool, *arguments)
+            if timeout is None:
+                return await future
+            try:
+                return await asyncio.wait_for(future, timeout + TIMEOUT_GRACE)
+            except asyncio.TimeoutError:
+                return UNKNOWN
+        except BrokenProcessPool:
+            # A worker died (killed, out of memory) while solving this instance
+            self._restart(pool)
+            raise
+        finally:
+            self.active.release()
+
+    async def _answer(self, request: dict) -> str:
+        """
+        :param request: (dict) A parsed request, see read_request
+        :return:        (str)  The response line(s), without the trailing newline
+        """
+        try:
+            if request['size'] is None:
+                raise ValueError('ERROR: could not read the request {!r}'.format(request['tiles']))
+            output = await self.solve(request['size'], request['tiles'], request.get('output', 'diagram'),
+                                      request.get('timeout'))
+            if output == UNKNOWN:
+                self.timeouts += 1
+            error = None
+        except (ValueError, TypeError) as e:
+            output, error = '', str(e)
+        except sqlite3.Error as e:
+            output, error = '', 'ERROR: the solution cache failed: {}'.format(e)
+        except BrokenProcessPool:
+            output, error = '', 'ERROR: the worker solving this instance died'
+        if not request['json']:
+            return error if error is not None else output
+        response = {'id': request.get('id'), 'output': output}
+        if error is not None:
+            response['error'] = error
+        return json.dumps(response)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one connection, see the module docstring"""
+        answers = asyncio.Queue()
+
+        async def send_in_order():
+            while True:
+                answer = await answers.get()
+                if answer is None:
+                    return
+                writer.write((await answer).encode() + b'\n\n')
+                await writer.drain()
+
+        async def send_when_done(request):
+            writer.write((await self._answer(request)).encode() + b'\n')
+            await writer.drain()
+
+        sender = None
+        tasks = []
+        number = 0
+        json_lines = None
+        try:
+            while True:
+                request = await read_request(reader, number + 1, json_lines)
+                if request is None:
+                    break
+                number += 1
+                json_lines = request['json']
+                if request['json']:
+                    tasks.append(asyncio.ensure_future(send_when_done(request)))
+                else:
+                    if sender is None:
+                        sender = asyncio.ensure_future(send_in_order())
+                    await answers.put(asyncio.ensure_future(self._answer(request)))
+            await answers.put(None)
+            await asyncio.gather(*tasks, *([sender] if sender is not None else []))
+        except ConnectionError:
+            pass
+        except asyncio.CancelledError:
+            # The daemon is shutting down with requests still being solved, the client sees the connection close
+            for task in tasks + ([sender] if sender is not None else []):
+                task.cancel()
+        finally:
+            writer.close()
+
+
+def _check_request(size: Tuple[int, int], tile_string: str, timeout: Union[float, None]) -> None:
+    """
+    Turn away a malformed request before it takes up a worker.
+    :raises ValueError: if a field isn't what the worker expects
+    """
+    if (not isinstance(size, tuple) or len(size) != 2
+            or not all(isinstance(n, int) and not isinstance(n, bool) and n >= 0 for n in size)):
+        raise ValueError('ERROR: the size must be two whole numbers, not {!r}'.format(size))
+    if not isinstance(tile_string, str):
+        raise ValueError('ERROR: the tiles must be a string, not {!r}'.format(tile_string))
+    for tile_type in set(tile_string):
+        tile_factory(tile_type)
+    if timeout is not None and (not isinstance(timeout, (int, float)) or isinstance(timeout, bool) or timeout < 0):
+        raise ValueError('ERROR: the timeout must be a number of seconds, not {!r}'.format(timeout))
+
+
+async def read_request(reader: asyncio.StreamReader, number: int, json_lines: bool = None) -> Union[dict, None]:
+    """
+    Read the next request from a connection.
+    :param reader:     (asyncio.StreamReader) The connection
+    :param number:     (int)                  The request's position on the connection, the default JSON id
+    :param json_lines: (bool)                 Whether the connection sends JSON lines, picked from the request itself if
+                                              omitted
+    :return:       (dict) The request: size, tiles, json (whether it came as JSON) and, for JSON, id, output and
+                          timeout if given. A request that can't be parsed comes back with size None. None at the
+                          end of the input.
+    """
+    line = b''
+    while not line.strip():
+        line = await reader.readline()
+        if not line:
+            return None
+    line = line.decode().strip()
+    if json_lines or (json_lines is None and line.startswith('{')):
+        try:
+            request = json.loads(line)
+            request.setdefault('id', number)
+            request.update(size=tuple(request['size']), json=True)
+            return request
+        except (ValueError, KeyError, TypeError):
+            return {'id': number, 'size': None, 'tiles': line, 'json': True}
+    tile_string = (await reader.readline()).decode().strip()
+    try:
+        return {'size': tuple(map(int, line.split(' '))), 'tiles': tile_string, 'json': False}
+    except ValueError:
+        return {'size': None, 'tiles': tile_string, 'json': False}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve tetromino tiling instances from a pool of warm workers')
+    parser.add_argument('--socket', help='Unix socket to listen on (default: {})'.format(DEFAULT_SOCKET))
+    parser.add_argument('--host', help='Host to listen on with --port (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, help='Listen on this TCP port instead of a Unix socket')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: number of CPUs)')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='bitboard',
+                        help='Board implementation to search with (default: bitboard)')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='tiles', help='Search to run (default: tiles)')
+    parser.add_argument('--max-active', type=int, default=None,
+                        help='Instances solved at once (default: number of workers)')
+    parser.add_argument('--max-pending', type=int, default=1000,
+                        help='Requests that may wait for a worker before new ones are turned away (default: 1000)')
+    parser.add_argument('--timeout', type=float, metavar='SECONDS',
+                        help='Answer "{}" to requests still running after this long'.format(UNKNOWN))
+    parser.add_argument('--cache', metavar='FILE', help='Solution cache shared by the workers')
+    parser.add_argument('--cache-entries', type=int, metavar='N', help='Keep up to N instances in the cache')
+    args = parser.parse_args()
+
+    async def serve():
+        daemon = SolverDaemon(workers=args.workers, backend=args.backend, engine=args.engine,
+                              max_active=args.max_active, max_pending=args.max_pending, timeout=args.timeout,
+                              cache_path=args.cache, cache_entries=args.cache_entries)
+        # Stop on SIGTERM as well as ^C, so the workers are shut down with the daemon instead of orphaned. The
+        # handlers go in before the workers start, so that a signal sent as soon as the daemon says it is listening
+        # (or while it is starting) shuts it down cleanly.
+        stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stopping.set)
+        try:
+            await daemon.start(args.socket, args.host, args.port)
+            print('listening on {}'.format(args.port or args.socket or DEFAULT_SOCKET), file=sys.stderr, flush=True)
+            await stopping.wait()
+        finally:
+            print(daemon, file=sys.stderr)
+            await daemon.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
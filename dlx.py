@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""HW 1 - Tetrominos: Exact cover solver
+
+CS542
+Michael Lane
+Homework 1: Tetrominos
+Due: 10 April 2017
+
+Tiling a board is an exact cover problem: every free cell has to be covered by exactly one tile. Each possible
+placement of each orientation of each tile type is a row that covers 4 cell columns. On top of that, each tile type
+may only be used as many times as it appears in the input string. That is modeled with one counter column per tile
+type. Choosing a row decrements its type's counter and once the counter reaches 0 the type's column is covered, which
+removes every remaining placement of that type.
+
+The search is Knuth's Algorithm X using dancing links: the matrix is a set of circular doubly linked lists and covering
+or uncovering a column is just a few pointer updates. At each step the cell column with the fewest remaining rows is
+chosen (minimum remaining values), so a cell that can no longer be covered fails immediately.
+
+See: D. E. Knuth, "Dancing Links", Millennial Perspectives in Computer Science, 2000.
+"""
+
+from collections import Counter
+
+from typing import Any, Hashable, Dict, List, Tuple, Union
+
+from tile import Orientation, Tile, SHAPES
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+__all__ = ['DancingLinks', 'tettile_dlx']
+
+
+class DancingLinks:
+    """Algorithm X over a sparse 0/1 matrix stored as dancing links
+
+    Primary columns must be covered exactly once. Counter columns may be covered up to a given number of times: every
+    chosen row that has a 1 in a counter column decrements it, and it is only covered (removing all of its remaining
+    rows) when the count reaches 0.
+
+    The links are stored in flat lists indexed by node number. Node 0 is the root, nodes 1 to the number of columns are
+    the column headers, and the remaining nodes are the 1s of the matrix.
+    """
+
+    def __init__(self, primary: List[Hashable], counters: Dict[Hashable, int] = None) -> None:
+        """
+        Build an empty matrix
+        :param primary:  ([column])       The names of the columns that must be covered exactly once
+        :param counters: ({column: int})  The names of the counter columns and how many times each may be covered
+        """
+        counters = counters or {}
+        names = list(primary) + list(counters)
+        self.column = {name: i + 1 for i, name in enumerate(names)}
+        self.num_primary = len(primary)
+        num_columns = len(names)
+        nodes = range(num_columns + 1)
+        self.left = [i - 1 for i in nodes]
+        self.right = [i + 1 for i in nodes]
+        self.up = list(nodes)
+        self.down = list(nodes)
+        self.col = list(nodes)
+        self.size = [0] * (num_columns + 1)
+        self.row = [None] * (num_columns + 1)
+        self.count = [0] * (self.num_primary + 1) + [counters[name] for name in counters]
+        # Only the primary columns are linked into the header list, counter columns never need to be chosen
+        self.left[0] = self.num_primary
+        self.right[self.num_primary] = 0
+        for i in range(self.num_primary + 1, num_columns + 1):
+            self.left[i] = self.right[i] = i
+        self.rows = []  # type: List[Any]
+
+    def add_row(self, columns: List[Hashable], data: Any) -> None:
+        """
+        Add a row with a 1 in each of the given columns.
+        :param columns: ([column]) The names of the columns this row covers
+        :param data:    (Any)      Returned by search() when this row is part of the solution
+        """
+        row = len(self.rows)
+        self.rows.append(data)
+        first = None
+        for name in columns:
+            c = self.column[name]
+            node = len(self.col)
+            # Link the node in at the bottom of its column
+            self.col.append(c)
+            self.row.append(row)
+            self.up.append(self.up[c])
+            self.down.append(c)
+            self.down[self.up[c]] = node
+            self.up[c] = node
+            self.size[c] += 1
+            # Link the node in at the end of its row
+            if first is None:
+                first = node
+                self.left.append(node)
+                self.right.append(node)
+            else:
+                self.left.append(self.left[first])
+                self.right.append(first)
+                self.right[self.left[first]] = node
+                self.left[first] = node
+
+    def cover(self, c: int) -> None:
+        """
+        Remove a column from the header list and remove every row that has a 1 in it from all of its other columns.
+        :param c: (int) The column header node
+        """
+        left, right, up, down, col, size = self.left, self.right, self.up, self.down, self.col, self.size
+        right[left[c]] = right[c]
+        left[right[c]] = left[c]
+        i = down[c]
+        while i != c:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                size[col[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def uncover(self, c: int) -> None:
+        """
+        Exactly undo cover(c).
+        :param c: (int) The column header node
+        """
+        left, right, up, down, col, size = self.left, self.right, self.up, self.down, self.col, self.size
+        i = up[c]
+        while i != c:
+            j = left[i]
+            while j != i:
+                size[col[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[c]] = c
+        left[right[c]] = c
+
+    def select(self, r: int) -> None:
+        """
+        Choose the row of node r: cover every other column it has a 1 in, counting down counter columns instead.
+        :param r: (int) A node in the chosen row
+        """
+        j = self.right[r]
+        while j != r:
+            c = self.col[j]
+            if c > self.num_primary:
+                self.count[c] -= 1
+                if self.count[c] == 0:
+                    self.cover(c)
+            else:
+                self.cover(c)
+            j = self.right[j]
+
+    def deselect(self, r: int) -> None:
+        """
+        Exactly undo select(r).
+        :param r: (int) A node in the chosen row
+        """
+        j = self.left[r]
+        while j != r:
+            c = self.col[j]
+            if c > self.num_primary:
+                if self.count[c] == 0:
+                    self.uncover(c)
+                self.count[c] += 1
+            else:
+                self.uncover(c)
+            j = self.left[j]
+
+    def choose_column(self) -> int:
+        """
+        Minimum remaining values: pick the primary column with the fewest rows left.
+        :return: (int) The column header node
+        """
+        right, size = self.right, self.size
+        best, best_size = 0, None
+        c = right[0]
+        while c != 0:
+            if best_size is None or size[c] < best_size:
+                best, best_size = c, size[c]
+                if best_size <= 1:
+                    break
+            c = right[c]
+        return best
+
+    def search(self) -> Union[List[Any], None]:
+        """
+        Find one exact cover.
+        :return: ([Any]) The data of the chosen rows or None if there is no exact cover
+        """
+        solution = []
+        if self._search(solution):
+            return [self.rows[self.row[node]] for node in solution]
+        return None
+
+    def _search(self, solution: List[int]) -> bool:
+        if self.right[0] == 0:
+            return True
+        c = self.choose_column()
+        if self.size[c] == 0:
+            return False
+        self.cover(c)
+        r = self.down[c]
+        while r != c:
+            solution.append(r)
+            self.select(r)
+            if self._search(solution):
+                return True
+            self.deselect(r)
+            solution.pop()
+            r = self.down[r]
+        self.uncover(c)
+        return False
+
+
+def tettile_dlx(board: 'Board', tiles: List[Tile]) -> List[Tuple[Tuple[int, int], Orientation]]:
+    """Attempt to tile the board by solving the exact cover problem
+
+    The primary columns are the free cells of the board and there is one counter column per tile type in tiles. Every
+    orientation of every tile type is tried at every position on the board and each one that fits becomes a row. On
+    success the tiles are placed on the board, just like tettile.
+    :param board: (Board)  The board to tile
+    :param tiles: ([Tile]) The tiles to place
+    :return:      ([((int, int), Orientation)]) The placements or the empty list if no solution was found
+    """
+    rows, cols = board.board_size
+    counts = Counter(tile.type for tile in tiles)
+    matrix = DancingLinks(board.free_cells(), dict(counts))
+    for tile_type in counts:
+        for orientation in SHAPES[tile_type]:
+            for row in range(rows - orientation.shape[0] + 1):
+                for col in range(cols - orientation.shape[1] + 1):
+                    if board.tile_fits(orientation, (row, col)):
+                        matrix.add_row([(row + r, col + c) for r, c in orientation.cells] + [tile_type],
+                                       ((row, col), orientation))
+    solution = matrix.search()
+    if solution is None:
+        return []
+    for position, orientation in solution:
+        board.place_tile(orientation, position)
+    return solution
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""HW 1 - Tetrominos: Frontier dynamic programming
+
+CS542
+Michael Lane
+Homework 1: Tetrominos
+Due: 10 April 2017
+
+The depth first searches remember a dead state by its whole board, so two partial tilings that differ anywhere behind
+the first empty cell are searched separately even when everything that matters for the rest of the board is the same.
+A tile placed with its anchor on the first empty cell reaches at most 3 rows further down, so the rest of the search
+only depends on
+
+    - where the sweep is: the first empty cell, in a left-to-right, top-to-bottom scan
+    - the frontier: which of the cells from there up to 3 rows further on are covered already
+    - how many tiles of each type remain
+
+FrontierDP sweeps the board cell by cell with that state, the broken profile, and memoizes every state it settles.
+The frontier holds about 3 rows, so the board is turned a quarter turn first if that makes its rows shorter. That keeps
+the number of frontiers small on narrow boards like 4xN, where the searches repeat the same frontier over and over.
+
+    feasible  Whether the board can be tiled at all
+    witness   One solution, rebuilt from the moves remembered for the states that can be solved (back pointers)
+    count     The exact number of solutions, counted like solutions.count_solutions
+
+The memo is bounded by a number of entries and/or an approximate number of bytes, and the oldest entries are evicted
+once it is full. Evicted states are simply worked out again when they come back, so the bound only costs time.
+
+    $ python3 frontier.py --count < tests/medium-test-pass.txt
+"""
+
+import argparse
+import sys
+from math import factorial
+
+from typing import Dict, List, Tuple, Union
+
+from cache import rotate_solution
+from output import gen_board_output
+from tile import Orientation, Tile, SHAPES, TILE_TYPES, gen_tiles, tile_counts
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+__all__ = ['FrontierDP', 'tettile_frontier']
+
+Solution = List[Tuple[Tuple[int, int], Orientation]]
+# (type index, cells covered as a bitmask of the frontier, rows below the anchor, Orientation, anchor column)
+Move = Tuple[int, int, int, Orientation, int]
+
+# Rough cost of a memo entry on top of its key: the hash table slot and the value
+ENTRY_OVERHEAD = 100
+# The memo limit of the frontier engine in tetrominos.ENGINES, about 200MB
+DEFAULT_MAX_ENTRIES = 10 ** 6
+
+
+class FrontierDP:
+    """Broken profile dynamic programming over one instance, see the module docstring"""
+
+    def __init__(self, size: Tuple[int, int], tiles: Union[str, List[Tile]], max_entries: int = None,
+                 max_bytes: int = None) -> None:
+        """
+        :param size:        (int, int)      The board size in (row, col) format
+        :param tiles:       (str or [Tile]) The tiles to place
+        :param max_entries: (int)           Maximum number of states to remember, optional
+        :param max_bytes:   (int)           Approximate maximum memory use of the memo in bytes, optional
+        """
+        self.size = size
+        rows, cols = size
+        # Sweep along the long side so the frontier spans the short one
+        self.turned = cols > rows
+        self.length, self.width = (cols, rows) if self.turned else (rows, cols)
+        self.area = rows * cols
+        self.counts = tile_counts(tiles)
+        self.count_bits = max(self.counts + [1]).bit_length()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.memo = {}  # type: Dict[int, Union[int, Move, bool]]
+        self.mode = None
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # The moves that put a tile's anchor on a cell, by the column of the cell
+        self.moves = [[] for _ in range(self.width)]  # type: List[List[Move]]
+        for index, tile_type in enumerate(TILE_TYPES):
+            for orientation in SHAPES[tile_type]:
+                anchor_row, anchor_col = orientation.cells[0]
+                for col in range(self.width):
+                    cells = [(r - anchor_row, col + c - anchor_col) for r, c in orientation.cells]
+                    if all(0 <= c < self.width for _, c in cells):
+                        bits = sum(1 << (r * self.width + c - col) for r, c in cells)
+                        height = max(r for r, _ in cells)
+                        self.moves[col].append((index, bits, height, orientation, col - anchor_col))
+
+    def __len__(self) -> int:
+        return len(self.memo)
+
+    def __str__(self) -> str:
+        lookups = self.hits + self.misses
+        return 'frontier memo: {} entries (~{} bytes), {} hits, {} misses ({:.1%} hit rate), {} evictions'.format(
+            len(self), self.bytes, self.hits, self.misses, self.hits / lookups if lookups else 0, self.evictions)
+
+    def _start(self, mode: str) -> Tuple[int, int, int]:
+        """
+        Start over with an empty memo if the last question was a different one.
+        :param mode: (str) 'feasible' or 'count'
+        :return:     (int, int, int) The state of the empty board: cell, frontier and packed tile counts
+        """
+        if mode != self.mode:
+            self.memo.clear()
+            self.bytes = 0
+            self.mode = mode
+        code = 0
+        for index, count in enumerate(self.counts):
+            code |= count << (index * self.count_bits)
+        return 0, 0, code
+
+    def _key(self, cell: int, frontier: int, code: int) -> int:
+        return (code * self.area + cell) << (4 * self.width) | frontier
+
+    def _remember(self, key: int, value: Union[int, Move, bool]) -> None:
+        self.memo[key] = value
+        self.bytes += sys.getsizeof(key) + ENTRY_OVERHEAD
+        while self.memo and ((self.max_entries is not None and len(self.memo) > self.max_entries)
+                             or (self.max_bytes is not None and self.bytes > self.max_bytes)):
+            oldest = next(iter(self.memo))
+            del self.memo[oldest]
+            self.bytes -= sys.getsizeof(oldest) + ENTRY_OVERHEAD
+            self.evictions += 1
+
+    def _options(self, cell: int, frontier: int, code: int):
+        """
+        :return: (generator) (move, the next state) for every move that covers the cell
+        """
+        row, col = divmod(cell, self.width)
+        mask = (1 << self.count_bits) - 1
+        for move in self.moves[col]:
+            index, bits, height, _, _ = move
+            if frontier & bits or row + height >= self.length or not code >> (index * self.count_bits) & mask:
+                continue
+            yield move, _skip(cell + 1, (frontier | bits) >> 1, code - (1 << (index * self.count_bits)))
+
+    def _lookup(self, cell: int, frontier: int, code: int) -> Union[int, Move, bool, None]:
+        """
+        :return: (int, Move or bool) What the memo knows about the state (a count, or a move or False), 1 or 0 for a
+                                     finished sweep, or None if the state still has to be worked out
+        """
+        if cell == self.area:
+            return 1 if code == 0 else 0
+        key = self._key(cell, frontier, code)
+        if key in self.memo:
+            self.hits += 1
+            return self.memo[key]
+        return None
+
+    def _open(self, cell: int, frontier: int, code: int) -> list:
+        """
+        :return: ([int, generator, Move or int]) A frame of the sweep's stack: the state's key, its options and the
+                 move being followed (solvable) or the count so far (count)
+        """
+        self.misses += 1
+        return [self._key(cell, frontier, code), self._options(cell, frontier, code), None]
+
+    def _solvable(self, cell: int, frontier: int, code: int) -> bool:
+        """Depth first over the states with an explicit stack, so a long board doesn't run out of recursion"""
+        known = self._lookup(cell, frontier, code)
+        if known is not None:
+            return bool(known)
+        stack = [self._open(cell, frontier, code)]
+        child = None  # Whether the state last taken off the stack is solvable
+        while stack:
+            frame = stack[-1]
+            if child:
+                # Solvable through the move it was following
+                self._remember(frame[0], frame[2])
+                stack.pop()
+                continue
+            child = None
+            for move, state in frame[1]:
+                known = self._lookup(*state)
+                if known is None:
+                    frame[2] = move
+                    stack.append(self._open(*state))
+                    break
+                if known:
+                    frame[2] = move
+                    child = True
+                    break
+            else:
+                self._remember(frame[0], False)
+                stack.pop()
+                child = False
+        return child
+
+    def _count(self, cell: int, frontier: int, code: int) -> int:
+        """Like _solvable, adding up the counts of every option instead of stopping at the first solvable one"""
+        known = self._lookup(cell, frontier, code)
+        if known is not None:
+            return known
+        stack = [self._open(cell, frontier, code)]
+        stack[0][2] = 0
+        total = 0
+        while stack:
+            frame = stack[-1]
+            for _, state in frame[1]:
+                known = self._lookup(*state)
+                if known is None:
+                    stack.append(self._open(*state))
+                    stack[-1][2] = 0
+                    break
+                frame[2] += known
+            else:
+                self._remember(frame[0], frame[2])
+                stack.pop()
+                total = frame[2]
+                if stack:
+                    stack[-1][2] += total
+        return total
+
+    def feasible(self) -> bool:
+        """
+        :return: (bool) True if the board can be tiled with the tiles
+        """
+        return self._solvable(*self._start('feasible'))
+
+    def witness(self) -> Solution:
+        """
+        :return: ([((int, int), Orientation)]) The placements of one solution, or the empty list if there is none
+        """
+        state = self._start('feasible')
+        if not self._solvable(*state):
+            return []
+        solution = []
+        while state[0] < self.area:
+            move = self.memo.get(self._key(*state))
+            if not isinstance(move, tuple):
+                # Evicted, work it out again
+                self._solvable(*state)
+                move = self.memo[self._key(*state)]
+            index, bits, height, orientation, left = move
+            cell, frontier, code = state
+            solution.append(((cell // self.width, left), orientation))
+            state = _skip(cell + 1, (frontier | bits) >> 1, code - (1 << (index * self.count_bits)))
+        if self.turned:
+            solution = rotate_solution((self.length, self.width), solution, clockwise=False)
+        return solution
+
+    def count(self, distinct_pieces: bool = False) -> int:
+        """
+        :param distinct_pieces: (bool) Count every assignment of the input pieces to each tiling, see solutions.py
+        :return:                (int)  The number of solutions
+        """
+        total = self._count(*self._start('count'))
+        if distinct_pieces:
+            for count in self.counts:
+                total *= factorial(count)
+        return total
+
+
+def _skip(cell: int, frontier: int, code: int) -> Tuple[int, int, int]:
+    """Move the sweep past the covered cells"""
+    while frontier & 1:
+        cell += 1
+        frontier >>= 1
+    return cell, frontier, code
+
+
+def tettile_frontier(board, tiles: List[Tile]) -> Solution:
+    """
+    Attempt to tile the empty board with the frontier dynamic programming. On success the tiles are placed on the
+    board, just like tettile. The memo is bounded by DEFAULT_MAX_ENTRIES.
+    :param board: (Board)  The empty board to tile
+    :param tiles: ([Tile]) The tiles to place
+    :return:      ([((int, int), Orientation)]) The placements or the empty list if no solution was found
+    """
+    rows, cols = board.board_size
+    solution = FrontierDP((rows, cols), tiles, max_entries=DEFAULT_MAX_ENTRIES).witness()
+    for position, orientation in solution:
+        board.place_tile(orientation, position)
+    return solution
+
+
+def main():
+    from tetrominos import passes_prechecks, read_instance
+
+    parser = argparse.ArgumentParser(description='Decide, solve or count a tetromino tiling instance by sweeping the '
+                                                 'board with a frontier')
+    parser.add_argument('input', nargs='?', help='Instance file. Read from stdin if omitted.')
+    parser.add_argument('--count', action='store_true', help='Only print the number of solutions')
+    parser.add_argument('--distinct-pieces', action='store_true',
+                        help='Treat pieces of the same type as distinguishable when counting')
+    parser.add_argument('--max-entries', type=int, metavar='N', help='Remember up to N states')
+    parser.add_argument('--max-bytes', type=int, metavar='N', help='Remember states using up to about N bytes')
+    parser.add_argument('--stats', action='store_true', help='Print the memo statistics to stderr')
+    args = parser.parse_args()
+
+    size, tile_string = read_instance(args.input)
+    dp = FrontierDP(size, tile_string, max_entries=args.max_entries, max_bytes=args.max_bytes)
+    if args.count:
+        print(dp.count(args.distinct_pieces) if passes_prechecks(size, tile_string) else 0)
+    else:
+        solution = dp.witness() if passes_prechecks(size, tile_string) else []
+        print(gen_board_output(size, solution))
+    if args.stats:
+        print(dp, file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
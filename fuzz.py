@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""HW 1 - Tetrominos: Differential fuzzing
+
+CS542
+Michael Lane
+Homework 1: Tetrominos
+Due: 10 April 2017
+
+The hand written files in tests/ are a handful of instances. This module makes as many as wanted from a seed:
+
+    random_instance  Tile an empty board with randomly chosen tiles and read back the tiles used, in a random order.
+                     Solvable by construction.
+    near_miss        Change a few tiles of a solvable instance until it can't be tiled (FrontierDP and dlx agree)
+
+and runs every solving path in PATHS on each one, checking that
+
+    - every path that finishes gives the known answer: a solution for a random instance and '?' for a near miss. A path
+      stopped by the node limit, or the blocks engine giving up, answers UNKNOWN and has no say.
+    - every diagram is well formed (see output.read_board_output) and uses exactly the instance's tiles
+
+Instance number n of a seed is generated from its own Random, so any failure can be generated again on its own. A
+failing instance is printed in the input file format, and can be saved straight into a directory of test files.
+Thousands of small instances are checked a minute, so a change to Board or tettile can be compared with every other
+path before it lands:
+
+    $ python3 fuzz.py --seed 542 --instances 2000
+    $ python3 fuzz.py --sizes 4x6,6x6 --paths tiles,stack,dlx --save failures/
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+from typing import Callable, Dict, Iterator, List, Tuple, Union
+
+from bitboard import BitBoard
+from cache import SolutionCache
+from frontier import FrontierDP
+from heuristics import SearchOrder
+from limits import SearchLimits
+from output import read_board_output
+from tetrominos import ENGINES, LIMITED_ENGINES, covering_moves, solve
+from tile import TILE_TYPES, gen_tiles
+from transposition import TranspositionTable
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+__all__ = ['random_tiling', 'near_miss_candidates', 'random_instance', 'near_miss', 'generate_instances',
+           'check_instance', 'run_fuzz', 'PATHS', 'DEFAULT_PATHS']
+
+Instance = Dict[str, object]
+
+SEED = 542
+# Board sizes to draw from by default: small enough that the depth first searches usually settle them, both ways round
+SIZES = [(4, 4), (4, 5), (5, 4), (4, 6), (6, 4), (3, 8), (8, 3), (2, 10)]
+# Nodes a depth first search may place before it gives up on an instance
+NODE_LIMIT = 2000
+
+
+def random_tiling(size: Tuple[int, int], rng: random.Random) -> Union[str, None]:
+    """
+    Tile an empty board with randomly chosen tiles, always covering the first empty cell (see tetrominos.tettile_cells).
+    :param size: (int, int)     The board size
+    :param rng:  (random.Random) The source of randomness
+    :return:     (str)          The tile types used, sorted, or None if the board can't be tiled
+    """
+    board = BitBoard(size)
+    counts = [size[0] * size[1]] * len(TILE_TYPES)
+    used = []
+
+    def cover():
+        cell = board.first_empty()
+        if cell is None:
+            return True
+        moves = list(covering_moves(board, cell, counts))
+        rng.shuffle(moves)
+        for index, orientation, position in moves:
+            board.place_tile(orientation, position)
+            if board.is_valid(orientation, position):
+                used.append(orientation.type)
+                if cover():
+                    return True
+                used.pop()
+            board.remove_tile(orientation, position)
+        return False
+
+    return ''.join(sorted(used)) if cover() else None
+
+
+def near_miss_candidates(tile_string: str, rng: random.Random, tries: int) -> Iterator[str]:
+    """
+    Candidate unsolvable variants of a solvable multiset: first single swaps of a non-T tile for another non-T type,
+    then the multiset with more and more pairs of non-T tiles turned into Ts. The number of Ts stays even throughout.
+    :param tile_string: (str)          A solvable multiset of tiles
+    :param rng:         (random.Random) The source of randomness
+    :param tries:       (int)          Single swaps to try
+    :return:            (generator)    The candidate tile strings, sorted
+    """
+    swappable = [i for i, tile_type in enumerate(tile_string) if tile_type != 'T']
+    for _ in range(tries if swappable else 0):
+        tiles = list(tile_string)
+        position = rng.choice(swappable)
+        tiles[position] = rng.choice([t for t in TILE_TYPES if t not in (tiles[position], 'T')])
+        yield ''.join(sorted(tiles))
+    tiles = list(tile_string)
+    while len(swappable) >= 2:
+        for position in rng.sample(swappable, 2):
+            tiles[position] = 'T'
+        swappable = [i for i, tile_type in enumerate(tiles) if tile_type != 'T']
+        yield ''.join(sorted(tiles))
+
+
+def _shuffled(tile_string: str, rng: random.Random) -> str:
+    """The tiles engine depends on the order of the input, so the instances don't come sorted"""
+    tiles = list(tile_string)
+    rng.shuffle(tiles)
+    return ''.join(tiles)
+
+
+def random_instance(size: Tuple[int, int], rng: random.Random) -> Union[str, None]:
+    """
+    :param size: (int, int)     The board size
+    :param rng:  (random.Random) The source of randomness
+    :return:     (str)          The tiles of a random tiling of the board, in random order, or None if it can't be tiled
+    """
+    tile_string = random_tiling(size, rng)
+    return None if tile_string is None else _shuffled(tile_string, rng)
+
+
+def _dlx_finds_none(size: Tuple[int, int], tile_string: str) -> bool:
+    return not ENGINES['dlx'](BitBoard(size), gen_tiles(tile_string))
+
+
+def near_miss(size: Tuple[int, int], tile_string: str, rng: random.Random, tries: int = 10,
+              confirm: Callable[[Tuple[int, int], str], bool] = _dlx_finds_none) -> Union[str, None]:
+    """
+    A small change to a solvable instance that can't be solved, see near_miss_candidates. FrontierDP and the other
+    searches are all paths under test, so no one of them is trusted to say there is no tiling: a candidate is only a
+    near miss if FrontierDP and a second, independent search agree.
+    :param size:        (int, int)     The board size
+    :param tile_string: (str)          A solvable instance
+    :param rng:         (random.Random) The source of randomness
+    :param tries:       (int)          Single swaps to try
+    :param confirm:     (func)         The second search, (size, tile string) -> True if it found no tiling. dlx if
+                                       omitted.
+    :return:            (str)          The unsolvable tiles, in random order, or None if no candidate was confirmed
+    """
+    for candidate in near_miss_candidates(''.join(sorted(tile_string)), rng, tries):
+        # The second search first: FrontierDP can take much longer to find a tiling than to rule one out
+        if confirm(size, candidate) and not FrontierDP(size, candidate).feasible():
+            return _shuffled(candidate, rng)
+    return None
+
+
+def generate_instances(seed: int = SEED, count: int = 1000, sizes: List[Tuple[int, int]] = None,
+                       near_misses: float = 0.5) -> Iterator[Instance]:
+    """
+    :param seed:        (int)        The random seed
+    :param count:       (int)        How many instances to generate
+    :param sizes:       ([(int, int)]) The board sizes to draw from, SIZES if omitted
+    :param near_misses: (float)      The share of the instances that are near misses
+    :return:            (generator)  Instances as dicts with an id, size, tiles and whether they are solvable
+    """
+    for number in range(count):
+        rng = random.Random(seed * 2 ** 32 + number)
+        size = rng.choice(sizes or SIZES)
+        tile_string = random_instance(size, rng)
+        if tile_string is None:
+            continue
+        solvable = True
+        if rng.random() < near_misses:
+            unsolvable = near_miss(size, tile_string, rng)
+            if unsolvable is not None:
+                tile_string, solvable = unsolvable, False
+        yield {'id': 'fuzz-{}-{}'.format(seed, number), 'size': size, 'tiles': tile_string, 'solvable': solvable}
+
+
+def _path(engine: str, backend: str = 'bitboard', table: bool = False, **options) -> Callable[..., str]:
+    """
+    :param engine:  (str)  One of tetrominos.ENGINES
+    :param backend: (str)  One of tetrominos.BACKENDS
+    :param table:   (bool) Search with a new TranspositionTable
+    :param options: (dict) More keyword arguments to tetrominos.solve
+    :return:        (func) Solve an instance the given way, (size, tile_string, node_limit) -> diagram
+    """
+    def run(size: Tuple[int, int], tile_string: str, node_limit: int) -> str:
+        kwargs = dict(options)
+        if engine in LIMITED_ENGINES:
+            kwargs['limits'] = SearchLimits(max_nodes=node_limit)
+        if table:
+            kwargs['table'] = TranspositionTable()
+        return solve(size, tile_string, backend=backend, engine=engine, **kwargs)
+
+    return run
+
+
+def _cached(size: Tuple[int, int], tile_string: str, node_limit: int) -> str:
+    """Solve the board turned a quarter turn, with the tiles reversed, into a new cache and read the instance back"""
+    cache = SolutionCache()
+    solve(size[::-1], tile_string[::-1], engine='dlx', cache=cache)
+    output = solve(size, tile_string, engine='dlx', cache=cache)
+    cache.close()
+    return output
+
+
+# Every way of solving an instance, by name. Each takes the size, the tile string and the node limit of the depth
+# first searches and returns the diagram.
+PATHS = {
+    'tiles': _path('tiles'),
+    'cells': _path('cells'),
+    'dlx': _path('dlx'),
+    'blocks': _path('blocks'),
+    'stack': _path('stack'),
+    'frontier': _path('frontier'),
+    'tiles-numpy': _path('tiles', backend='numpy'),
+    'cells-numpy': _path('cells', backend='numpy'),
+    'tiles-pruned': _path('tiles', prune_regions=True, table=True),
+    'cells-pruned': _path('cells', prune_regions=True, table=True),
+    'stack-pruned': _path('stack', prune_regions=True, table=True),
+    'tiles-scarce': _path('tiles', order=SearchOrder(value='scarce')),
+    'cells-fewest': _path('cells', order=SearchOrder('fewest', 'scarce')),
+    'cells-pockets': _path('cells', order=SearchOrder(value='pockets')),
+    'tiles-symmetric': _path('tiles', symmetric=True),
+    'cells-symmetric': _path('cells', symmetric=True),
+    'cache': _cached,
+}  # type: Dict[str, Callable[..., str]]
+# The numpy board is several times slower, so its paths only run when asked for
+DEFAULT_PATHS = [name for name in PATHS if not name.endswith('-numpy')]
+
+
+def check_instance(instance: Instance, paths: List[str] = None, node_limit: int = NODE_LIMIT) -> Tuple[List[str], int]:
+    """
+    Run the instance through every path and check the answers, see the module docstring.
+    :param instance:   (dict)  An instance, see generate_instances
+    :param paths:      ([str]) The names of the paths in PATHS to run, DEFAULT_PATHS if omitted
+    :param node_limit: (int)   Nodes a depth first search may place
+    :return:           ([str], int) A description of everything that went wrong, and how many paths gave up
+    """
+    size, tile_string = tuple(instance['size']), instance['tiles']
+    expected = Counter(tile_string)
+    problems = []
+    unknown = 0
+    for name in paths or DEFAULT_PATHS:
+        try:
+            output = PATHS[name](size, tile_string, node_limit)
+            solution = read_board_output(size, output)
+        except Exception as e:
+            problems.append('{}: {}: {}'.format(name, type(e).__name__, e))
+            continue
+        if solution is None:
+            unknown += 1
+        elif bool(solution) != instance['solvable']:
+            problems.append('{}: {} but the instance is {}'.format(name, 'solved' if solution else '?',
+                                                                    'solvable' if instance['solvable'] else 'not'))
+        elif solution and Counter(orientation.type for _, orientation in solution) != expected:
+            problems.append('{}: the diagram does not use the tiles {}'.format(name, tile_string))
+    return problems, unknown
+
+
+def run_fuzz(instances: Iterator[Instance], paths: List[str] = None, node_limit: int = NODE_LIMIT,
+             report: Callable[[Instance, List[str]], None] = None) -> Dict[str, int]:
+    """
+    :param instances:  (iterable) The instances to check, see generate_instances
+    :param paths:      ([str])    The names of the paths in PATHS to run, DEFAULT_PATHS if omitted
+    :param node_limit: (int)      Nodes a depth first search may place
+    :param report:     (func)     Called with each instance that failed and its problems, optional
+    :return:           (dict)     The number of instances checked, solvable, failed and of UNKNOWN answers
+    """
+    totals = {'instances': 0, 'solvable': 0, 'failed': 0, 'unknown': 0}
+    for instance in instances:
+        problems, unknown = check_instance(instance, paths, node_limit)
+        totals['instances'] += 1
+        totals['solvable'] += instance['solvable']
+        totals['unknown'] += unknown
+        if problems:
+            totals['failed'] += 1
+            if report is not None:
+                report(instance, problems)
+    return totals
+
+
+def _size(text: str) -> Tuple[int, int]:
+    rows, cols = text.lower().split('x')
+    return int(rows), int(cols)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check every solving path against random instances')
+    parser.add_argument('--seed', type=int, default=SEED, help='Random seed (default: {})'.format(SEED))
+    parser.add_argument('--instances', type=int, default=1000, help='How many instances to check (default: 1000)')
+    parser.add_argument('--sizes', type=lambda text: [_size(size) for size in text.split(',')],
+                        help='Comma separated board sizes to draw from, like 4x6,6x6 (default: {})'.format(
+                            ','.join('{}x{}'.format(*size) for size in SIZES)))
+    parser.add_argument('--near-misses', type=float, default=0.5,
+                        help='Share of the instances made unsolvable (default: 0.5)')
+    parser.add_argument('--paths', type=lambda text: text.split(','),
+                        help='Comma separated paths to run, out of {} (default: all but the numpy ones)'.format(
+                            ', '.join(PATHS)))
+    parser.add_argument('--node-limit', type=int, default=NODE_LIMIT,
+                        help='Nodes a depth first search may place before giving up (default: {})'.format(NODE_LIMIT))
+    parser.add_argument('--save', metavar='DIR', help='Write every failing instance to an input file in this directory')
+    args = parser.parse_args()
+    unknown_paths = [name for name in args.paths or [] if name not in PATHS]
+    if unknown_paths:
+        parser.error('unknown path(s) {}, expected some of {}'.format(', '.join(unknown_paths), ', '.join(PATHS)))
+
+    def report(instance, problems):
+        text = '{} {}\n{}\n'.format(instance['size'][0], instance['size'][1], instance['tiles'])
+        print('FAILED {}\n{}'.format(instance['id'], text) + ''.join('    {}\n'.format(p) for p in problems))
+        if args.save:
+            os.makedirs(args.save, exist_ok=True)
+            with open(os.path.join(args.save, instance['id'] + '.txt'), 'w') as f:
+                f.write(text)
+
+    start = time.monotonic()
+    instances = generate_instances(args.seed, args.instances, args.sizes, args.near_misses)
+    totals = run_fuzz(instances, args.paths, args.node_limit, report)
+    print('{} instances ({} solvable) through {} paths in {:.1f}s: {} failed, {} answers stopped by the node '
+          'limit'.format(totals['instances'], totals['solvable'], len(args.paths or DEFAULT_PATHS),
+                         time.monotonic() - start, totals['failed'], totals['unknown']))
+    if totals['failed']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""HW 1 - Tetrominos: Branching heuristics
+
+CS542
+Michael Lane
+Homework 1: Tetrominos
+Due: 10 April 2017
+
+Out of the box the searches branch in a fixed order: tettile tries the tiles in the order of the input string, and
+tettile_cells covers the first empty cell with the tile types in TILE_TYPES order. A bad order can make the search
+orders of magnitude longer than a good one, so a SearchOrder lets both engines branch on the most constrained choice
+first instead.
+
+Variable ordering (which empty cell to cover next, tettile_cells only):
+
+    first   The first empty cell in a left-to-right, top-to-bottom scan. Only the tiles' anchors can cover it.
+    fewest  The empty cell with the fewest placements of the remaining tiles that cover it. A cell that none can cover
+            ends the branch straight away. Every placement that covers the cell is tried, not only the anchored ones.
+
+Value ordering (which tile to try first):
+
+    input   The order of the input string (tettile) or of TILE_TYPES (tettile_cells)
+    scarce  The tile types with the fewest remaining tiles first, so a tiling never hinges on the last lonely 5 or 2.
+            For tettile this also makes the search independent of the order of the input string.
+    pockets Placements that leave the fewest pockets first. A pocket is a free cell next to the placed tile with at
+            most one free neighbor, which only a few placements can ever cover.
+
+Compare them on the benchmark corpus with benchmarks/orders.py.
+"""
+
+from typing import List, Sequence, Tuple, Union
+
+from tile import Orientation, Tile, SHAPES, TILE_TYPES
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+__all__ = ['SearchOrder', 'CELL_ORDERS', 'VALUE_ORDERS', 'pockets']
+
+CELL_ORDERS = ('first', 'fewest')
+VALUE_ORDERS = ('input', 'scarce', 'pockets')
+
+Move = Tuple[int, Orientation, Tuple[int, int]]
+
+
+def pockets(board, orientation: Orientation, position: Tuple[int, int]) -> int:
+    """
+    Count the pockets placing a tile would leave: free cells next to it with at most one free neighbor. The board is
+    not touched.
+    :param board:       (Board)       The board, without the tile
+    :param orientation: (Orientation) The tile
+    :param position:    (int, int)    Where the top left corner of its bounding box would go
+    :return:            (int)         The number of pockets
+    """
+    rows, cols = board.board_size
+    cells = [(position[0] + r, position[1] + c) for r, c in orientation.cells]
+    free = board.occupancy()
+    for row, col in cells:
+        free &= ~(1 << (row * cols + col))
+
+    def is_free(row, col):
+        return 0 <= row < rows and 0 <= col < cols and free >> (row * cols + col) & 1
+
+    found = set()
+    for row, col in cells:
+        for n_row, n_col in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if is_free(n_row, n_col) and is_free(n_row - 1, n_col) + is_free(n_row + 1, n_col) \
+                    + is_free(n_row, n_col - 1) + is_free(n_row, n_col + 1) <= 1:
+                found.add((n_row, n_col))
+    return len(found)
+
+
+class SearchOrder:
+    """The branching order of a depth first search, see the module docstring"""
+
+    def __init__(self, cell: str = 'first', value: str = 'input') -> None:
+        """
+        :param cell:  (str) The variable ordering, one of CELL_ORDERS
+        :param value: (str) The value ordering, one of VALUE_ORDERS
+        """
+        if cell not in CELL_ORDERS:
+            raise ValueError('ERROR: unknown cell order {!r}, expected one of {}'.format(cell, ', '.join(CELL_ORDERS)))
+        if value not in VALUE_ORDERS:
+            raise ValueError('ERROR: unknown value order {!r}, expected one of {}'.format(value,
+                                                                                          ', '.join(VALUE_ORDERS)))
+        self.cell = cell
+        self.value = value
+
+    def __repr__(self) -> str:
+        return 'SearchOrder(cell={!r}, value={!r})'.format(self.cell, self.value)
+
+    def _type_order(self, counts: Sequence[int]) -> List[int]:
+        """The indexes of the remaining tile types, in the order to try them"""
+        indexes = [index for index in range(len(TILE_TYPES)) if counts[index]]
+        if self.value == 'scarce':
+            indexes.sort(key=lambda index: counts[index])
+        return indexes
+
+    def tiles(self, tiles: List[Tile], counts: Sequence[int]) -> List[Tile]:
+        """
+        The order in which tettile tries the tiles.
+        :param tiles:  ([Tile]) The remaining tiles
+        :param counts: ([int])  The number of tiles remaining of each type, indexed like tile.TILE_TYPES
+        :return:       ([Tile]) The same tiles, reordered
+        """
+        if self.value != 'scarce':
+            return tiles
+        return sorted(tiles, key=lambda tile: (counts[TILE_TYPES.index(tile.type)], TILE_TYPES.index(tile.type)))
+
+    def placements(self, board, tile: Tile) -> List[Tuple[Orientation, Tuple[int, int]]]:
+        """
+        The orientations of a tile that tettile tries, each at its most northwestern position.
+        :param board: (Board) The board
+        :param tile:  (Tile)  The tile
+        :return:      ([(Orientation, (int, int))]) The placements, in the order to try them
+        """
+        found = []
+        for orientation in tile.orientations:
+            position = board.tile_can_be_placed(orientation)
+            if position is not False:
+                found.append((orientation, position))
+        if self.value == 'pockets':
+            found.sort(key=lambda placement: pockets(board, *placement))
+        return found
+
+    def choose_cell(self, board, counts: Sequence[int]) -> Union[Tuple[int, int], None, bool]:
+        """
+        The empty cell tettile_cells covers next.
+        :param board:  (Board)     The board
+        :param counts: ([int])     The number of tiles remaining of each type, indexed like tile.TILE_TYPES
+        :return:       (int, int)  The (row, col) of the cell, None if the board is full or False if some empty cell
+                                   can't be covered by any remaining tile
+        """
+        cell = board.first_empty()
+        if cell is None or self.cell == 'first':
+            return cell
+        coverage = board.coverage_counts([tile_type for tile_type, count in zip(TILE_TYPES, counts) if count])
+        best = None
+        for row, col in board.free_cells():
+            covering = coverage[row][col]
+            if covering == 0:
+                return False
+            if best is None or covering < best[0]:
+                best = covering, (row, col)
+        return best[1]
+
+    def moves(self, board, cell: Tuple[int, int], counts: Sequence[int]) -> List[Move]:
+        """
+        Every placement of a remaining tile that covers the cell chosen by choose_cell, in the order to try them.
+        :param board:  (Board)    The board
+        :param cell:   (int, int) The (row, col) of the empty cell
+        :param counts: ([int])    The number of tiles remaining of each type, indexed like tile.TILE_TYPES
+        :return:       ([(int, Orientation, (int, int))]) (type index, Orientation, position) for each placement
+        """
+        row, col = cell
+        found = []
+        for index in self._type_order(counts):
+            for orientation in SHAPES[TILE_TYPES[index]]:
+                # With the first empty cell only the anchor can cover it, otherwise any of the tile's cells can
+                offsets = orientation.cells[:1] if self.cell == 'first' else orientation.cells
+                for r, c in offsets:
+                    position = (row - r, col - c)
+                    if position[0] >= 0 and position[1] >= 0 and board.tile_fits(orientation, position):
+                        found.append((index, orientation, position))
+        if self.value == 'pockets':
+            found.sort(key=lambda move: pockets(board, move[1], move[2]))
+        return found
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""HW 1 - Tetrominos: Search limits
+
+CS542
+Michael Lane
+Homework 1: Tetrominos
+Due: 10 April 2017
+
+The assignment allows 5 seconds per instance, but a depth first search has no idea how long it has been running. A
+SearchLimits bounds a search by wall clock time and/or by the number of nodes, can be cancelled from another thread
+through a CancelToken, and reports its progress to a callback along the way.
+
+Like the instrumentation in stats.py, the limits are enforced by a subclass of the board (see limited): the search
+nodes are counted as tiles are placed, and every check_interval placements the deadline and the token are checked and
+the progress callback is called. When a limit is hit, SearchInterrupted unwinds the search. tetrominos.solve turns that
+into the UNKNOWN result, which is distinct from the '?' of a search that finished without finding a solution.
+"""
+
+import time
+from collections import namedtuple
+
+from typing import Callable
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+__all__ = ['SearchLimits', 'CancelToken', 'Progress', 'SearchInterrupted', 'limited']
+
+# What the progress callback is called with. best_coverage is the largest fraction of the board covered so far.
+Progress = namedtuple('Progress', ['nodes', 'depth', 'best_coverage', 'elapsed'])
+
+
+class SearchInterrupted(Exception):
+    """Raised inside the search when a limit is hit. The reason is one of 'deadline', 'nodes' or 'cancelled'."""
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+class CancelToken:
+    """Set from any thread to stop a search at its next check"""
+
+    def __init__(self) -> None:
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class SearchLimits:
+    """The limits of one search. After the search, stopped holds the reason it was interrupted, or None."""
+
+    def __init__(self, deadline: float = None, max_nodes: int = None, token: CancelToken = None,
+                 progress: Callable[[Progress], None] = None, check_interval: int = 1000) -> None:
+        """
+        :param deadline:       (float)       Give up after this many seconds, optional
+        :param max_nodes:      (int)         Give up after placing this many tiles, optional
+        :param token:          (CancelToken) Give up once this is cancelled, optional
+        :param progress:       (func)        Called with a Progress every check_interval nodes, optional
+        :param check_interval: (int)         Nodes between checks of the deadline and the token
+        """
+        self.deadline = deadline
+        self.max_nodes = max_nodes
+        self.token = token
+        self.progress = progress
+        self.check_interval = check_interval
+        self.stopped = None
+
+
+def limited(backend, limits: SearchLimits):
+    """
+    The clock starts when this is called.
+    :param backend: (type)         The board class
+    :param limits:  (SearchLimits) The limits to enforce
+    :return:        (type)         A subclass of the board class that enforces the limits
+    """
+    start = time.monotonic()
+    interval = limits.check_interval
+    if limits.max_nodes is not None:
+        interval = min(interval, limits.max_nodes + 1)
+
+    class LimitedBoard(backend):
+        limit_nodes = 0
+        limit_depth = 0
+        limit_best_depth = 0
+        limit_next_check = interval
+
+        def place_tile(self, tile, position):
+            self.limit_nodes += 1
+            self.limit_depth += 1
+            if self.limit_depth > self.limit_best_depth:
+                self.limit_best_depth = self.limit_depth
+            if self.limit_nodes >= self.limit_next_check:
+                self.check_limits()
+            super().place_tile(tile, position)
+
+        def remove_tile(self, tile, position):
+            self.limit_depth -= 1
+            return super().remove_tile(tile, position)
+
+        def check_limits(self):
+            elapsed = time.monotonic() - start
+            if limits.max_nodes is not None and self.limit_nodes > limits.max_nodes:
+                self.stop_search('nodes')
+            if limits.deadline is not None and elapsed > limits.deadline:
+                self.stop_search('deadline')
+            if limits.token is not None and limits.token.cancelled:
+                self.stop_search('cancelled')
+            if limits.progress is not None:
+                rows, cols = self.board_size
+                coverage = self.limit_best_depth * 4 / (rows * cols)
+                limits.progress(Progress(self.limit_nodes, self.limit_depth, coverage, elapsed))
+            self.limit_next_check = self.limit_nodes + limits.check_interval
+            if limits.max_nodes is not None:
+                self.limit_next_check = min(self.limit_next_check, limits.max_nodes + 1)
+
+        def stop_search(self, reason):
+            limits.stopped = reason
+            raise SearchInterrupted(reason)
+
+    return LimitedBoard
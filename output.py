@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""HW 1 - Tetrominos: Solution output
+
+CS542
+Michael Lane
+Homework 1: Tetrominos
+Due: 10 April 2017
+
+Turns a solution into the diagram the assignment asks for, or into one of the compact formats below. Both boards share
+this, and it only needs the standard library, so printing a bitboard solution never imports numpy.
+
+Every format starts from the label grid: the tiles are numbered 1, 2, ... in order of their position (the top left
+corner of their bounding box) and each cell holds the number of the tile covering it, or 0. Building it is a single
+pass over the covered cells.
+
+    diagram  The assignment's format. Tiles 1 to 26 are drawn 'a' to 'z', as the assignment asks. Larger solutions
+             carry on with 'A' to 'Z' and '0' to '9', and past those each tile gets the first of these characters that
+             none of its already drawn neighbors has, so touching tiles always look different.
+    json     {"size": [rows, cols], "status": ..., "placements": [{"label", "type", "orientation", "position",
+             "cells"}, ...]} in label order
+    rle      One line per board row of comma separated label:run pairs, e.g. "1:3,2:2,3:1"
+    binary   A 16 byte header (see BINARY_HEADER): magic b'TETR', format version, status, rows, cols and the number of
+             tiles, followed by the label grid as little endian uint16 values in row-major order
+
+The status is one of STATUSES. Without a solution the diagram and the rle outputs are '?' or UNKNOWN (a search stopped
+by its limits, see limits.py) and the json and binary outputs carry the status and no placements.
+
+read_board_output and read_binary_output turn an output back into placements, checking it is well formed on the way,
+so a solver's output can be validated against the format it claims to follow.
+"""
+
+import json
+import string
+import struct
+from array import array
+
+from typing import Dict, List, Tuple, Union
+
+from tile import Orientation, find_orientation
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+__all__ = ['gen_board_output', 'gen_json_output', 'gen_rle_output', 'gen_binary_output', 'read_board_output',
+           'read_binary_output', 'label_grid', 'FORMATS', 'STATUSES', 'UNKNOWN']
+
+Solution = List[Tuple[Tuple[int, int], Orientation]]
+
+# The result of a search that was stopped by its limits before it could tell whether there is a solution
+UNKNOWN = 'unknown'
+
+STATUSES = ('solved', 'unsolvable', 'unknown')
+
+# The diagram characters, in the order they are handed out
+LABELS = string.ascii_lowercase + string.ascii_uppercase + string.digits
+
+BINARY_MAGIC = b'TETR'
+BINARY_VERSION = 1
+# magic, version, status (index into STATUSES), rows, cols, number of tiles
+BINARY_HEADER = struct.Struct('<4sBBHHIxx')
+
+def _status(solution: Union[Solution, None]) -> str:
+    if solution is None:
+        return 'unknown'
+    return 'solved' if solution else 'unsolvable'
+
+
+def _placements(solution: Solution) -> Solution:
+    """
+    :param solution: ([((int, int), Orientation)]) The placements, Tile objects are accepted too
+    :return:         ([((int, int), Orientation)]) The placements in label order, as (row, col) tuples and Orientations
+    """
+    placements = [((int(position[0]), int(position[1])), tile.orientation) for position, tile in solution]
+    placements.sort(key=lambda placement: placement[0])
+    return placements
+
+
+def label_grid(board_size: Tuple[int, int], solution: Solution) -> List[List[int]]:
+    """
+    :param board_size: (int, int) The board size in (row, col) format
+    :param solution:   ([((int, int), Orientation)]) The placements, Tile objects are accepted too
+    :return:           ([[int]])  The label of the tile covering each cell, indexed [row][col], or 0 if uncovered
+    """
+    rows, cols = board_size
+    grid = [[0] * cols for _ in range(rows)]
+    for label, ((row, col), orientation) in enumerate(_placements(solution), 1):
+        for r, c in orientation.cells:
+            grid[row + r][col + c] = label
+    return grid
+
+
+def _label_chars(grid: List[List[int]], count: int) -> List[str]:
+    """
+    :param grid:  ([[int]]) The label grid
+    :param count: (int)     The number of tiles
+    :return:      ([str])   The diagram character of each label, indexed by label (index 0 is the '.' of an uncovered
+                            cell)
+    """
+    chars = ['.'] + list(LABELS[:count])
+    if count <= len(LABELS):
+        return chars
+    # Past the end of LABELS, find each tile's neighbors and give it a character none of the earlier ones have
+    rows, cols = len(grid), len(grid[0])
+    neighbors = [set() for _ in range(count + 1)]
+    for r in range(rows):
+        for c in range(cols):
+            label = grid[r][c]
+            for other in (grid[r][c + 1] if c + 1 < cols else 0, grid[r + 1][c] if r + 1 < rows else 0):
+                if other and other != label:
+                    neighbors[label].add(other)
+                    neighbors[other].add(label)
+    for label in range(len(LABELS) + 1, count + 1):
+        taken = {chars[other] for other in neighbors[label] if other < label}
+        chars.append(next(char for char in LABELS if char not in taken))
+    return chars
+
+
+def gen_board_output(board_size: Tuple[int, int], solution: Union[Solution, None]) -> str:
+    """
+    Label the tiles 'a', 'b', ... in order of their position (the top left corner of their bounding box) and draw them.
+    :param board_size: (int, int) The board size in (row, col) format
+    :param solution:   ([((int, int), Orientation)]) The placements, Tile objects are accepted too. None if the search
+                                  was stopped by its limits.
+    :return:           (str)      The diagram, '?' if the solution is empty or UNKNOWN
+    """
+    if solution is None:
+        return UNKNOWN
+    if solution == []:
+        return '?'
+    grid = label_grid(board_size, solution)
+    chars = _label_chars(grid, len(solution))
+    return '\n'.join(''.join([chars[label] for label in row]) for row in grid)
+
+
+def read_board_output(board_size: Tuple[int, int], diagram: str) -> Union[Solution, None]:
+    """
+    Parse and check the output of gen_board_output. Every tile is a group of touching cells with the same character,
+    since touching tiles never share one.
+    :param board_size: (int, int) The board size in (row, col) format
+    :param diagram:    (str)      The diagram, '?' or UNKNOWN
+    :return:           ([((int, int), Orientation)]) The placements in label order, the empty list for '?' or None for
+                                  UNKNOWN
+    """
+    if diagram == UNKNOWN:
+        return None
+    if diagram == '?':
+        return []
+    rows, cols = board_size
+    lines = diagram.split('\n')
+    if len(lines) != rows or any(len(line) != cols for line in lines):
+        raise ValueError('ERROR: the diagram is not {} by {}'.format(rows, cols))
+    seen = [[False] * cols for _ in range(rows)]
+    solution = []
+    for row in range(rows):
+        for col in range(cols):
+            if seen[row][col]:
+                continue
+            char = lines[row][col]
+            if char not in LABELS:
+                raise ValueError('ERROR: {!r} at {} is not a tile label'.format(char, (row, col)))
+            seen[row][col] = True
+            cells = []
+            todo = [(row, col)]
+            while todo:
+                r, c = todo.pop()
+                cells.append((r, c))
+                for r, c in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                    if 0 <= r < rows and 0 <= c < cols and not seen[r][c] and lines[r][c] == char:
+                        seen[r][c] = True
+                        todo.append((r, c))
+            placement = find_orientation(cells)
+            if placement is None:
+                raise ValueError('ERROR: the {!r} at {} is not a tetromino'.format(char, (row, col)))
+            solution.append(placement)
+    solution.sort(key=lambda placement: placement[0])
+    if gen_board_output(board_size, solution) != diagram:
+        raise ValueError('ERROR: the tiles are not labelled in order')
+    return solution
+
+
+def gen_json_output(board_size: Tuple[int, int], solution: Union[Solution, None]) -> str:
+    """
+    :param board_size: (int, int) The board size in (row, col) format
+    :param solution:   ([((int, int), Orientation)]) The placements or None, see gen_board_output
+    :return:           (str)      The JSON document described in the module docstring
+    """
+    placements = []
+    for label, ((row, col), orientation) in enumerate(_placements(solution or []), 1):
+        placements.append({'label': label, 'type': orientation.type, 'orientation': orientation.index,
+                           'position': [row, col], 'cells': [[row + r, col + c] for r, c in orientation.cells]})
+    return json.dumps({'size': list(board_size), 'status': _status(solution), 'placements': placements})
+
+
+def gen_rle_output(board_size: Tuple[int, int], solution: Union[Solution, None]) -> str:
+    """
+    :param board_size: (int, int) The board size in (row, col) format
+    :param solution:   ([((int, int), Orientation)]) The placements or None, see gen_board_output
+    :return:           (str)      One line of label:run pairs per row, '?' or UNKNOWN
+    """
+    if not solution:
+        return gen_board_output(board_size, solution)
+    lines = []
+    for row in label_grid(board_size, solution):
+        runs = []
+        start = 0
+        for col in range(1, len(row) + 1):
+            if col == len(row) or row[col] != row[start]:
+                runs.append('{}:{}'.format(row[start], col - start))
+                start = col
+        lines.append(','.join(runs))
+    return '\n'.join(lines)
+
+
+def gen_binary_output(board_size: Tuple[int, int], solution: Union[Solution, None]) -> bytes:
+    """
+    :param board_size: (int, int) The board size in (row, col) format
+    :param solution:   ([((int, int), Orientation)]) The placements or None, see gen_board_output
+    :return:           (bytes)    The header and the label grid, see the module docstring
+    """
+    rows, cols = board_size
+    header = BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, STATUSES.index(_status(solution)), rows, cols,
+                                len(solution or []))
+    if not solution:
+        return header
+    labels = array('H', (label for row in label_grid(board_size, solution) for label in row))
+    if struct.pack('=H', 1) != struct.pack('<H', 1):
+        labels.byteswap()
+    return header + labels.tobytes()
+
+
+def read_binary_output(data: bytes) -> Tuple[str, Tuple[int, int], List[List[int]]]:
+    """
+    Parse the output of gen_binary_output.
+    :param data: (bytes) The binary output
+    :return:     (str, (int, int), [[int]]) The status, the board size and the label grid (None without a solution)
+    """
+    magic, version, status, rows, cols, count = BINARY_HEADER.unpack_from(data)
+    if magic != BINARY_MAGIC or version != BINARY_VERSION:
+        raise ValueError('ERROR: not a version {} tetrominos binary output'.format(BINARY_VERSION))
+    if not count:
+        return STATUSES[status], (rows, cols), None
+    labels = array('H')
+    labels.frombytes(data[BINARY_HEADER.size:BINARY_HEADER.size + 2 * rows * cols])
+    if struct.pack('=H', 1) != struct.pack('<H', 1):
+        labels.byteswap()
+    return STATUSES[status], (rows, cols), [labels[r * cols:(r + 1) * cols].tolist() for r in range(rows)]
+
+
+# The output formats by name, see the module docstring
+FORMATS = {
+    'diagram': gen_board_output,
+    'json': gen_json_output,
+    'rle': gen_rle_output,
+    'binary': gen_binary_output,
+}  # type: Dict[str, callable]
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""HW 1 - Tetrominos: Parallel search for a single instance
+
+CS542
+Michael Lane
+Homework 1: Tetrominos
+Due: 10 April 2017
+
+Splits the search tree of one instance across worker processes. The master expands the cell-driven search (see
+tetrominos.tettile_cells) down to a frontier depth. Every node on the frontier is a sub-problem: the placements made so
+far plus the tiles that remain. Sub-problems are handed out to a pool of workers as they become free.
+
+Each worker searches its sub-problem with a node budget. If the budget runs out the subtree is evidently large, so
+instead of grinding on it the worker expands it by one more level and sends the children back to the master to be
+handed out again. Idle workers therefore always pick up part of the largest remaining subtrees.
+
+The first worker to find a solution sets a shared event that makes every other worker stop, and the pool is torn down.
+A worker that dies (killed, out of memory) takes its sub-problem with it, so the search stops with BrokenProcessPool
+rather than wait for it.
+
+    $ python3 parallel.py --workers 16 < tests/large-test-pass.txt
+"""
+
+import argparse
+import multiprocessing
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from typing import List, Tuple, Union
+
+from tetrominos import BACKENDS, covering_moves, passes_prechecks, read_instance, tettile_cells
+from tile import SHAPES, TILE_TYPES, Orientation, gen_tiles, tile_counts
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+__all__ = ['tettile_parallel', 'solve_parallel']
+
+# A placement that can be sent between processes: ((row, col), tile type, orientation index)
+Placement = Tuple[Tuple[int, int], str, int]
+
+# Set in every worker by _init_worker
+_cancelled = None
+
+
+class BudgetExhausted(Exception):
+    pass
+
+
+class Cancelled(Exception):
+    pass
+
+
+def _init_worker(cancelled) -> None:
+    global _cancelled
+    _cancelled = cancelled
+
+
+def _budgeted_board(backend: type, size: Tuple[int, int], cancelled):
+    """
+    Build a board that stops the search by raising an exception once its budget of tile placements is used up or once
+    the cancelled event is set. The event is only checked every 256 placements since it needs a system call. The
+    budget is None (unlimited) until it is set.
+    :param backend:   (type)     The board class
+    :param size:      (int, int) The board size
+    :param cancelled: (Event)    Set when another worker has found a solution
+    :return:          (board)    The board
+    """
+    class BudgetedBoard(backend):
+        budget = None
+        nodes = 0
+
+        def place_tile(self, tile, position):
+            if self.budget is not None:
+                self.nodes += 1
+                if self.nodes > self.budget:
+                    raise BudgetExhausted()
+            if self.nodes & 0xff == 0 and cancelled.is_set():
+                raise Cancelled()
+            return super().place_tile(tile, position)
+
+    return BudgetedBoard(size)
+
+
+def _rebuild(board, tile_string: str, prefix: List[Placement]) -> List[int]:
+    """
+    Set up a sub-problem: place its placements on an empty board and count the tiles that remain.
+    :param board:       (Board)       The empty board
+    :param tile_string: (str)         The tile types of the whole instance
+    :param prefix:      ([Placement]) The placements
+    :return:            ([int])       The number of tiles remaining of each type, indexed like tile.TILE_TYPES
+    """
+    counts = tile_counts(tile_string)
+    for position, tile_type, index in prefix:
+        board.place_tile(SHAPES[tile_type][index], position)
+        counts[TILE_TYPES.index(tile_type)] -= 1
+    return counts
+
+
+def expand(board, counts: List[int],
+           prefix: List[Placement]) -> Tuple[List[List[Placement]], Union[None, List[Placement]]]:
+    """
+    Expand a sub-problem by one level: every valid way of covering the first empty cell.
+    :param board:  (Board)       The board with prefix already placed
+    :param counts: ([int])       The number of tiles remaining of each type
+    :param prefix: ([Placement]) The placements that make up this sub-problem
+    :return:       (list, list)  The child sub-problems, and a solution if one of the children solves the board
+    """
+    children = []
+    for index, orientation, position in covering_moves(board, board.first_empty(), counts):
+        board.place_tile(orientation, position)
+        if board.is_valid(orientation, position):
+            child = prefix + [(tuple(int(x) for x in position), orientation.type, orientation.index)]
+            if board.is_solved():
+                board.remove_tile(orientation, position)
+                return [], child
+            children.append(child)
+        board.remove_tile(orientation, position)
+    return children, None
+
+
+def _search(job: Tuple[str, Tuple[int, int], str, List[Placement], int]) -> Tuple[str, object]:
+    """
+    Worker: search one sub-problem.
+    :param job: (tuple) (backend, size, tile string, prefix, node budget)
+    :return:    (tuple) ('solved', placements), ('split', children), ('failed', None) or ('cancelled', None)
+    """
+    backend, size, tile_string, prefix, node_budget = job
+    board = _budgeted_board(BACKENDS[backend], size, _cancelled)
+    counts = _rebuild(board, tile_string, prefix)
+    board.budget = node_budget
+    remaining = gen_tiles(''.join(t * n for t, n in zip(TILE_TYPES, counts)))
+    try:
+        solution = tettile_cells(board, remaining)
+    except BudgetExhausted:
+        board = BACKENDS[backend](size)
+        counts = _rebuild(board, tile_string, prefix)
+        children, solution = expand(board, counts, prefix)
+        if solution is not None:
+            return 'solved', solution
+        return 'split', children
+    except Cancelled:
+        return 'cancelled', None
+    if solution:
+        return 'solved', prefix + [(tuple(int(x) for x in position), o.type, o.index) for position, o in solution]
+    return 'failed', None
+
+
+def tettile_parallel(size: Tuple[int, int], tile_string: str, workers: int = None, backend: str = 'bitboard',
+                     frontier_depth: int = 2, node_budget: int = 50000) -> List[Tuple[Tuple[int, int], Orientation]]:
+    """
+    Search one instance across a pool of worker processes.
+    :param size:           (int, int) The board size in (row, col) format
+    :param tile_string:    (str)      The tile types to place
+    :param workers:        (int)      Number of worker processes. Defaults to the number of CPUs.
+    :param backend:        (str)      Board implementation, one of tetrominos.BACKENDS
+    :param frontier_depth: (int)      How many levels the master expands before handing out sub-problems
+    :param node_budget:    (int)      Placements a worker makes before splitting its sub-problem
+    :return:               ([((int, int), Orientation)]) The placements or the empty list if no solution was found
+    :raises BrokenProcessPool: if a worker died
+    """
+    pending = deque([[]])
+    # Expand breadth first down to the frontier
+    for _ in range(frontier_depth):
+        frontier = deque()
+        while pending:
+            prefix = pending.popleft()
+            board = BACKENDS[backend](size)
+            counts = _rebuild(board, tile_string, prefix)
+            children, solution = expand(board, counts, prefix)
+            if solution is not None:
+                return _orientations(solution)
+            frontier.extend(children)
+        pending = frontier
+    if not pending:
+        return []
+
+    cancelled = multiprocessing.Event()
+    pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(cancelled,))
+    try:
+        in_flight = set()
+        limit = 2 * (workers or multiprocessing.cpu_count())
+        while pending or in_flight:
+            while pending and len(in_flight) < limit:
+                # Depth first: newest (deepest) sub-problems are handed out first to keep the pending list small
+                job = (backend, size, tile_string, pending.pop(), node_budget)
+                in_flight.add(pool.submit(_search, job))
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                # Raises BrokenProcessPool if a worker died
+                status, payload = future.result()
+                if status == 'solved':
+                    return _orientations(payload)
+                if status == 'split':
+                    pending.extend(payload)
+    finally:
+        # Stop the workers still searching, they check the event every few hundred placements
+        cancelled.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+    return []
+
+
+def _orientations(placements: List[Placement]) -> List[Tuple[Tuple[int, int], Orientation]]:
+    return [(position, SHAPES[tile_type][index]) for position, tile_type, index in placements]
+
+
+def solve_parallel(size: Tuple[int, int], tile_string: str, workers: int = None, backend: str = 'bitboard',
+                   frontier_depth: int = 2, node_budget: int = 50000) -> str:
+    """
+    Solve a single instance in parallel and return the printable result. See tettile_parallel.
+    :return: (str) The solution diagram or '?' if there is no solution
+    """
+    if not passes_prechecks(size, tile_string):
+        return '?'
+    solution = tettile_parallel(size, tile_string, workers=workers, backend=backend,
+                                frontier_depth=frontier_depth, node_budget=node_budget)
+    return BACKENDS[backend].gen_board_output(size, solution)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Solve one tetromino tiling instance on several cores')
+    parser.add_argument('input', nargs='?', help='Instance file. Read from stdin if omitted.')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: number of CPUs)')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='bitboard',
+                        help='Board implementation to search with (default: bitboard)')
+    parser.add_argument('--frontier-depth', type=int, default=2,
+                        help='Levels expanded before handing out sub-problems (default: 2)')
+    parser.add_argument('--node-budget', type=int, default=50000,
+                        help='Placements a worker makes before splitting its sub-problem (default: 50000)')
+    args = parser.parse_args()
+    size, tile_string = read_instance(args.input)
+    print(solve_parallel(size, tile_string, workers=args.workers, backend=args.backend,
+                         frontier_depth=args.frontier_depth, node_budget=args.node_budget))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""HW 1 - Tetrominos: Region feasibility pruning
+
+CS542
+Michael Lane
+Homework 1: Tetrominos
+Due: 10 April 2017
+
+Board.is_valid only rejects groups of free cells whose size isn't a multiple of 4. Plenty of groups pass that test and
+still can't be tiled with the tiles that are left. This module adds three stronger checks, run on every group of free
+cells after each placement:
+
+    1. Checkerboard balance. Color the board like a checkers board. Every tile except the T covers 2 black and 2 white
+       cells, a T covers 3 of one and 1 of the other. So a group with b black and w white cells needs at least
+       |b - w| / 2 T tiles, and the number of T tiles in it has the same parity as |b - w| / 2. Summed over all the
+       groups this must fit the T tiles that remain. This generalizes the "even number of Ts" check in tetrominos.py.
+    2. Tetromino pockets. A group of exactly 4 cells is a tetromino shape and can only be filled by that one tile
+       type (see POCKETS, every fixed tetromino mapped to its tile type).
+    3. Small groups. A group of up to SMALL_REGION cells is solved exactly. The answer only depends on the shape of
+       the group and on how many of each tile type are available (capped at the number of tiles the group needs), so
+       it is cached under that key and the search for that shape is never repeated.
+
+The checks work on the free cells bitmask of either board (see Board.occupancy).
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+from bitboard import iter_bits, popcount
+from tile import SHAPES, TILE_TYPES
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+__all__ = ['RegionPruner', 'POCKETS']
+
+# Every 4 cell shape, as (row, col) offsets from the top left of its bounding box, mapped to the tile type that fills it
+POCKETS = {orientation.cells: orientation.type for orientations in SHAPES.values() for orientation in orientations}
+
+# Groups up to this many cells are solved exactly
+SMALL_REGION = 12
+
+T_INDEX = TILE_TYPES.index('T')
+
+
+def _tileable(cells: frozenset, counts: List[int]) -> bool:
+    """
+    Exact check: can this set of cells be tiled with the given tiles? Always covers the first cell in scan order.
+    :param cells:  (frozenset) The (row, col) cells
+    :param counts: ([int])     The number of tiles available of each type, indexed like tile.TILE_TYPES
+    :return:       (bool)      True if the cells can be tiled
+    """
+    if not cells:
+        return True
+    row, col = min(cells)
+    for index, tile_type in enumerate(TILE_TYPES):
+        if not counts[index]:
+            continue
+        for orientation in SHAPES[tile_type]:
+            anchor_col = orientation.cells[0][1]
+            covered = frozenset((row + r, col + c - anchor_col) for r, c in orientation.cells)
+            if covered <= cells:
+                counts[index] -= 1
+                found = _tileable(cells - covered, counts)
+                counts[index] += 1
+                if found:
+                    return True
+    return False
+
+
+class RegionPruner:
+    """Feasibility checks for the groups of free cells on a board of a given size"""
+
+    def __init__(self, size: Tuple[int, int], small_region: int = SMALL_REGION) -> None:
+        """
+        :param size:         (int, int) The board size in (row, col) format
+        :param small_region: (int)      Groups up to this many cells are solved exactly
+        """
+        self.rows, self.cols = size
+        self.small_region = small_region
+        self.full = (1 << (self.rows * self.cols)) - 1
+        first_col = sum(1 << (r * self.cols) for r in range(self.rows))
+        self.not_first_col = self.full & ~first_col
+        self.not_last_col = self.full & ~(first_col << (self.cols - 1))
+        self.black = sum(1 << (r * self.cols + c) for r in range(self.rows) for c in range(self.cols) if (r + c) % 2)
+        self.cache = {}  # type: Dict[Tuple[Tuple[Tuple[int, int], ...], Tuple[int, ...]], bool]
+        self.hits = 0
+        self.misses = 0
+
+    def flood(self, seed: int, free: int) -> int:
+        """
+        See BitBoard.flood.
+        :param seed: (int) Bitmask of the starting cell
+        :param free: (int) Bitmask of the cells the region may grow into
+        :return:     (int) Bitmask of the connected region
+        """
+        region = seed & free
+        cols = self.cols
+        while True:
+            grown = (region | ((region << 1) & self.not_first_col) | ((region >> 1) & self.not_last_col)
+                     | (region << cols) | (region >> cols)) & free
+            if grown == region:
+                return region
+            region = grown
+
+    def shape(self, region: int) -> Tuple[Tuple[int, int], ...]:
+        """
+        :param region: (int) Bitmask of a group of cells
+        :return:       (tuple) The cells as sorted (row, col) offsets from the top left of the group's bounding box
+        """
+        cells = [divmod(cell, self.cols) for cell in iter_bits(region)]
+        top = cells[0][0]
+        left = min(c for _, c in cells)
+        return tuple((r - top, c - left) for r, c in cells)
+
+    def region_is_tileable(self, region: int, size: int, counts: Sequence[int]) -> bool:
+        """
+        Checks 2 and 3: exact, cached feasibility of a small group.
+        :param region: (int)   Bitmask of the group
+        :param size:   (int)   Number of cells in the group
+        :param counts: ([int]) The number of tiles remaining of each type
+        :return:       (bool)  False if the group certainly can't be tiled
+        """
+        shape = self.shape(region)
+        if size == 4:
+            return counts[TILE_TYPES.index(POCKETS[shape])] > 0
+        needed = size // 4
+        key = (shape, tuple(min(count, needed) for count in counts))
+        if key in self.cache:
+            self.hits += 1
+            return self.cache[key]
+        self.misses += 1
+        result = _tileable(frozenset(shape), list(key[1]))
+        self.cache[key] = result
+        return result
+
+    def feasible(self, occupancy: int, counts: Sequence[int]) -> bool:
+        """
+        Run every check on every group of free cells.
+        :param occupancy: (int)   The free cells bitmask (see Board.occupancy)
+        :param counts:    ([int]) The number of tiles remaining of each type, indexed like tile.TILE_TYPES
+        :return:          (bool)  False if the board certainly can't be finished
+        """
+        t_needed = 0
+        remaining = occupancy
+        while remaining:
+            region = self.flood(remaining & -remaining, remaining)
+            remaining ^= region
+            size = popcount(region)
+            if size % 4 != 0:
+                return False
+            t_needed += abs(2 * popcount(region & self.black) - size) // 2
+            if size <= self.small_region and not self.region_is_tileable(region, size, counts):
+                return False
+        t_remaining = counts[T_INDEX]
+        return t_needed <= t_remaining and (t_remaining - t_needed) % 2 == 0
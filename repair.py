@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""HW 1 - Tetrominos: Solution repair
+
+CS542
+Michael Lane
+Homework 1: Tetrominos
+Due: 10 April 2017
+
+Instances often come back with a piece or two swapped, an L for a P say, and every engine starts over from an empty
+board. Most of the previous solution is still good, so repair keeps it and only re-solves a small region around the
+pieces that have to go, a large neighbourhood search:
+
+    1. The seeds are placements of the types there are now too many of, one for each extra tile. Every way of picking
+       them is a candidate, up to MAX_SEED_SETS of them.
+    2. The region starts as the seeds and grows by the placements next to it, nearest first, doubling in size each
+       round. Its placements are ripped up and the rest of the board is kept as it is.
+    3. The ripped cells are tiled with what's left of the new tiles by the cells engine, with the region pruner and a
+       node limit so that a region that can't be done is given up on quickly.
+    4. Once the region would be more than MAX_SHARE of the board, repair falls back to solving the whole instance.
+
+A one piece swap on a 10x10 board is usually repaired with a region of a few tiles in a few milliseconds.
+
+    $ python3 repair.py previous-output.txt < input-file.txt
+"""
+
+import argparse
+import sys
+from itertools import combinations, islice, product
+
+from typing import List, Tuple, Union
+
+from bitboard import BitBoard
+from limits import SearchInterrupted, SearchLimits, limited
+from output import gen_board_output, read_board_output
+from pruning import RegionPruner
+from tetrominos import ENGINES, passes_prechecks, read_instance, tettile_cells
+from tile import Orientation, TILE_TYPES, gen_tiles, tile_counts
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+__all__ = ['repair', 'RepairStats']
+
+Solution = List[Tuple[Tuple[int, int], Orientation]]
+
+# Nodes the search of one region may place before the region is given up on
+NODE_LIMIT = 2000
+# The largest region to repair, as a share of the tiles on the board, before falling back to a full solve
+MAX_SHARE = 0.5
+# Ways of picking the seeds to try
+MAX_SEED_SETS = 16
+
+
+class RepairStats:
+    """What a repair did"""
+
+    def __init__(self) -> None:
+        self.attempts = 0
+        self.ripped = 0
+        self.full_solve = False
+
+    def __str__(self) -> str:
+        if self.full_solve:
+            return 'repair: gave up after {} regions, solved from scratch'.format(self.attempts)
+        return 'repair: re-solved {} tiles, {} regions tried'.format(self.ripped, self.attempts)
+
+
+def _owners(size: Tuple[int, int], placements: Solution) -> Union[List[List[int]], None]:
+    """
+    :param size:       (int, int) The board size
+    :param placements: ([((int, int), Orientation)]) A solution
+    :return:           ([[int]])  The index of the placement covering each cell, or None if it isn't a tiling of the
+                                  board
+    """
+    rows, cols = size
+    owners = [[None] * cols for _ in range(rows)]
+    for index, ((row, col), orientation) in enumerate(placements):
+        for r, c in orientation.cells:
+            r, c = row + r, col + c
+            if not (0 <= r < rows and 0 <= c < cols) or owners[r][c] is not None:
+                return None
+            owners[r][c] = index
+    if any(owner is None for line in owners for owner in line):
+        return None
+    return owners
+
+
+def _neighbours(placements: Solution, owners: List[List[int]]) -> List[List[int]]:
+    """
+    :return: ([[int]]) The indexes of the placements touching each placement, in index order
+    """
+    rows, cols = len(owners), len(owners[0])
+    touching = [set() for _ in placements]
+    for r in range(rows):
+        for c in range(cols):
+            for other in (owners[r][c + 1] if c + 1 < cols else None, owners[r + 1][c] if r + 1 < rows else None):
+                if other is not None and other != owners[r][c]:
+                    touching[owners[r][c]].add(other)
+                    touching[other].add(owners[r][c])
+    return [sorted(indexes) for indexes in touching]
+
+
+def _nearest_first(neighbours: List[List[int]], seeds: Tuple[int, ...]) -> List[int]:
+    """
+    :return: ([int]) Every placement, breadth first from the seeds through the placements touching each other
+    """
+    order = list(seeds)
+    seen = set(seeds)
+    for index in order:
+        for other in neighbours[index]:
+            if other not in seen:
+                seen.add(other)
+                order.append(other)
+    return order
+
+
+def _solve_region(size: Tuple[int, int], kept: Solution, counts: List[int], pruner: RegionPruner,
+                  node_limit: int) -> Solution:
+    """
+    :param size:       (int, int) The board size
+    :param kept:       ([((int, int), Orientation)]) The placements left on the board
+    :param counts:     ([int])    The tiles to fill the rest of the board with, indexed like TILE_TYPES
+    :param pruner:     (RegionPruner) The region checks of the board
+    :param node_limit: (int)      Nodes the search may place
+    :return:           ([((int, int), Orientation)]) The new placements, or the empty list if there are none in time
+    """
+    limits = SearchLimits(max_nodes=node_limit + len(kept))
+    board = limited(BitBoard, limits)(size)
+    for position, orientation in kept:
+        board.place_tile(orientation, position)
+    if not pruner.feasible(board.occupancy(), counts):
+        return []
+    tiles = gen_tiles(''.join(tile_type * count for tile_type, count in zip(TILE_TYPES, counts)))
+    try:
+        return tettile_cells(board, tiles, pruner=pruner)
+    except SearchInterrupted:
+        return []
+
+
+def repair(size: Tuple[int, int], previous: Union[Solution, str], tile_string: str, engine: str = 'dlx',
+           node_limit: int = NODE_LIMIT, stats: RepairStats = None) -> Union[Solution, None]:
+    """
+    Tile the board with the tiles by changing as little of a previous solution as needed, see the module docstring.
+    :param size:        (int, int) The board size in (row, col) format
+    :param previous:    ([((int, int), Orientation)] or str) A solution of the same board with other tiles, as
+                                   placements or a diagram
+    :param tile_string: (str)      The tile types to place now
+    :param engine:      (str)      The engine to fall back to, one of tetrominos.ENGINES
+    :param node_limit:  (int)      Nodes the search of each region may place
+    :param stats:       (RepairStats) Record what the repair did into this, optional
+    :return:            ([((int, int), Orientation)]) The placements in label order, the empty list if there is no
+                                   solution or None if the fallback engine gave up (see blocks.py)
+    """
+    stats = stats if stats is not None else RepairStats()
+    if not passes_prechecks(size, tile_string):
+        return []
+    if isinstance(previous, str):
+        previous = read_board_output(size, previous)
+    placements = [((int(row), int(col)), tile.orientation) for (row, col), tile in previous or []]
+    owners = _owners(size, placements)
+    if owners is not None:
+        counts = tile_counts(tile_string)
+        extra = [have - want for have, want in zip(tile_counts([o for _, o in placements]), counts)]
+        if not any(extra):
+            return sorted(placements, key=lambda placement: placement[0])
+        # Every way of picking the placements to take out, one for each extra tile
+        choices = [combinations([i for i, (_, o) in enumerate(placements) if o.type == tile_type], extra[index])
+                   for index, tile_type in enumerate(TILE_TYPES) if extra[index] > 0]
+        seed_sets = [sum(picks, ()) for picks in islice(product(*choices), MAX_SEED_SETS)]
+        neighbours = _neighbours(placements, owners)
+        orders = [_nearest_first(neighbours, seeds) for seeds in seed_sets]
+        pruner = RegionPruner(size)
+        tried = set()
+        region = max(len(seeds) for seeds in seed_sets)
+        while region <= MAX_SHARE * len(placements):
+            for order in orders:
+                ripped = frozenset(order[:region])
+                if ripped in tried:
+                    continue
+                tried.add(ripped)
+                stats.attempts += 1
+                kept = [placement for i, placement in enumerate(placements) if i not in ripped]
+                remaining = list(counts)
+                for _, orientation in kept:
+                    remaining[TILE_TYPES.index(orientation.type)] -= 1
+                solution = _solve_region(size, kept, remaining, pruner, node_limit)
+                if solution:
+                    stats.ripped = len(ripped)
+                    return sorted(kept + solution, key=lambda placement: placement[0])
+            region *= 2
+    # No previous solution to start from, or no region small enough could be repaired
+    stats.full_solve = True
+    solution = ENGINES[engine](BitBoard(size), gen_tiles(tile_string))
+    if solution is None:
+        # The blocks engine gave up, which doesn't mean there is no solution
+        return None
+    return sorted(solution, key=lambda placement: placement[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tile a board by repairing the solution of a similar instance')
+    parser.add_argument('previous', help='The solution diagram of the same board with other tiles')
+    parser.add_argument('input', nargs='?', help='Instance file. Read from stdin if omitted.')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='dlx',
+                        help='Search to fall back to when the repair fails (default: dlx)')
+    parser.add_argument('--node-limit', type=int, default=NODE_LIMIT,
+                        help='Nodes the search of each region may place (default: {})'.format(NODE_LIMIT))
+    parser.add_argument('--stats', action='store_true', help='Print what the repair did to stderr')
+    args = parser.parse_args()
+
+    size, tile_string = read_instance(args.input)
+    with open(args.previous) as f:
+        previous = f.read().strip()
+    stats = RepairStats()
+    try:
+        solution = repair(size, previous, tile_string, args.engine, args.node_limit, stats)
+    except ValueError as e:
+        parser.error('{} is not a solution of a {}x{} board: {}'.format(args.previous, size[0], size[1], e))
+    print(gen_board_output(size, solution))
+    if args.stats:
+        print(stats, file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""HW 1 - Tetrominos: Resumable search
+
+CS542
+Michael Lane
+Homework 1: Tetrominos
+Due: 10 April 2017
+
+tettile keeps its partial solution on the Python call stack, so a long search can't be paused, looked at or carried
+over to another process: when a preemptible machine goes away, the work goes with it. tettile_stack runs the same
+search as tettile without recursion. Its whole state is two lists of small integers:
+
+    moves    The placement made at each level, as orientation index * board area + row * cols + col, where the
+             orientation index points into ORIENTATIONS
+    cursors  For each level, one more than there are moves, the next candidate to try there
+
+The candidates of a level are the orientations of the remaining tile types, in the order tettile tries them: each type
+is tried once however many of it remain, in the order of the first remaining tile of that type in the input string.
+Each is placed at its most northwestern position, so tettile_stack visits the same nodes and finds the same solution
+as tettile.
+
+Given a Checkpoint, the state is written to a small JSON file every interval seconds, whenever it is asked for (from
+a signal handler, see Checkpoint.handle_signals) and when a search limit interrupts the search. A search given a
+Checkpoint whose file exists carries on from where the file left off. The file is removed once the search finishes.
+
+    $ python3 tetrominos.py --engine stack --checkpoint search.json --checkpoint-interval 60 < large-input-file.txt
+"""
+
+import json
+import os
+import signal
+import time
+
+from typing import List, Tuple, Union
+
+from limits import SearchInterrupted
+from pruning import RegionPruner
+from tile import Orientation, Tile, SHAPES, TILE_TYPES, tile_counts
+from transposition import TranspositionTable, state_key
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+__all__ = ['Checkpoint', 'tettile_stack', 'ORIENTATIONS']
+
+CHECKPOINT_VERSION = 1
+# Nodes between looks at the clock when saving at intervals
+CHECK_INTERVAL = 1000
+
+# Every orientation of every tile type, in TILE_TYPES order
+ORIENTATIONS = tuple(orientation for tile_type in TILE_TYPES for orientation in SHAPES[tile_type])
+_INDEX = {orientation: index for index, orientation in enumerate(ORIENTATIONS)}
+
+
+class Checkpoint:
+    """Where and when a resumable search saves its state"""
+
+    def __init__(self, path: str, interval: float = None) -> None:
+        """
+        :param path:     (str)   The checkpoint file
+        :param interval: (float) Save every this many seconds, optional
+        """
+        self.path = path
+        self.interval = interval
+        self.requested = False
+        self.stop = False
+        self.saves = 0
+        self.resumed = None
+
+    def __str__(self) -> str:
+        resumed = '' if self.resumed is None else ', resumed at depth {}'.format(self.resumed)
+        return 'checkpoint {}: saved {} times{}'.format(self.path, self.saves, resumed)
+
+    def request(self, stop: bool = False) -> None:
+        """
+        Save at the next node. Safe to call from a signal handler.
+        :param stop: (bool) Interrupt the search once saved
+        """
+        self.stop = self.stop or stop
+        self.requested = True
+
+    def handle_signals(self, save: Tuple[int, ...] = (signal.SIGUSR1,),
+                       stop: Tuple[int, ...] = (signal.SIGTERM, signal.SIGINT)) -> None:
+        """
+        Install signal handlers that save the search, and for the stop signals interrupt it once saved.
+        :param save: ((int)) Signals that save and carry on
+        :param stop: ((int)) Signals that save and stop
+        """
+        for signum in save:
+            signal.signal(signum, lambda *_: self.request())
+        for signum in stop:
+            signal.signal(signum, lambda *_: self.request(stop=True))
+
+    def load(self) -> Union[dict, None]:
+        """
+        :return: (dict) The saved state, or None if there is no checkpoint file
+        """
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        if state.get('version') != CHECKPOINT_VERSION:
+            raise ValueError('ERROR: {} is not a version {} checkpoint'.format(self.path, CHECKPOINT_VERSION))
+        return state
+
+    def save(self, state: dict) -> None:
+        """
+        Write the state to a temporary file first, so a crash halfway through leaves the last checkpoint intact.
+        :param state: (dict) The search state
+        """
+        temporary = self.path + '.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(state, f, separators=(',', ':'))
+        os.replace(temporary, self.path)
+        self.saves += 1
+        self.requested = False
+
+    def discard(self) -> None:
+        """Remove the checkpoint file, if there is one"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def tettile_stack(board, tiles: List[Tile], table: TranspositionTable = None, pruner: RegionPruner = None,
+                  checkpoint: Checkpoint = None) -> List[Tuple[Tuple[int, int], Orientation]]:
+    """
+    Search like tettile, with an explicit stack that can be saved and resumed (see the module docstring).
+    :param board:      (Board)              The empty board to tile
+    :param tiles:      ([Tile])             The tiles to place
+    :param table:      (TranspositionTable) Memo of states known to have no solution, optional (see tettile)
+    :param pruner:     (RegionPruner)       Region feasibility checks, optional (see tettile)
+    :param checkpoint: (Checkpoint)         Save the search state here, and resume from it if it exists. Optional.
+    :return:           ([((int, int), Orientation)]) The placements or the empty list if no solution was found
+    """
+    rows, cols = board.board_size
+    area = rows * cols
+    tile_string = ''.join(tile.type for tile in tiles)
+    totals = tile_counts(tiles)
+    counts = list(totals)
+    # Where each tile of each type is in the input, to order the types the way tettile's slicing of the tiles does
+    appearances = [[i for i, tile_type in enumerate(tile_string) if tile_type == TILE_TYPES[index]]
+                   for index in range(len(TILE_TYPES))]
+
+    known = {}  # The candidates only depend on the remaining tiles
+
+    def candidates() -> List[Tuple[int, Orientation, int]]:
+        """(type index, orientation, orientation index * area) for every candidate at the current level"""
+        key = tuple(counts)
+        if key not in known:
+            types = sorted((index for index in range(len(TILE_TYPES)) if counts[index]),
+                           key=lambda index: appearances[index][totals[index] - counts[index]])
+            known[key] = [(index, orientation, _INDEX[orientation] * area)
+                          for index in types for orientation in SHAPES[TILE_TYPES[index]]]
+        return known[key]
+
+    moves = []
+    cursors = [0]
+    levels = [candidates()]  # The candidates of each level, rebuilt rather than saved
+    nodes = 0
+
+    def state() -> dict:
+        return {'version': CHECKPOINT_VERSION, 'size': [rows, cols], 'tiles': tile_string, 'nodes': nodes,
+                'moves': moves, 'cursors': cursors}
+
+    saved = checkpoint.load() if checkpoint is not None else None
+    if saved is not None:
+        if saved['size'] != [rows, cols] or saved['tiles'] != tile_string:
+            raise ValueError('ERROR: the checkpoint {} is for another instance'.format(checkpoint.path))
+        for move in saved['moves']:
+            orientation_index, cell = divmod(move, area)
+            orientation = ORIENTATIONS[orientation_index]
+            board.place_tile(orientation, divmod(cell, cols))
+            counts[TILE_TYPES.index(orientation.type)] -= 1
+            levels.append(candidates())
+        moves, cursors, nodes = saved['moves'], saved['cursors'], saved['nodes']
+        checkpoint.resumed = len(moves)
+
+    last_save = time.monotonic()
+    next_check = nodes + CHECK_INTERVAL
+    stopped = False
+    try:
+        while cursors and not board.is_solved():
+            cursor = cursors[-1]
+            level = levels[-1]
+            # A new level: give up on it straight away if the pruner or the table rule it out
+            dead = cursor == 0 and (pruner is not None and not pruner.feasible(board.occupancy(), counts)
+                                    or table is not None and table.is_dead(state_key(board.occupancy(), counts)))
+            placed = False
+            while not dead and cursor < len(level):
+                type_index, orientation, offset = level[cursor]
+                cursor += 1
+                position = board.tile_can_be_placed(orientation)
+                if position is False:
+                    continue
+                board.place_tile(orientation, position)
+                if board.is_valid(orientation, position):
+                    placed = True
+                    break
+                board.remove_tile(orientation, position)
+            if not placed:
+                # Every candidate failed, back up a level
+                if not dead and table is not None:
+                    table.add(state_key(board.occupancy(), counts))
+                cursors.pop()
+                levels.pop()
+                if moves:
+                    orientation_index, cell = divmod(moves.pop(), area)
+                    orientation = ORIENTATIONS[orientation_index]
+                    board.remove_tile(orientation, divmod(cell, cols))
+                    counts[TILE_TYPES.index(orientation.type)] += 1
+                continue
+            counts[type_index] -= 1
+            moves.append(offset + position[0] * cols + position[1])
+            cursors[-1] = cursor
+            cursors.append(0)
+            levels.append(candidates())
+            nodes += 1
+            if checkpoint is not None:
+                if nodes >= next_check:
+                    next_check = nodes + CHECK_INTERVAL
+                    if checkpoint.interval is not None and time.monotonic() - last_save >= checkpoint.interval:
+                        checkpoint.request()
+                if checkpoint.requested:
+                    checkpoint.save(state())
+                    last_save = time.monotonic()
+                    if checkpoint.stop:
+                        stopped = True
+                        break
+    except SearchInterrupted:
+        # A search limit was hit, save where the search got to
+        if checkpoint is not None:
+            checkpoint.save(state())
+        raise
+    if stopped:
+        raise SearchInterrupted('cancelled')
+    if checkpoint is not None:
+        checkpoint.discard()
+    if not board.is_solved():
+        return []
+    solution = []
+    for move in moves:
+        orientation_index, cell = divmod(move, area)
+        solution.append((divmod(cell, cols), ORIENTATIONS[orientation_index]))
+    return solution
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""HW 1 - Tetrominos: Enumerating and counting solutions
+
+CS542
+Michael Lane
+Homework 1: Tetrominos
+Due: 10 April 2017
+
+tettile stops at the first solution. This module walks the whole search tree of the cell-driven search (see
+tetrominos.tettile_cells) instead. Because that search always covers the first empty cell, every tiling of the board is
+reached along exactly one path, so:
+
+    iter_solutions  yields each tiling lazily, in the same [(position, tile), ...] format as tettile
+    count_solutions counts the tilings without building any of them. Whether the rest of the board can be tiled only
+                    depends on which cells are free and which tile types remain, so the count for each such state is
+                    memoized and shared by every path that reaches it.
+
+Pieces of the same type are interchangeable, so by default two solutions that only differ by swapping same-type pieces
+are the same solution. With distinct_pieces=True every input piece is treated as distinguishable: each tiling is
+yielded once per assignment of the input pieces to its placements (the i-th entry of the solution is where the i-th
+input piece goes) and counted that many times.
+
+    $ python3 solutions.py --count < tests/medium-test-pass.txt
+"""
+
+import argparse
+import itertools
+from math import factorial
+
+from typing import Dict, Iterator, List, Tuple
+
+from tetrominos import BACKENDS, covering_moves, passes_prechecks, read_instance
+from tile import Orientation, Tile, TILE_TYPES, gen_tiles, tile_counts
+from transposition import state_key
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+__all__ = ['iter_solutions', 'count_solutions']
+
+Solution = List[Tuple[Tuple[int, int], Orientation]]
+
+
+def iter_solutions(board, tiles: List[Tile], distinct_pieces: bool = False) -> Iterator[Solution]:
+    """
+    Lazily yield every solution. The board is back in its original state once the generator is exhausted.
+    :param board:           (Board)  The board to tile. Must be valid (see Board.is_valid) to begin with.
+    :param tiles:           ([Tile]) The tiles to place
+    :param distinct_pieces: (bool)   Yield every assignment of the input pieces to each tiling, see the module docstring
+    :return:                (iter)   Each solution as a list of (position, Orientation)
+    """
+    for solution in _iter_tilings(board, tile_counts(tiles), []):
+        if not distinct_pieces:
+            yield list(solution)
+            continue
+        # Hand the placements of each type out to the input pieces of that type in every possible order
+        by_type = {t: [p for p in solution if p[1].type == t] for t in TILE_TYPES}
+        orders = [itertools.permutations(by_type[t]) for t in TILE_TYPES if by_type[t]]
+        for assignment in itertools.product(*orders):
+            queues = {order[0][1].type: list(order) for order in assignment}
+            yield [queues[tile.type].pop(0) for tile in tiles]
+
+
+def _iter_tilings(board, counts: List[int], solution: Solution) -> Iterator[Solution]:
+    cell = board.first_empty()
+    if cell is None:
+        yield solution
+        return
+    for index, orientation, position in covering_moves(board, cell, counts):
+        board.place_tile(orientation, position)
+        if board.is_valid(orientation, position):
+            counts[index] -= 1
+            solution.append((position, orientation))
+            yield from _iter_tilings(board, counts, solution)
+            solution.pop()
+            counts[index] += 1
+        board.remove_tile(orientation, position)
+
+
+def count_solutions(board, tiles: List[Tile], distinct_pieces: bool = False, memo: Dict[int, int] = None) -> int:
+    """
+    Count the solutions without enumerating them.
+    :param board:           (Board)       The board to tile. Must be valid (see Board.is_valid) to begin with.
+    :param tiles:           ([Tile])      The tiles to place
+    :param distinct_pieces: (bool)        Count every assignment of the input pieces to each tiling
+    :param memo:            ({int: int})  Counts by state (see transposition.state_key). Pass the same dict to share
+                                          counts between calls on the same board size.
+    :return:                (int)         The number of solutions
+    """
+    counts = tile_counts(tiles)
+    total = _count_tilings(board, counts, {} if memo is None else memo)
+    if distinct_pieces:
+        for count in counts:
+            total *= factorial(count)
+    return total
+
+
+def _count_tilings(board, counts: List[int], memo: Dict[int, int]) -> int:
+    cell = board.first_empty()
+    if cell is None:
+        return 1
+    key = state_key(board.occupancy(), counts)
+    if key in memo:
+        return memo[key]
+    total = 0
+    for index, orientation, position in covering_moves(board, cell, counts):
+        board.place_tile(orientation, position)
+        if board.is_valid(orientation, position):
+            counts[index] -= 1
+            total += _count_tilings(board, counts, memo)
+            counts[index] += 1
+        board.remove_tile(orientation, position)
+    memo[key] = total
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Enumerate or count the solutions of a tetromino tiling instance')
+    parser.add_argument('input', nargs='?', help='Instance file. Read from stdin if omitted.')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='bitboard',
+                        help='Board implementation to search with (default: bitboard)')
+    parser.add_argument('--count', action='store_true', help='Only print the number of solutions')
+    parser.add_argument('--limit', type=int, default=None, help='Stop after printing this many solutions')
+    parser.add_argument('--distinct-pieces', action='store_true',
+                        help='Treat pieces of the same type as distinguishable')
+    args = parser.parse_args()
+
+    size, tile_string = read_instance(args.input)
+    board = BACKENDS[args.backend](size)
+    tiles = gen_tiles(tile_string) if passes_prechecks(size, tile_string) else None
+    if args.count:
+        print(count_solutions(board, tiles, args.distinct_pieces) if tiles is not None else 0)
+        return
+    solutions = iter_solutions(board, tiles, args.distinct_pieces) if tiles is not None else iter([])
+    found = False
+    for solution in itertools.islice(solutions, args.limit):
+        if found:
+            print()
+        print(board.gen_board_output(size, solution))
+        found = True
+    if not found:
+        print('?')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""HW 1 - Tetrominos: Search instrumentation
+
+CS542
+Michael Lane
+Homework 1: Tetrominos
+Due: 10 April 2017
+
+Counts what a search does and where its time goes. The counting is done by a subclass of the board (see
+instrumented_board) that wraps the board methods the engines call, so the engines themselves are unchanged and a
+search on a plain board pays nothing for it. The one exception is the tiles engine skipping a tile type it already
+tried at the same node (tiles_used in tettile), which the board can't see: tettile counts it itself when it is handed a
+SearchStats.
+
+What is counted:
+
+    nodes           Search states reached by a placement that passed the partition check
+    tile_fits       Calls to Board.tile_fits, made by the cells engine (the tiles engine finds a position for each
+                    orientation with tile_can_be_placed instead)
+    placements      Tiles placed on the board
+    backtracks      Tiles taken back off the board after the search below them failed
+    prunes          Branches cut, by reason:
+                        partition       the placement left a group of free cells that isn't a multiple of 4
+                        duplicate_type  the tile type was already tried at this node (tiles engine only)
+                        out_of_bounds   tile_fits: the tile would hang off the board
+                        overlap         tile_fits: the tile would cover a covered cell
+                        no_position     tile_can_be_placed: the orientation fits nowhere on the board
+    depth           Histogram of the nodes by the number of tiles on the board
+    times           Seconds spent in is_valid, tile_can_be_placed and gen_board_output
+
+The dlx engine searches its own matrix, so for it only the tile_fits calls made building the matrix and the final
+placements show up.
+"""
+
+import time
+from collections import Counter
+
+from typing import Dict
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+__all__ = ['SearchStats', 'instrumented', 'instrumented_board', 'PRUNE_REASONS', 'TIMED_METHODS']
+
+PRUNE_REASONS = ('partition', 'duplicate_type', 'out_of_bounds', 'overlap', 'no_position')
+TIMED_METHODS = ('is_valid', 'tile_can_be_placed', 'gen_board_output')
+
+
+class SearchStats:
+    """The counters of one search, see the module docstring"""
+
+    def __init__(self) -> None:
+        self.nodes = 0
+        self.tile_fits = 0
+        self.placements = 0
+        self.removals = 0
+        self.prunes = dict.fromkeys(PRUNE_REASONS, 0)  # type: Dict[str, int]
+        self.depth = Counter()  # type: Dict[int, int]
+        self.times = dict.fromkeys(TIMED_METHODS, 0.0)  # type: Dict[str, float]
+
+    @property
+    def backtracks(self) -> int:
+        # Every removal either takes back a placement the partition check rejected, or backtracks
+        return self.removals - self.prunes['partition']
+
+    def as_dict(self) -> dict:
+        """
+        :return: (dict) The counters as plain JSON-able values
+        """
+        return {
+            'nodes': self.nodes,
+            'tile_fits': self.tile_fits,
+            'placements': self.placements,
+            'backtracks': self.backtracks,
+            'prunes': dict(self.prunes),
+            'depth': {str(depth): count for depth, count in sorted(self.depth.items())},
+            'times': dict(self.times),
+        }
+
+    def __str__(self) -> str:
+        lines = [
+            'nodes:       {}'.format(self.nodes),
+            'tile_fits:   {}'.format(self.tile_fits),
+            'placements:  {}'.format(self.placements),
+            'backtracks:  {}'.format(self.backtracks),
+            'prunes:      {}'.format(', '.join('{} {}'.format(reason, self.prunes[reason])
+                                               for reason in PRUNE_REASONS)),
+            'depth:       {}'.format(', '.join('{}:{}'.format(depth, count)
+                                               for depth, count in sorted(self.depth.items()))),
+            'times:       {}'.format(', '.join('{} {:.3f}s'.format(name, self.times[name])
+                                               for name in TIMED_METHODS)),
+        ]
+        return '\n'.join(lines)
+
+
+def instrumented(backend, stats: SearchStats):
+    """
+    :param backend: (type)        The board class
+    :param stats:   (SearchStats) Where to record
+    :return:        (type)        A subclass of the board class that records into stats
+    """
+    class InstrumentedBoard(backend):
+        stats_depth = 0
+
+        def tile_can_be_placed(self, tile):
+            start = time.perf_counter()
+            position = super().tile_can_be_placed(tile)
+            stats.times['tile_can_be_placed'] += time.perf_counter() - start
+            if position is False:
+                stats.prunes['no_position'] += 1
+            return position
+
+        def tile_fits(self, tile, position):
+            stats.tile_fits += 1
+            if super().tile_fits(tile, position):
+                return True
+            shape = tile.orientation.shape
+            rows, cols = self.board_size
+            if position[0] < 0 or position[1] < 0 or position[0] + shape[0] > rows or position[1] + shape[1] > cols:
+                stats.prunes['out_of_bounds'] += 1
+            else:
+                stats.prunes['overlap'] += 1
+            return False
+
+        def place_tile(self, tile, position):
+            stats.placements += 1
+            self.stats_depth += 1
+            super().place_tile(tile, position)
+
+        def remove_tile(self, tile, position):
+            stats.removals += 1
+            self.stats_depth -= 1
+            return super().remove_tile(tile, position)
+
+        def is_valid(self, tile=None, position=None):
+            start = time.perf_counter()
+            valid = super().is_valid(tile, position)
+            stats.times['is_valid'] += time.perf_counter() - start
+            if tile is not None:
+                if valid:
+                    stats.nodes += 1
+                    stats.depth[self.stats_depth] += 1
+                else:
+                    stats.prunes['partition'] += 1
+            return valid
+
+        def gen_board_output(self, board_size, solution):
+            start = time.perf_counter()
+            output = backend.gen_board_output(board_size, solution)
+            stats.times['gen_board_output'] += time.perf_counter() - start
+            return output
+
+    return InstrumentedBoard
+
+
+def instrumented_board(backend, size, stats: SearchStats):
+    """
+    :param backend: (type)        The board class
+    :param size:    (int, int)    The board size in (row, col) format
+    :param stats:   (SearchStats) Where to record
+    :return:        (Board)       An empty board that records into stats (see instrumented)
+    """
+    return instrumented(backend, stats)(size)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""HW 1 - Tetrominos: Board symmetry breaking
+
+CS542
+Michael Lane
+Homework 1: Tetrominos
+Due: 10 April 2017
+
+A rectangular board looks the same turned half way round or mirrored either way, and a square board also looks the
+same after a quarter turn or mirrored along a diagonal. Turning or mirroring a tiling gives another tiling of the same
+board, so a search that fails explores every failing configuration once for each of these symmetries.
+
+A turn keeps every tile type. A mirror keeps the I, T and O, but swaps the 5 with the 2 and the L with the P, so a
+mirror only maps tilings of an instance to tilings of the same instance when it has as many 5s as 2s and as many Ls as
+Ps. The symmetries of an instance are the symmetries of its board that keep its tiles:
+
+    rectangle: identity, rotate180, plus mirror and flip if the tiles allow
+    square:    identity, rotate90, rotate180, rotate270, plus mirror, flip, transpose and antitranspose if the tiles
+               allow
+
+break_symmetry searches one representative of each set of symmetric tilings. It covers the four corners of the board
+first, and only goes on to search the rest of the board when the pieces covering the corners are the lexicographic
+leader among the images of those pieces under every symmetry of the instance. Every tiling can be turned or mirrored
+into one whose corners lead, so nothing is lost, and a failing search does up to 8 times less work. The rest of the
+board is searched by the given depth first engine, and the placements are returned in the order they are labelled in.
+"""
+
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from tile import Orientation, Tile, SHAPES, TILE_TYPES, find_orientation, tile_counts
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+__all__ = ['break_symmetry', 'instance_symmetries', 'transform_placement', 'MIRRORS', 'SYMMETRIES']
+
+Cell = Tuple[int, int]
+Placement = Tuple[Cell, Orientation]
+
+# Where each symmetry moves the cell (row, col) of a rows x cols board
+SYMMETRIES = {
+    'identity': lambda rows, cols, row, col: (row, col),
+    'rotate90': lambda rows, cols, row, col: (col, rows - 1 - row),
+    'rotate180': lambda rows, cols, row, col: (rows - 1 - row, cols - 1 - col),
+    'rotate270': lambda rows, cols, row, col: (cols - 1 - col, row),
+    'mirror': lambda rows, cols, row, col: (row, cols - 1 - col),
+    'flip': lambda rows, cols, row, col: (rows - 1 - row, col),
+    'transpose': lambda rows, cols, row, col: (col, row),
+    'antitranspose': lambda rows, cols, row, col: (cols - 1 - col, rows - 1 - row),
+}  # type: Dict[str, Callable[[int, int, int, int], Cell]]
+SQUARE_ONLY = ('rotate90', 'rotate270', 'transpose', 'antitranspose')
+REFLECTIONS = ('mirror', 'flip', 'transpose', 'antitranspose')
+
+# The tile type each tile type turns into in a mirror
+MIRRORS = {'I': 'I', '5': '2', '2': '5', 'T': 'T', 'L': 'P', 'P': 'L', 'O': 'O'}
+
+def instance_symmetries(size: Tuple[int, int], counts: Sequence[int]) -> List[str]:
+    """
+    :param size:   (int, int) The board size in (row, col) format
+    :param counts: ([int])    The number of tiles of each type, indexed like tile.TILE_TYPES
+    :return:       ([str])    The names of the symmetries that map tilings of the instance to tilings of the instance,
+                              identity first
+    """
+    mirrored = all(counts[TILE_TYPES.index(tile_type)] == counts[TILE_TYPES.index(MIRRORS[tile_type])]
+                   for tile_type in TILE_TYPES)
+    return [name for name in SYMMETRIES
+            if (size[0] == size[1] or name not in SQUARE_ONLY) and (mirrored or name not in REFLECTIONS)]
+
+
+def transform_placement(size: Tuple[int, int], name: str, placement: Placement) -> Placement:
+    """
+    :param size:      (int, int) The board size in (row, col) format. The symmetry must map the board onto itself.
+    :param name:      (str)      One of SYMMETRIES
+    :param placement: ((int, int), Orientation) The placement, a Tile is accepted too
+    :return:          ((int, int), Orientation) The image of the placement
+    """
+    (row, col), tile = placement
+    return find_orientation(SYMMETRIES[name](size[0], size[1], row + r, col + c) for r, c in tile.orientation.cells)
+
+
+def _key(placement: Placement) -> Tuple[int, int, int, int]:
+    """The order placements are compared in: position, then tile type, then orientation"""
+    (row, col), orientation = placement
+    return row, col, TILE_TYPES.index(orientation.type), orientation.index
+
+
+def break_symmetry(search: Callable, board, tiles: List[Tile], **options) -> List[Placement]:
+    """
+    Tile the board with a depth first engine, searching only one of each set of symmetric tilings (see the module
+    docstring).
+    :param search:  (function) The engine searching the rest of the board once the corners are covered, e.g.
+                               tetrominos.tettile. It is called as search(board, tiles, **options).
+    :param board:   (Board)    The empty board to tile
+    :param tiles:   ([Tile])   The tiles to place
+    :param options: (dict)     Passed on to the engine
+    :return:        ([((int, int), Orientation)]) The placements in label order, or the empty list if no solution
+                               was found
+    """
+    size = tuple(board.board_size)
+    rows, cols = size
+    counts = tile_counts(tiles)
+    names = instance_symmetries(size, counts)[1:]
+    # A board one cell wide or tall has only two corners
+    corners = list(dict.fromkeys([(0, 0), (0, cols - 1), (rows - 1, 0), (rows - 1, cols - 1)]))
+    # For each symmetry, the corner whose piece ends up on each corner
+    sources = {name: [corners.index(SYMMETRIES[name](rows, cols, row, col)) for row, col in corners]
+               for name in names}
+    sources = {name: [source.index(i) for i in range(len(corners))] for name, source in sources.items()}
+    pieces = {}  # The placement covering each corner covered so far
+    placed = []
+
+    def leads() -> bool:
+        """False if some symmetry already maps the corner pieces to a lexicographically smaller sequence"""
+        for name in names:
+            for corner, source in zip(corners, sources[name]):
+                if corner not in pieces or corners[source] not in pieces:
+                    break
+                mine = _key(pieces[corner])
+                theirs = _key(transform_placement(size, name, pieces[corners[source]]))
+                if mine != theirs:
+                    if mine > theirs:
+                        return False
+                    break
+        return True
+
+    def cover(index: int) -> List[Placement]:
+        if index == len(corners):
+            remaining = list(tiles)
+            for _, orientation in placed:
+                remaining.remove(next(tile for tile in remaining if tile.type == orientation.type))
+            result = search(board, remaining, **options)
+            return placed + result if board.is_solved() else []
+        row, col = corner = corners[index]
+        # A piece placed for an earlier corner can cover this one too
+        covering = [placement for placement in placed
+                    if (row - placement[0][0], col - placement[0][1]) in placement[1].cells]
+        if covering:
+            pieces[corner] = covering[0]
+            result = cover(index + 1) if leads() else []
+            del pieces[corner]
+            return result
+        for type_index, tile_type in enumerate(TILE_TYPES):
+            if not counts[type_index]:
+                continue
+            for orientation in SHAPES[tile_type]:
+                for r, c in orientation.cells:
+                    position = (row - r, col - c)
+                    if position[0] < 0 or position[1] < 0 or not board.tile_fits(orientation, position):
+                        continue
+                    board.place_tile(orientation, position)
+                    if board.is_valid(orientation, position):
+                        counts[type_index] -= 1
+                        pieces[corner] = (position, orientation)
+                        placed.append((position, orientation))
+                        if leads():
+                            result = cover(index + 1)
+                            if result:
+                                return result
+                        placed.pop()
+                        del pieces[corner]
+                        counts[type_index] += 1
+                    board.remove_tile(orientation, position)
+        return []
+
+    solution = cover(0)
+    solution.sort(key=lambda placement: placement[0])
+    return solution
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Batch solving tests"""
+
+# Imports
+from unittest import TestCase
+
+import batch
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+
+
+class TestBatch(TestCase):
+    def test_read_pairs(self):
+        lines = ['4 6\n', 'ITT5LP\n', '\n', '3 4\n', 'OOL']
+        self.assertEqual(list(batch.read_instances(lines)), [(1, (4, 6), 'ITT5LP'), (2, (3, 4), 'OOL')])
+        # A size line that can't be read, and a size without tiles at the end
+        lines = ['4 6', 'ITT5LP', '4 x', 'OOL', '3 4', 'OOL', '2 8']
+        self.assertEqual(list(batch.read_instances(lines)),
+                         [(1, (4, 6), 'ITT5LP'), (2, None, '4 x\nOOL'), (3, (3, 4), 'OOL'), (4, None, '2 8')])
+
+    def test_read_json_lines(self):
+        lines = ['{"id": "talos", "size": [6, 8], "tiles": "OOI22TTLLPPP"}', '{"size": [3, 4], "tiles": "OOL"}']
+        self.assertEqual(list(batch.read_instances(lines)), [('talos', (6, 8), 'OOI22TTLLPPP'), (2, (3, 4), 'OOL')])
+        self.assertEqual(list(batch.read_instances([])), [])
+        lines = ['{"size": [3, 4], "tiles": "OOL"}', '{"size": [3, 4], "tiles": "OOL"', '{"id": "x", "size": 3}',
+                 '{"size": [3, 4], "tiles": "OOL"}']
+        self.assertEqual([(instance_id, size) for instance_id, size, _ in batch.read_instances(lines)],
+                         [(1, (3, 4)), (2, None), (3, None), (4, (3, 4))])
+
+    def test_solve_many(self):
+        instances = [(1, (4, 6), 'ITT5LP'), (2, (3, 4), 'OOL'), (3, (2, 2), 'X'), (4, (6, 6), 'IIOOPPLLI')]
+        results = list(batch.solve_many(instances, workers=2, backend='bitboard', engine='dlx'))
+        self.assertEqual([instance_id for instance_id, _, _ in results], [1, 2, 3, 4])
+        self.assertEqual(results[0][1], 'abbbcc\nadbcce\nadfffe\naddfee')
+        self.assertEqual(results[1], (2, '?', None))
+        self.assertIsNotNone(results[2][2])
+        unordered = batch.solve_many(instances, workers=2, backend='bitboard', engine='dlx', ordered=False)
+        self.assertEqual(sorted(results, key=str), sorted(unordered, key=str))
+        # One bad line in the middle of the input doesn't cost the answers after it
+        results = list(batch.solve_many(batch.read_instances(['4 6', 'ITT5LP', '4 six', 'OOL', '3 4', 'OOL']),
+                                        workers=2))
+        self.assertEqual([(output, error is None) for _, output, error in results],
+                         [('abbbcc\nadbcce\nadfffe\naddfee', True), ('', False), ('?', True)])
+        self.assertIn('could not read instance 2', results[1][2])
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark suite tests"""
+
+# Imports
+import os
+import random
+import sys
+from collections import Counter
+from unittest import TestCase
+
+import tetrominos
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+import suite  # noqa: E402
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+
+
+class TestSuite(TestCase):
+    def test_corpus(self):
+        instances = suite.load_corpus()
+        self.assertEqual(len({instance['id'] for instance in instances}), len(instances))
+        self.assertEqual(Counter(instance['source'] for instance in instances)['fixture'], 13)
+        for instance in instances:
+            if instance['source'] == 'generated':
+                output = tetrominos.solve(tuple(instance['size']), instance['tiles'], backend='bitboard', engine='dlx')
+                self.assertEqual(output == '?', instance['id'].endswith('-fail'), instance['id'])
+
+    def test_generation_is_seeded(self):
+        first = suite.random_tiling((4, 6), random.Random(7))
+        self.assertEqual(first, suite.random_tiling((4, 6), random.Random(7)))
+        self.assertEqual(len(first), 6)
+        self.assertNotEqual(tetrominos.solve((4, 6), first, backend='bitboard', engine='cells'), '?')
+        unsolvable = suite.near_miss((4, 6), first, random.Random(7))
+        self.assertEqual(tetrominos.solve((4, 6), unsolvable, backend='bitboard', engine='cells'), '?')
+        self.assertEqual(unsolvable.count('T') % 2, 0)
+
+    def test_run_instance(self):
+        self.assertEqual(suite.run_instance((4, 6), 'ITT5LP'), (19, True))
+        self.assertEqual(suite.run_instance((4, 6), 'ITT5L'), (0, False))
+        with self.assertRaises(suite.NodeLimitReached):
+            suite.run_instance((6, 6), '52OTTTTTT', node_limit=10)
+
+    def test_regressions(self):
+        def results(wall, nodes):
+            return {'corpus_version': suite.CORPUS_VERSION, 'backend': 'bitboard', 'engine': 'cells',
+                    'buckets': {'small': {'count': 1, 'wall': wall, 'nodes': nodes, 'peak_bytes': 1000}}}
+
+        self.assertEqual(suite.regressions(results(1.0, 100), results(1.1, 100)), [])
+        self.assertEqual(suite.regressions(results(0.001, 100), results(0.005, 100)), [])
+        self.assertEqual(len(suite.regressions(results(1.0, 100), results(1.5, 200))), 2)
+        with self.assertRaises(ValueError):
+            suite.regressions(results(1.0, 100), dict(results(1.0, 100), engine='dlx'))
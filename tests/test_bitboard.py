@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Bitboard tests"""
+
+# Imports
+from unittest import TestCase
+
+import numpy as np
+
+import bitboard
+import board
+import tetrominos
+import tile
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+
+
+class TestBitBoard(TestCase):
+    def test_placement_table(self):
+        table = bitboard.placement_table((2, 3))
+        anchor, masks = table[tile.SHAPES['5'][0]]
+        self.assertEqual(anchor, (0, 1))
+        # Anchor on (0, 1) covers (0, 1), (0, 2), (1, 0), (1, 1)
+        self.assertEqual(masks[1], 0b011110)
+        # Anchor on (0, 0) would put the bottom left cell off the board
+        self.assertEqual(masks[0], 0)
+        self.assertIs(table, bitboard.placement_table((2, 3)))
+
+    def test_is_solved(self):
+        b = bitboard.BitBoard((2, 2))
+        self.assertFalse(b.is_solved())
+        b.place_tile(tile.OTile(), (0, 0))
+        self.assertTrue(b.is_solved())
+
+    def test_first_empty(self):
+        b = bitboard.BitBoard((2, 4))
+        self.assertEqual(b.first_empty(), (0, 0))
+        b.place_tile(tile.tile_factory('L').rotate().rotate().rotate(), (0, 0))
+        self.assertEqual(b.first_empty(), (0, 3))
+        b.place_tile(tile.tile_factory('L').rotate(), (0, 1))
+        self.assertIsNone(b.first_empty())
+
+    def test_tile_can_be_placed(self):
+        b = bitboard.BitBoard((2, 3))
+        self.assertEqual(b.tile_can_be_placed(tile.FiveTile()), (0, 0))
+        self.assertFalse(b.tile_can_be_placed(tile.ITile()))
+
+    def test_tile_fits(self):
+        b = bitboard.BitBoard((3, 5))
+        b.place_tile(tile.OTile(), (0, 0))
+        self.assertTrue(b.tile_fits(tile.LTile().rotate(), (1, 0)))
+        self.assertFalse(b.tile_fits(tile.FiveTile(), (0, 1)))
+        self.assertFalse(b.tile_fits(tile.ITile(), (0, 4)))
+
+    def test_place_and_remove_tile(self):
+        b = bitboard.BitBoard((3, 3))
+        b.place_tile(tile.tile_factory('5').rotate(), (0, 0))
+        self.assertEqual(str(b), '011\n001\n101')
+        b.remove_tile(tile.tile_factory('5').rotate(), (0, 0))
+        self.assertEqual(str(b), '111\n111\n111')
+
+    def test_is_valid(self):
+        b = bitboard.BitBoard((5, 5))
+        b.place_tile(tile.tile_factory('I'), (0, 1))
+        b.place_tile(tile.tile_factory('I'), (1, 0))
+        self.assertFalse(b.is_valid())
+        b = bitboard.BitBoard((2, 4))
+        b.place_tile(tile.tile_factory('O'), (0, 0))
+        self.assertTrue(b.is_valid())
+
+    def test_partition_is_valid(self):
+        # An O in the middle of a 2x4 board leaves two groups of 2 cells
+        b = bitboard.BitBoard((2, 4))
+        o = tile.tile_factory('O')
+        b.place_tile(o, (0, 1))
+        self.assertFalse(b.is_valid(o, (0, 1)))
+        self.assertEqual(b.is_valid(), b.is_valid(o, (0, 1)))
+        # An I down the second column of a 4x5 board leaves groups of 4 and 12 cells
+        b = bitboard.BitBoard((4, 5))
+        i = tile.tile_factory('I')
+        b.place_tile(i, (0, 1))
+        self.assertTrue(b.is_valid(i, (0, 1)))
+        self.assertEqual(b.is_valid(), b.is_valid(i, (0, 1)))
+
+    def test_matches_numpy_board(self):
+        for size, tile_string in [((4, 6), 'ITT5LP'), ((6, 8), 'OOI22TTLLPPP'), ((6, 6), 'IIOOPPLLI'),
+                                  ((6, 6), '52OTTTTTT'), ((10, 10), 'LPO5LTT5LIPIIOT5TTLTTPIPT')]:
+            np_board = board.Board(size)
+            bit_board = bitboard.BitBoard(size)
+            for t in tile.gen_tiles(tile_string):
+                for _ in range(t.num_orientations):
+                    np_position = np_board.tile_can_be_placed(t)
+                    bit_position = bit_board.tile_can_be_placed(t)
+                    self.assertEqual(np_position is False, bit_position is False)
+                    if bit_position is not False:
+                        self.assertTrue(np.array_equal(np_position, bit_position))
+                    t.rotate()
+            self.assertEqual(tetrominos.solve(size, tile_string, backend='numpy'),
+                             tetrominos.solve(size, tile_string, backend='bitboard'))
+
+    def test_coverage_counts_match_numpy_board(self):
+        np_board = board.Board((5, 6))
+        bit_board = bitboard.BitBoard((5, 6))
+        for b in (np_board, bit_board):
+            b.place_tile(tile.tile_factory('L'), (0, 0))
+            b.place_tile(tile.tile_factory('5'), (3, 2))
+        for tile_types in (tile.TILE_TYPES, 'T', 'IO'):
+            self.assertEqual(bit_board.coverage_counts(tile_types), np_board.coverage_counts(tile_types).tolist())
+            self.assertEqual(bit_board.placement_counts(tile_types), np_board.placement_counts(tile_types))
+        self.assertEqual(bit_board.get_potential_locations(tile.SHAPES['T'][2]),
+                         [tuple(p) for p in np_board.get_potential_locations(tile.SHAPES['T'][2])])
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Constructive tiling tests"""
+
+# Imports
+import random
+from unittest import TestCase
+from unittest.mock import patch
+
+import blocks
+import output
+import tetrominos
+from bitboard import BitBoard
+from tile import gen_tiles, tile_counts, TILE_TYPES
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+
+
+def mixed_tiles(size, seed):
+    """A random mix of every tile type for the board, with an even number of Ts"""
+    rng = random.Random(seed)
+    count = size[0] * size[1] // 4
+    pairs = count // 8
+    return ''.join(rng.choice('I52LPO') for _ in range(count - 2 * pairs)) + 'TT' * pairs
+
+
+class TestBlocks(TestCase):
+    def assertTiles(self, size, tile_string, solution):
+        grid = output.label_grid(size, solution)
+        self.assertTrue(all(all(row) for row in grid))
+        self.assertEqual(sum(sum(row) for row in grid), sum(4 * label for label in range(1, len(tile_string) + 1)))
+        self.assertEqual(sorted(orientation.type for _, orientation in solution), sorted(tile_string))
+
+    def test_split_board(self):
+        for size in [(100, 100), (99, 100), (100, 99), (10, 10), (4, 6), (3, 8), (2, 2)]:
+            cells = set()
+            for band in blocks.split_board(size):
+                for top, left, rows, cols in band:
+                    self.assertEqual(rows * cols % 4, 0)
+                    self.assertTrue(rows % 2 == 0 or cols % 2 == 0)
+                    cells.update((top + r, left + c) for r in range(rows) for c in range(cols))
+            self.assertEqual(len(cells), size[0] * size[1])
+        self.assertEqual({block[2:] for band in blocks.split_board((36, 38)) for block in band}, {(6, 6), (6, 8)})
+
+    def test_deal(self):
+        counts = tile_counts(mixed_tiles((30, 30), 1))
+        board_blocks = [block for band in blocks.split_board((30, 30)) for block in band]
+        hands = blocks.deal(board_blocks, counts)
+        self.assertEqual([sum(counts) for counts in zip(*hands)], counts)
+        for (_, _, rows, cols), hand in zip(board_blocks, hands):
+            self.assertEqual(sum(hand), rows * cols // 4)
+            self.assertEqual(hand[TILE_TYPES.index('T')] % 2, 0)
+
+    def test_large_boards(self):
+        for size in [(100, 100), (99, 100), (20, 30)]:
+            tile_string = mixed_tiles(size, 2)
+            solution = blocks.tettile_blocks(BitBoard(size), gen_tiles(tile_string), workers=1)
+            self.assertTiles(size, tile_string, solution)
+
+    def test_engine(self):
+        self.assertTiles((4, 6), 'ITT5LP', blocks.tettile_blocks(BitBoard((4, 6)), gen_tiles('ITT5LP')))
+        # A single block that has no solution is a proof
+        self.assertEqual(tetrominos.solve((6, 6), '52OTTTTTT', engine='blocks'), '?')
+        diagram = tetrominos.solve((12, 12), mixed_tiles((12, 12), 3), engine='blocks')
+        self.assertEqual(len(set(diagram.replace('\n', ''))), 36)
+
+    def test_merged_blocks_keep_their_tiles(self):
+        # A 6x6 block can only be solved with an I or with 9 Ls, anything wider always can
+        def fake_solve(shape, counts, max_nodes):
+            if shape == (6, 6) and not counts[TILE_TYPES.index('I')] and counts != tuple(tile_counts('L' * 9)):
+                return None
+            return [((0, 0), tile_type, 0) for tile_type, count in zip(TILE_TYPES, counts) for _ in range(count)]
+
+        hands = ['O' * 9, 'I' + 'L' * 8, 'O' + 'L' * 8, 'L' * 9]
+        with patch.object(blocks, '_solve_block', fake_solve):
+            tiler = blocks._Tiler((6, 24), tile_counts(''.join(hands)), workers=1)
+            tiler.hands = [tile_counts(hand) for hand in hands]
+            # Block 0 merges with block 1, then block 2 must not take block 1's I
+            solution = tiler.run()
+        self.assertEqual(sorted(orientation.type for _, orientation in solution), sorted(''.join(hands)))
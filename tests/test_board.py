@@ -24,6 +24,14 @@ class TestBoard(TestCase):
         b.place_tile(tile.OTile(), (0, 0))
         self.assertTrue(b.is_solved())
 
+    def test_first_empty(self):
+        b = board.Board((2, 4))
+        self.assertEqual(b.first_empty(), (0, 0))
+        b.place_tile(tile.tile_factory('L').rotate().rotate().rotate(), (0, 0))
+        self.assertEqual(b.first_empty(), (0, 3))
+        b.place_tile(tile.tile_factory('L').rotate(), (0, 1))
+        self.assertIsNone(b.first_empty())
+
     def test_tile_can_be_placed(self):
         b = board.Board((2, 3))
         self.assertTrue(np.array_equal(b.tile_can_be_placed(tile.FiveTile()), np.array([0, 0])))
@@ -57,6 +65,20 @@ class TestBoard(TestCase):
         b.place_tile(tile.tile_factory('I'), (1, 0))
         self.assertFalse(b.is_valid())
 
+    def test_partition_is_valid(self):
+        # An O in the middle of a 2x4 board leaves two groups of 2 cells
+        b = board.Board((2, 4))
+        o = tile.tile_factory('O')
+        b.place_tile(o, np.array([0, 1]))
+        self.assertFalse(b.is_valid(o, np.array([0, 1])))
+        self.assertEqual(b.is_valid(), b.is_valid(o, np.array([0, 1])))
+        # An I down the second column of a 4x5 board leaves groups of 4 and 12 cells
+        b = board.Board((4, 5))
+        i = tile.tile_factory('I')
+        b.place_tile(i, np.array([0, 1]))
+        self.assertTrue(b.is_valid(i, np.array([0, 1])))
+        self.assertEqual(b.is_valid(), b.is_valid(i, np.array([0, 1])))
+
     def test_gen_board_output(self):
         solution = [
             ((0, 0), tile.tile_factory('I').rotate()),
@@ -68,3 +90,31 @@ class TestBoard(TestCase):
         ]
         output = board.Board().gen_board_output((4, 6), solution)
         self.assertEqual(output, 'aaaabb\ncccbbd\ncefffd\neeefdd')
+
+    def test_fit_maps(self):
+        b = board.Board((4, 5))
+        b.place_tile(tile.tile_factory('T'), (0, 1))
+        b.place_tile(tile.tile_factory('O'), (2, 3))
+        maps = b.fit_maps()
+        self.assertEqual(len(maps), sum(len(orientations) for orientations in tile.SHAPES.values()))
+        for orientation, fits in maps.items():
+            self.assertTrue(np.array_equal(fits, b.fit_map(orientation)))
+            for row in range(4):
+                for col in range(5):
+                    expected = bool(b.tile_fits(orientation, (row, col)))
+                    inside = row < fits.shape[0] and col < fits.shape[1]
+                    self.assertEqual(inside and bool(fits[row, col]), expected)
+        self.assertEqual(set(o.type for o in b.fit_maps('OI')), {'O', 'I'})
+        # Brute force the counts from tile_fits
+        coverage = np.zeros((4, 5), dtype=int)
+        placements = dict.fromkeys(tile.TILE_TYPES, 0)
+        for orientation in maps:
+            for row in range(4):
+                for col in range(5):
+                    if b.tile_fits(orientation, (row, col)):
+                        placements[orientation.type] += 1
+                        for r, c in orientation.cells:
+                            coverage[row + r, col + c] += 1
+        self.assertTrue(np.array_equal(b.coverage_counts(), coverage))
+        self.assertEqual(b.placement_counts(), placements)
+        self.assertFalse(board.Board((2, 2)).tile_can_be_placed(tile.ITile()))
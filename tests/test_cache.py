@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Solution cache tests"""
+
+# Imports
+import os
+import tempfile
+import time
+from unittest import TestCase
+
+import output
+import tetrominos
+from cache import SolutionCache, canonical_key, rotate_solution
+from tile import tile_factory
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+
+SOLUTION = [
+    ((0, 0), tile_factory('I').rotate()),
+    ((2, 0), tile_factory('T').rotate().rotate()),
+    ((2, 2), tile_factory('T')),
+    ((0, 3), tile_factory('5')),
+    ((1, 0), tile_factory('L').rotate().rotate().rotate()),
+    ((1, 4), tile_factory('P').rotate().rotate())
+]
+
+
+def pieces(grid):
+    """The cells of each tile in a label grid, ignoring the labels"""
+    cells = {}
+    for r, row in enumerate(grid):
+        for c, label in enumerate(row):
+            cells.setdefault(label, set()).add((r, c))
+    return {frozenset(group) for group in cells.values()}
+
+
+class TestSolutionCache(TestCase):
+    def test_canonical_key(self):
+        self.assertEqual(canonical_key((3, 4), 'OOI'), canonical_key((3, 4), 'IOO'))
+        self.assertEqual(canonical_key((4, 3), 'OOI'), (canonical_key((3, 4), 'OOI')[0], True))
+        self.assertNotEqual(canonical_key((3, 4), 'OOI')[0], canonical_key((3, 4), 'OII')[0])
+
+    def test_rotate_solution(self):
+        turned = rotate_solution((4, 6), SOLUTION, clockwise=True)
+        self.assertEqual(sorted(tile.type for _, tile in turned), sorted('ITT5LP'))
+        grid = output.label_grid((4, 6), SOLUTION)
+        self.assertEqual(pieces(output.label_grid((6, 4), turned)), pieces([list(row) for row in zip(*grid[::-1])]))
+        self.assertEqual(sorted(rotate_solution((6, 4), turned, clockwise=False)),
+                         sorted((position, tile.orientation) for position, tile in SOLUTION))
+
+    def test_hits_misses_and_rotation(self):
+        cache = SolutionCache()
+        self.assertIsNone(cache.get((4, 6), 'ITT5LP'))
+        cache.put((4, 6), 'ITT5LP', SOLUTION)
+        cache.put((6, 6), '52OTTTTTT', [])
+        self.assertEqual(output.gen_board_output((4, 6), cache.get((4, 6), 'PL5TTI')), 'aaaabb\ncccbbd\ncefffd\neeefdd')
+        self.assertEqual(cache.get((6, 6), 'TTTTTT25O'), [])
+        # The same instance on its side comes back turned with the board
+        grid = output.label_grid((4, 6), SOLUTION)
+        self.assertEqual(pieces(output.label_grid((6, 4), cache.get((6, 4), 'ITT5LP'))),
+                         pieces([list(row) for row in zip(*grid[::-1])]))
+        self.assertEqual((cache.hits, cache.misses, cache.stores), (3, 1, 2))
+        self.assertIn('3 hits', str(cache))
+
+    def test_lru_eviction(self):
+        cache = SolutionCache(max_entries=2)
+        cache.put((2, 2), 'O', [])
+        cache.put((1, 4), 'I', [])
+        cache.get((2, 2), 'O')  # (1, 4) is now the least recently used
+        cache.put((2, 4), 'OO', [])
+        self.assertEqual((len(cache), cache.evictions), (2, 1))
+        self.assertIsNotNone(cache.get((2, 2), 'O'))
+        self.assertIsNone(cache.get((1, 4), 'I'))
+        cache = SolutionCache(max_bytes=500)
+        for count in range(1, 30):
+            cache.put((4, count), 'I' * count, [])
+        self.assertLessEqual(cache.bytes, 500)
+        self.assertEqual(cache.stores - cache.evictions, len(cache))
+
+    def test_shared_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cache.db')
+            caches = [SolutionCache(path, max_entries=5) for _ in range(2)]
+            for count in range(1, 21):
+                caches[count % 2].put((4, count), 'I' * count, [])
+            self.assertEqual(len(caches[0]), 5)
+            self.assertEqual(sum(cache.evictions for cache in caches), 15)
+            self.assertEqual(caches[1].get((4, 20), 'I' * 20), [])
+            for cache in caches:
+                cache.close()
+
+    def test_solve_with_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cache.db')
+            cache = SolutionCache(path)
+            for size, tile_string in [((4, 6), 'ITT5LP'), ((6, 6), '52OTTTTTT'), ((12, 5), 'OOI22TTLLPPPII5')]:
+                expected = tetrominos.solve(size, tile_string)
+                self.assertEqual(tetrominos.solve(size, tile_string, cache=cache), expected)
+            cache.close()
+            # The answers survive the process, and come back for reordered and rotated instances too
+            cache = SolutionCache(path)
+            self.assertEqual(tetrominos.solve((6, 6), 'TTTTTT25O', cache=cache), '?')
+            rotated = tetrominos.solve((5, 12), 'I5OOI22TTLLPPPI', cache=cache)
+            self.assertEqual(len(set(rotated.replace('\n', ''))), 15)
+            self.assertEqual([len(line) for line in rotated.split('\n')], [12] * 5)
+            self.assertEqual((cache.hits, cache.misses), (2, 0))
+            start = time.perf_counter()
+            tetrominos.solve((6, 4), 'PL5TTI', cache=cache)
+            self.assertLess(time.perf_counter() - start, 0.01)
+            cache.close()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Solver daemon tests"""
+
+# Imports
+import asyncio
+import json
+import os
+import select
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures.process import BrokenProcessPool
+from unittest import TestCase
+
+from daemon import SolverDaemon
+from output import UNKNOWN
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Takes the tiles engine several seconds to prove there is no solution
+HARD = '10 10\n' + 'T' * 24 + 'I\n'
+# Seconds any one test may take before it is failed instead of left hanging
+TEST_TIMEOUT = 60
+
+
+async def exchange(path, text):
+    """Send requests to the daemon on a Unix socket and read every response"""
+    reader, writer = await asyncio.open_unix_connection(path)
+    writer.write(text.encode())
+    await writer.drain()
+    writer.write_eof()
+    response = await reader.read()
+    writer.close()
+    return response.decode()
+
+
+def serve(test, **options):
+    """Run a test coroutine against a daemon listening on a temporary Unix socket"""
+    async def run():
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'daemon.sock')
+            daemon = SolverDaemon(**dict({'workers': 1}, **options))
+            await daemon.start(path)
+            try:
+                await asyncio.wait_for(test(daemon, path), TEST_TIMEOUT)
+            finally:
+                await daemon.close()
+    asyncio.run(run())
+
+
+def start_daemon(path):
+    """Run daemon.py on a Unix socket and wait for it to say it is listening"""
+    process = subprocess.Popen([sys.executable, 'daemon.py', '--workers', '1', '--socket', path], cwd=ROOT,
+                               stderr=subprocess.PIPE, universal_newlines=True)
+    ready, _, _ = select.select([process.stderr], [], [], TEST_TIMEOUT)
+    line = process.stderr.readline() if ready else ''
+    if 'listening' not in line:
+        stop_daemon(process)
+        raise AssertionError('the daemon did not start: {!r}'.format(line))
+    return process
+
+
+def stop_daemon(process):
+    """Make sure a daemon.py process is gone, and its workers with it"""
+    if process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(TEST_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    process.wait(TEST_TIMEOUT)
+    process.stderr.close()
+
+
+class TestSolverDaemon(TestCase):
+    def test_text_requests(self):
+        async def test(daemon, path):
+            response = await exchange(path, '4 6\nITT5LP\n\n3 4\nOOL\n2 2\nX\n')
+            self.assertEqual(response.split('\n\n'), ['abbbcc\nadbcce\nadfffe\naddfee', '?',
+                                                      'ERROR: X is an unknown Tile type', ''])
+            self.assertEqual(daemon.requests, 2)
+        serve(test)
+
+    def test_json_requests(self):
+        async def test(daemon, path):
+            response = await exchange(path, '{"id": "a", "size": [4, 6], "tiles": "ITT5LP", "output": "json"}\n'
+                                            '{"size": [3, 4], "tiles": "OOL"}\n'
+                                            'not json\n')
+            responses = {record['id']: record for record in map(json.loads, response.splitlines())}
+            self.assertEqual(sorted(responses, key=str), [2, 3, 'a'])
+            self.assertEqual(json.loads(responses['a']['output'])['status'], 'solved')
+            self.assertEqual(responses[2]['output'], '?')
+            self.assertIn('error', responses[3])
+        serve(test)
+
+    def test_bad_requests(self):
+        async def test(daemon, path):
+            response = await exchange(path, '{"id": 1, "size": [4, 6], "tiles": "ITT5LP", "timeout": "soon"}\n'
+                                            '{"id": 2, "size": ["4", 6], "tiles": "ITT5LP"}\n'
+                                            '{"id": 3, "size": [4, 6], "tiles": 7}\n')
+            responses = sorted(map(json.loads, response.splitlines()), key=lambda record: record['id'])
+            self.assertEqual([record['error'][:6] for record in responses], ['ERROR:'] * 3)
+            self.assertIn('timeout', responses[0]['error'])
+            # Turned away before they took up a worker
+            self.assertEqual(daemon.requests, 0)
+        serve(test)
+
+    def test_timeout_and_limits(self):
+        async def test(daemon, path):
+            start = time.monotonic()
+            self.assertEqual(await exchange(path, HARD), UNKNOWN + '\n\n')
+            self.assertLess(time.monotonic() - start, 3)
+            self.assertEqual(daemon.timeouts, 1)
+            # One instance is solved at a time and one more may wait, so the third is turned away
+            responses = await asyncio.gather(*[exchange(path, HARD) for _ in range(3)])
+            self.assertEqual(sorted(responses)[0], 'ERROR: the daemon is busy, 1 requests are waiting\n\n')
+            self.assertEqual(daemon.rejected, 1)
+        serve(test, timeout=0.2, max_pending=1)
+
+    def test_worker_dies(self):
+        async def test(daemon, path):
+            loop = asyncio.get_running_loop()
+            request = asyncio.ensure_future(exchange(path, HARD))
+            # The instance has been handed to the pool once it holds the only active slot
+            while not daemon.active.locked():
+                await asyncio.sleep(0.01)
+            # A job that makes the other worker exit takes the pool, and the instance, down with it
+            with self.assertRaises(BrokenProcessPool):
+                await loop.run_in_executor(daemon.pool, os._exit, 1)
+            self.assertEqual(await request, 'ERROR: the worker solving this instance died\n\n')
+            # The daemon carries on with new workers, also when one dies between requests
+            self.assertEqual(await exchange(path, '4 6\nITT5LP\n'), 'abbbcc\nadbcce\nadfffe\naddfee\n\n')
+            with self.assertRaises(BrokenProcessPool):
+                await loop.run_in_executor(daemon.pool, os._exit, 1)
+            self.assertEqual(await exchange(path, '4 6\nITT5LP\n'), 'abbbcc\nadbcce\nadfffe\naddfee\n\n')
+        serve(test, workers=2, max_active=1)
+
+    def test_client(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'daemon.sock')
+            daemon = start_daemon(path)
+            try:
+                with open(os.path.join(ROOT, 'tests', 'small-test-pass.txt')) as f:
+                    result = subprocess.run([sys.executable, 'client.py', '--socket', path], cwd=ROOT, stdin=f,
+                                            stdout=subprocess.PIPE, universal_newlines=True, check=True,
+                                            timeout=TEST_TIMEOUT)
+                self.assertEqual(result.stdout, 'abbbcc\nadbcce\nadfffe\naddfee\n')
+            finally:
+                stop_daemon(daemon)
+
+    def test_sigterm(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'daemon.sock')
+            daemon = start_daemon(path)
+            try:
+                self.assertTrue(os.path.exists(path))
+                daemon.send_signal(signal.SIGTERM)
+                self.assertEqual(daemon.wait(TEST_TIMEOUT), 0)
+                self.assertIn('solver daemon: 0 requests', daemon.stderr.read())
+                self.assertFalse(os.path.exists(path))
+            finally:
+                stop_daemon(daemon)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Exact cover solver tests"""
+
+# Imports
+from unittest import TestCase
+
+import bitboard
+import board
+import dlx
+import tile
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+
+
+class TestDancingLinks(TestCase):
+    def test_search(self):
+        # The example from Knuth's paper. The only exact cover is rows A, D and E.
+        matrix = dlx.DancingLinks([1, 2, 3, 4, 5, 6, 7])
+        matrix.add_row([3, 5, 6], 'A')
+        matrix.add_row([1, 4, 7], 'B')
+        matrix.add_row([2, 3, 6], 'C')
+        matrix.add_row([1, 4], 'D')
+        matrix.add_row([2, 7], 'E')
+        matrix.add_row([4, 5, 7], 'F')
+        self.assertEqual(sorted(matrix.search()), ['A', 'D', 'E'])
+
+    def test_search_fails(self):
+        matrix = dlx.DancingLinks([1, 2, 3])
+        matrix.add_row([1, 2], 'A')
+        matrix.add_row([2, 3], 'B')
+        self.assertIsNone(matrix.search())
+
+    def test_counter_columns(self):
+        # Two rows of type x could cover everything, but x may only be used once
+        matrix = dlx.DancingLinks([1, 2, 3, 4], {'x': 1, 'y': 1})
+        matrix.add_row([1, 2, 'x'], 'A')
+        matrix.add_row([3, 4, 'x'], 'B')
+        matrix.add_row([3, 4, 'y'], 'C')
+        self.assertEqual(sorted(matrix.search()), ['A', 'C'])
+        matrix = dlx.DancingLinks([1, 2, 3, 4], {'x': 1})
+        matrix.add_row([1, 2, 'x'], 'A')
+        matrix.add_row([3, 4, 'x'], 'B')
+        self.assertIsNone(matrix.search())
+
+    def test_tettile_dlx(self):
+        for backend in (board.Board, bitboard.BitBoard):
+            b = backend((4, 6))
+            solution = dlx.tettile_dlx(b, tile.gen_tiles('ITT5LP'))
+            self.assertEqual(sorted(o.type for _, o in solution), sorted('ITT5LP'))
+            self.assertTrue(b.is_solved())
+            self.assertEqual(dlx.tettile_dlx(backend((6, 6)), tile.gen_tiles('52OTTTTTT')), [])
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Frontier dynamic programming tests"""
+
+# Imports
+import glob
+import os
+import random
+from unittest import TestCase
+
+import solutions
+import tetrominos
+from bitboard import BitBoard
+from frontier import FrontierDP
+from tetrominos import passes_prechecks, read_instance
+from tile import gen_tiles, TILE_TYPES
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestFrontierDP(TestCase):
+    def assertTiles(self, size, tile_string, solution):
+        board = BitBoard(size)
+        for position, orientation in solution:
+            self.assertTrue(board.tile_fits(orientation, position))
+            board.place_tile(orientation, position)
+        self.assertTrue(board.is_solved())
+        self.assertEqual(sorted(orientation.type for _, orientation in solution), sorted(tile_string))
+
+    def test_count(self):
+        for size, tile_string in [((4, 6), 'ITT5LP'), ((6, 6), 'IIOOPPLLI'), ((3, 4), 'OOL'), ((4, 4), 'TTLP')]:
+            expected = solutions.count_solutions(BitBoard(size), gen_tiles(tile_string))
+            self.assertEqual(FrontierDP(size, tile_string).count(), expected)
+            # Turned a quarter turn the other way
+            self.assertEqual(FrontierDP(size[::-1], tile_string).count(), expected)
+        self.assertEqual(FrontierDP((4, 6), 'ITT5LP').count(distinct_pieces=True), 20)
+
+    def test_random_instances(self):
+        rng = random.Random(542)
+        for _ in range(100):
+            size = rng.choice([(4, 4), (2, 8), (8, 2), (4, 6), (6, 4), (3, 8), (1, 8), (4, 5)])
+            tile_string = ''.join(rng.choice(TILE_TYPES) for _ in range(size[0] * size[1] // 4))
+            expected = solutions.count_solutions(BitBoard(size), gen_tiles(tile_string))
+            dp = FrontierDP(size, tile_string)
+            self.assertEqual(dp.feasible(), expected > 0, (size, tile_string))
+            solution = dp.witness()
+            self.assertEqual(bool(solution), expected > 0, (size, tile_string))
+            if solution:
+                self.assertTiles(size, tile_string, solution)
+            self.assertEqual(dp.count(), expected, (size, tile_string))
+
+    def test_fixtures(self):
+        for path in sorted(glob.glob(os.path.join(TEST_DIR, '*-test-*.txt'))):
+            size, tile_string = read_instance(path)
+            if not passes_prechecks(size, tile_string):
+                continue
+            expected = tetrominos.solve(size, tile_string, engine='dlx')
+            solution = FrontierDP(size, tile_string).witness()
+            self.assertEqual(bool(solution), expected != '?', path)
+            if solution:
+                self.assertTiles(size, tile_string, solution)
+
+    def test_memory_cap(self):
+        expected = FrontierDP((6, 6), 'IIOOPPLLI').count()
+        dp = FrontierDP((6, 6), 'IIOOPPLLI', max_entries=20)
+        self.assertEqual(dp.count(), expected)
+        self.assertLessEqual(len(dp), 20)
+        self.assertGreater(dp.evictions, 0)
+        dp = FrontierDP((4, 10), '5IILLLLPPP', max_bytes=5000)
+        self.assertFalse(dp.feasible())
+        self.assertLessEqual(dp.bytes, 5000)
+        dp = FrontierDP((6, 8), 'OOI22TTLLPPP', max_entries=5)
+        self.assertTiles((6, 8), 'OOI22TTLLPPP', dp.witness())
+
+    def test_long_boards(self):
+        # Far more tiles than the recursion limit
+        output = tetrominos.solve((4, 1000), 'O' * 500 + 'I' * 500, engine='frontier')
+        self.assertEqual(len(output.split('\n')), 4)
+        self.assertTrue(FrontierDP((1000, 4), 'O' * 500 + 'I' * 500).feasible())
+        # Only Is: a column of 4 vertical Is or 4 rows of horizontal ones, f(n) = f(n - 1) + f(n - 4)
+        ways = [1, 1, 1, 1]
+        for n in range(4, 1001):
+            ways.append(ways[n - 1] + ways[n - 4])
+        self.assertEqual(FrontierDP((4, 1000), 'I' * 1000).count(), ways[1000])
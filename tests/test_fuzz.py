@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Differential fuzzing tests"""
+
+# Imports
+import random
+from collections import Counter
+from unittest import TestCase
+from unittest.mock import patch
+
+import fuzz
+import solutions
+from bitboard import BitBoard
+from tile import gen_tiles
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+
+
+class TestFuzz(TestCase):
+    def test_generation_is_seeded(self):
+        instances = list(fuzz.generate_instances(7, 40))
+        self.assertEqual(instances, list(fuzz.generate_instances(7, 40)))
+        self.assertNotEqual(instances, list(fuzz.generate_instances(8, 40)))
+        # Instance n doesn't depend on the ones before it
+        self.assertEqual(instances[-1], list(fuzz.generate_instances(7, 40))[-1])
+        self.assertEqual(Counter(instance['solvable'] for instance in instances).keys(), {True, False})
+        for instance in instances:
+            rows, cols = instance['size']
+            self.assertEqual(len(instance['tiles']) * 4, rows * cols)
+            count = solutions.count_solutions(BitBoard(instance['size']), gen_tiles(instance['tiles']))
+            self.assertEqual(count > 0, instance['solvable'], instance)
+
+    def test_near_miss(self):
+        rng = random.Random(3)
+        tile_string = fuzz.random_instance((4, 6), rng)
+        unsolvable = fuzz.near_miss((4, 6), tile_string, rng)
+        self.assertEqual(len(unsolvable), 6)
+        self.assertEqual(unsolvable.count('T') % 2, 0)
+        self.assertEqual(solutions.count_solutions(BitBoard((4, 6)), gen_tiles(unsolvable)), 0)
+        # Only Ts, nothing to change
+        self.assertIsNone(fuzz.near_miss((2, 4), 'TT', rng))
+        # FrontierDP alone doesn't make a near miss, the second search has to agree
+        self.assertIsNone(fuzz.near_miss((4, 6), tile_string, random.Random(3), confirm=lambda size, tiles: False))
+
+    def test_paths_agree(self):
+        totals = fuzz.run_fuzz(fuzz.generate_instances(542, 100), paths=list(fuzz.PATHS))
+        self.assertEqual(totals['instances'], 100)
+        self.assertEqual(totals['failed'], 0)
+
+    def test_catches_a_broken_path(self):
+        def wrong(size, tile_string, node_limit):
+            return '?'
+
+        def mislabelled(size, tile_string, node_limit):
+            return fuzz.PATHS['dlx'](size, tile_string, node_limit).replace('a', 'b')
+
+        instance = {'id': 'test', 'size': (4, 6), 'tiles': 'IOTTLP', 'solvable': True}
+        with patch.dict(fuzz.PATHS, wrong=wrong, mislabelled=mislabelled):
+            problems, unknown = fuzz.check_instance(instance, ['dlx', 'wrong', 'mislabelled'])
+        self.assertEqual([problem.split(':')[0] for problem in problems], ['wrong', 'mislabelled'])
+        self.assertEqual(unknown, 0)
+        # A path stopped by its node limit has no say
+        problems, unknown = fuzz.check_instance(dict(instance, size=(6, 6), tiles='2IPTTTTTT', solvable=False),
+                                                ['tiles', 'frontier'], node_limit=10)
+        self.assertEqual((problems, unknown), ([], 1))
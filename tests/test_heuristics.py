@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Branching heuristics tests"""
+
+# Imports
+import glob
+import os
+from unittest import TestCase
+
+import tetrominos
+from bitboard import BitBoard
+from heuristics import CELL_ORDERS, VALUE_ORDERS, SearchOrder, pockets
+from stats import SearchStats
+from tetrominos import read_instance
+from tile import tile_factory, tile_counts
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestSearchOrder(TestCase):
+    def test_pockets(self):
+        board = BitBoard((3, 4))
+        # An I along the top leaves nothing awkward, an O in the corner leaves (2, 0) with a single free neighbor
+        self.assertEqual(pockets(board, tile_factory('I').rotate().orientation, (0, 0)), 0)
+        self.assertEqual(pockets(board, tile_factory('O').orientation, (0, 0)), 1)
+        board.place_tile(tile_factory('O'), (0, 0))
+        self.assertEqual(pockets(board, tile_factory('O').orientation, (0, 2)), 1)
+        self.assertEqual(pockets(board, tile_factory('O').orientation, (1, 2)), 3)
+        # The board itself is left alone
+        self.assertEqual(board.occupancy(), BitBoard((3, 4)).occupancy() & ~0b110011)
+
+    def test_choose_cell(self):
+        board = BitBoard((2, 4))
+        order = SearchOrder('fewest')
+        self.assertEqual(order.choose_cell(board, tile_counts('OO')), (0, 0))
+        board.place_tile(tile_factory('O'), (0, 1))
+        # (0, 0) and (1, 0) can't be covered by an O any more
+        self.assertFalse(order.choose_cell(board, tile_counts('O')))
+        self.assertEqual(SearchOrder().choose_cell(board, tile_counts('O')), (0, 0))
+        # Every move covers the cell, with any of the tile's cells
+        board = BitBoard((4, 4))
+        moves = SearchOrder('fewest').moves(board, (1, 1), tile_counts('O'))
+        self.assertEqual(sorted(position for _, _, position in moves), [(0, 0), (0, 1), (1, 0), (1, 1)])
+        with self.assertRaises(ValueError):
+            SearchOrder('last')
+
+    def test_every_order_solves(self):
+        for path in sorted(glob.glob(os.path.join(TEST_DIR, '*-test-*.txt'))):
+            if 'large' in path:
+                continue
+            size, tile_string = read_instance(path)
+            expected = tetrominos.solve(size, tile_string)
+            for engine in tetrominos.DFS_ENGINES:
+                for cell in CELL_ORDERS if engine == 'cells' else ('first',):
+                    for value in VALUE_ORDERS:
+                        output = tetrominos.solve(size, tile_string, engine=engine, order=SearchOrder(cell, value))
+                        self.assertEqual(output == '?', expected == '?', (path, engine, cell, value))
+                        if output != '?':
+                            self.assertEqual(sorted(output.replace('\n', '')), sorted(expected.replace('\n', '')))
+        with self.assertRaises(ValueError):
+            tetrominos.solve((4, 6), 'ITT5LP', engine='tiles', order=SearchOrder('fewest'))
+        with self.assertRaises(ValueError):
+            tetrominos.solve((4, 6), 'ITT5LP', engine='dlx', order=SearchOrder())
+
+    def test_scarce_ignores_input_order(self):
+        nodes = set()
+        for tile_string in ['ITT5LP', 'PL5TTI', 'TPTLI5']:
+            stats = SearchStats()
+            tetrominos.solve((4, 6), tile_string, stats=stats, order=SearchOrder(value='scarce'))
+            nodes.add(stats.nodes)
+        self.assertEqual(len(nodes), 1)
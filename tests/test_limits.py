@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Search limits tests"""
+
+# Imports
+import threading
+from unittest import TestCase
+
+import tetrominos
+from limits import CancelToken, SearchLimits
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+
+# Takes the tiles engine several seconds to prove there is no solution
+HARD = ((10, 10), 'T' * 24 + 'I')
+
+
+class TestSearchLimits(TestCase):
+    def test_node_budget(self):
+        limits = SearchLimits(max_nodes=50)
+        self.assertEqual(tetrominos.solve(*HARD, backend='bitboard', limits=limits), tetrominos.UNKNOWN)
+        self.assertEqual(limits.stopped, 'nodes')
+        # A search that finishes within its limits gives the usual answers
+        for size, tile_string in [((4, 6), 'ITT5LP'), ((6, 6), '52OTTTTTT')]:
+            for engine in tetrominos.DFS_ENGINES:
+                limits = SearchLimits(deadline=60, max_nodes=10 ** 6)
+                self.assertEqual(tetrominos.solve(size, tile_string, backend='bitboard', engine=engine, limits=limits),
+                                 tetrominos.solve(size, tile_string, backend='bitboard', engine=engine))
+                self.assertIsNone(limits.stopped)
+        with self.assertRaises(ValueError):
+            tetrominos.solve((4, 6), 'ITT5LP', engine='dlx', limits=SearchLimits(max_nodes=10))
+
+    def test_deadline(self):
+        limits = SearchLimits(deadline=0.2, check_interval=100)
+        self.assertEqual(tetrominos.solve(*HARD, backend='bitboard', limits=limits), tetrominos.UNKNOWN)
+        self.assertEqual(limits.stopped, 'deadline')
+
+    def test_progress_and_cancel(self):
+        token = CancelToken()
+        reports = []
+
+        def progress(report):
+            reports.append(report)
+            if len(reports) == 3:
+                threading.Thread(target=token.cancel).start()
+
+        limits = SearchLimits(token=token, progress=progress, check_interval=100)
+        self.assertEqual(tetrominos.solve(*HARD, backend='bitboard', limits=limits), tetrominos.UNKNOWN)
+        self.assertEqual(limits.stopped, 'cancelled')
+        self.assertGreaterEqual(len(reports), 3)
+        self.assertEqual([report.nodes for report in reports[:3]], [100, 200, 300])
+        for report in reports:
+            self.assertLessEqual(report.depth * 4 / 100, report.best_coverage)
+            self.assertLessEqual(report.best_coverage, 1)
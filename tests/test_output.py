@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Solution output tests"""
+
+# Imports
+import json
+from unittest import TestCase
+
+import output
+import tetrominos
+from tile import tile_factory
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+
+SOLUTION = [
+    ((0, 0), tile_factory('I').rotate()),
+    ((2, 0), tile_factory('T').rotate().rotate()),
+    ((2, 2), tile_factory('T')),
+    ((0, 3), tile_factory('5')),
+    ((1, 0), tile_factory('L').rotate().rotate().rotate()),
+    ((1, 4), tile_factory('P').rotate().rotate())
+]
+
+
+def o_tiles(rows, cols):
+    """A solution covering a (rows, cols) board with O tiles"""
+    return [((row, col), tile_factory('O')) for row in range(0, rows, 2) for col in range(0, cols, 2)]
+
+
+class TestOutput(TestCase):
+    def test_label_grid(self):
+        self.assertEqual(output.label_grid((4, 6), SOLUTION),
+                         [[1, 1, 1, 1, 2, 2], [3, 3, 3, 2, 2, 4], [3, 5, 6, 6, 6, 4], [5, 5, 5, 6, 4, 4]])
+        self.assertEqual(output.gen_board_output((4, 6), SOLUTION), 'aaaabb\ncccbbd\ncefffd\neeefdd')
+        self.assertEqual(output.gen_board_output((4, 6), []), '?')
+        self.assertEqual(output.gen_board_output((4, 6), None), output.UNKNOWN)
+
+    def test_more_than_26_tiles(self):
+        diagram = output.gen_board_output((2, 60), o_tiles(2, 60))
+        self.assertEqual(diagram.split('\n')[0], ''.join(c * 2 for c in 'abcdefghijklmnopqrstuvwxyzABCD'))
+        # Past 62 tiles the characters are reused, but never by touching tiles
+        rows, cols = 16, 18
+        lines = output.gen_board_output((rows, cols), o_tiles(rows, cols)).split('\n')
+        for r in range(0, rows, 2):
+            for c in range(0, cols, 2):
+                self.assertNotEqual(lines[r][c], '.')
+                if c + 2 < cols:
+                    self.assertNotEqual(lines[r][c], lines[r][c + 2])
+                if r + 2 < rows:
+                    self.assertNotEqual(lines[r][c], lines[r + 2][c])
+
+    def test_read_board_output(self):
+        diagram = output.gen_board_output((4, 6), SOLUTION)
+        solution = output.read_board_output((4, 6), diagram)
+        self.assertEqual(output.gen_board_output((4, 6), solution), diagram)
+        self.assertEqual(sorted(orientation.type for _, orientation in solution), sorted('ITT5LP'))
+        self.assertEqual(output.read_board_output((4, 6), '?'), [])
+        self.assertIsNone(output.read_board_output((4, 6), output.UNKNOWN))
+        # Reused characters past 62 tiles
+        diagram = output.gen_board_output((16, 18), o_tiles(16, 18))
+        self.assertEqual(len(output.read_board_output((16, 18), diagram)), 72)
+        for bad in ['aaaabb\ncccbbd\ncefffd', 'aaaabb\ncccbbd\ncefffd\neeefd.', 'aaaabb\ncccbbd\ncefffd\neeefed',
+                    'bbbbaa\ncccaad\ncefffd\neeefdd']:
+            with self.assertRaises(ValueError):
+                output.read_board_output((4, 6), bad)
+
+    def test_json(self):
+        document = json.loads(output.gen_json_output((4, 6), SOLUTION))
+        self.assertEqual((document['size'], document['status']), ([4, 6], 'solved'))
+        self.assertEqual([placement['type'] for placement in document['placements']], list('I5LPTT'))
+        grid = [[0] * 6 for _ in range(4)]
+        for placement in document['placements']:
+            for row, col in placement['cells']:
+                grid[row][col] = placement['label']
+        self.assertEqual(grid, output.label_grid((4, 6), SOLUTION))
+        self.assertEqual(json.loads(output.gen_json_output((4, 6), None)),
+                         {'size': [4, 6], 'status': 'unknown', 'placements': []})
+
+    def test_rle(self):
+        self.assertEqual(output.gen_rle_output((4, 6), SOLUTION).split('\n')[:2], ['1:4,2:2', '3:3,2:2,4:1'])
+        self.assertEqual(output.gen_rle_output((4, 6), []), '?')
+
+    def test_binary(self):
+        data = output.gen_binary_output((4, 6), SOLUTION)
+        self.assertEqual(len(data), output.BINARY_HEADER.size + 2 * 24)
+        self.assertEqual(output.read_binary_output(data), ('solved', (4, 6), output.label_grid((4, 6), SOLUTION)))
+        self.assertEqual(output.read_binary_output(output.gen_binary_output((4, 6), [])),
+                         ('unsolvable', (4, 6), None))
+        with self.assertRaises(ValueError):
+            output.read_binary_output(b'\x00' * 16)
+
+    def test_solve_formats(self):
+        self.assertEqual(tetrominos.solve((4, 6), 'ITT5LP', output_format='diagram'),
+                         tetrominos.solve((4, 6), 'ITT5LP'))
+        for engine in sorted(tetrominos.ENGINES):
+            document = json.loads(tetrominos.solve((4, 6), 'ITT5LP', engine=engine, output_format='json'))
+            self.assertEqual(sorted(placement['type'] for placement in document['placements']), sorted('ITT5LP'))
+        self.assertEqual(json.loads(tetrominos.solve((4, 6), 'ITT5L', output_format='json'))['status'], 'unsolvable')
+        self.assertEqual(output.read_binary_output(tetrominos.solve((6, 6), '52OTTTTTT', output_format='binary'))[0],
+                         'unsolvable')
+        self.assertIn('A', tetrominos.solve((2, 60), 'O' * 30))
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Parallel search tests"""
+
+# Imports
+import os
+from collections import Counter
+from concurrent.futures.process import BrokenProcessPool
+from unittest import TestCase
+from unittest.mock import patch
+
+import parallel
+from bitboard import BitBoard
+from output import read_board_output
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+
+
+def _die(job):
+    """A worker killed in the middle of a sub-problem"""
+    os._exit(1)
+
+
+class TestParallel(TestCase):
+    def test_expand(self):
+        board = BitBoard((2, 4))
+        children, solution = parallel.expand(board, [0, 0, 0, 0, 0, 0, 2], [])
+        self.assertEqual(children, [[((0, 0), 'O', 0)]])
+        self.assertIsNone(solution)
+        self.assertEqual(board.free, board.full)
+
+    def test_solve_parallel(self):
+        # A tiny node budget forces the workers to split their sub-problems
+        output = parallel.solve_parallel((6, 8), 'OOI22TTLLPPP', workers=2, frontier_depth=1, node_budget=5)
+        self.assertEqual(Counter(orientation.type for _, orientation in read_board_output((6, 8), output)),
+                         Counter('OOI22TTLLPPP'))
+        self.assertEqual(parallel.solve_parallel((6, 6), '52OTTTTTT', workers=2, node_budget=5), '?')
+        self.assertEqual(parallel.solve_parallel((3, 4), 'OOT', workers=2), '?')
+
+    def test_worker_dies(self):
+        with patch.object(parallel, '_search', _die):
+            with self.assertRaises(BrokenProcessPool):
+                parallel.tettile_parallel((6, 8), 'OOI22TTLLPPP', workers=2, frontier_depth=1)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Region feasibility pruning tests"""
+
+# Imports
+from unittest import TestCase
+
+import tetrominos
+from bitboard import BitBoard
+from pruning import POCKETS, RegionPruner
+from tile import tile_counts, tile_factory
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+
+
+class TestRegionPruner(TestCase):
+    def test_pockets(self):
+        self.assertEqual(len(POCKETS), 19)
+        self.assertEqual(POCKETS[((0, 1), (0, 2), (1, 0), (1, 1))], '5')
+        self.assertEqual(POCKETS[((0, 0), (0, 1), (1, 1), (1, 2))], '2')
+        # The middle 4 cells of a 2x3 board make a 5 shaped pocket
+        pruner = RegionPruner((2, 3))
+        self.assertTrue(pruner.feasible(0b011110, tile_counts('5')))
+        self.assertFalse(pruner.feasible(0b011110, tile_counts('2')))
+
+    def test_checkerboard_balance(self):
+        pruner = RegionPruner((4, 4))
+        full = (1 << 16) - 1
+        self.assertFalse(pruner.feasible(full, tile_counts('TTTO')))
+        self.assertTrue(pruner.feasible(full, tile_counts('TTTT')))
+        self.assertTrue(pruner.feasible(full, tile_counts('TTLP')))
+
+    def test_small_region_cache(self):
+        # An I down the first column leaves a 4x3 group
+        pruner = RegionPruner((4, 4))
+        board = BitBoard((4, 4))
+        board.place_tile(tile_factory('I'), (0, 0))
+        self.assertTrue(pruner.feasible(board.occupancy(), tile_counts('OOOIII')))
+        self.assertEqual((pruner.hits, pruner.misses), (0, 1))
+        # Counts are capped at the 3 tiles the group needs, so this is the same cache entry
+        self.assertTrue(pruner.feasible(board.occupancy(), tile_counts('OOOOIIII')))
+        self.assertEqual((pruner.hits, pruner.misses), (1, 1))
+        self.assertFalse(pruner.feasible(board.occupancy(), tile_counts('OOO')))
+
+    def test_solve_with_pruning(self):
+        for engine in tetrominos.DFS_ENGINES:
+            for size, tile_string in [((4, 6), 'ITT5LP'), ((6, 6), '52OTTTTTT'), ((3, 4), 'OOT'), ((4, 4), 'TTTO')]:
+                self.assertEqual(tetrominos.solve(size, tile_string, backend='bitboard', engine=engine,
+                                                  prune_regions=True),
+                                 tetrominos.solve(size, tile_string, backend='bitboard', engine=engine))
+        with self.assertRaises(ValueError):
+            tetrominos.solve((4, 6), 'ITT5LP', engine='dlx', prune_regions=True)
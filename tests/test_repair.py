@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Solution repair tests"""
+
+# Imports
+import os
+import subprocess
+import sys
+import tempfile
+from collections import Counter
+from unittest import TestCase
+from unittest.mock import patch
+
+import tetrominos
+from bitboard import BitBoard
+from output import gen_board_output
+from repair import RepairStats, repair
+from tetrominos import read_instance
+from tile import gen_tiles
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(TEST_DIR)
+
+
+class TestRepair(TestCase):
+    def assertTiles(self, size, tile_string, solution):
+        board = BitBoard(size)
+        for position, orientation in solution:
+            self.assertTrue(board.tile_fits(orientation, position))
+            board.place_tile(orientation, position)
+        self.assertTrue(board.is_solved())
+        self.assertEqual(Counter(orientation.type for _, orientation in solution), Counter(tile_string))
+
+    def test_swap_one_piece(self):
+        size, tile_string = read_instance(os.path.join(TEST_DIR, 'large-test-pass.txt'))
+        previous = tetrominos.ENGINES['dlx'](BitBoard(size), gen_tiles(tile_string))
+        # One L for a P
+        changed = tile_string.replace('L', 'P', 1)
+        stats = RepairStats()
+        solution = repair(size, previous, changed, stats=stats)
+        self.assertTiles(size, changed, solution)
+        self.assertFalse(stats.full_solve)
+        self.assertLess(stats.ripped, len(tile_string) // 2)
+        # Most of the previous solution is kept
+        self.assertGreaterEqual(len(set(solution) & set(previous)), len(tile_string) - stats.ripped)
+
+    def test_nothing_to_repair(self):
+        previous = tetrominos.ENGINES['cells'](BitBoard((4, 6)), gen_tiles('IOTTLP'))
+        stats = RepairStats()
+        self.assertEqual(repair((4, 6), previous, 'PLTTOI', stats=stats),
+                         sorted(previous, key=lambda placement: placement[0]))
+        self.assertEqual(stats.attempts, 0)
+
+    def test_fall_back(self):
+        previous = tetrominos.ENGINES['cells'](BitBoard((4, 6)), gen_tiles('IOTTLP'))
+        # No solution at all
+        stats = RepairStats()
+        self.assertEqual(repair((4, 6), previous, 'IITTLP', stats=stats), [])
+        self.assertTrue(stats.full_solve)
+        self.assertEqual(repair((4, 6), previous, 'IOTLLP'), [])
+        # No previous solution to repair
+        for previous_solution in ([], None, previous[1:]):
+            stats = RepairStats()
+            self.assertTiles((4, 6), 'IOTTLL', repair((4, 6), previous_solution, 'IOTTLL', stats=stats))
+            self.assertTrue(stats.full_solve)
+            self.assertEqual(stats.attempts, 0)
+        # A fallback engine that gives up isn't a proof there is no solution
+        with patch.dict(tetrominos.ENGINES, blocks=lambda board, tiles: None):
+            self.assertIsNone(repair((4, 6), None, 'IOTTLL', engine='blocks'))
+
+    def test_diagram(self):
+        diagram = tetrominos.solve((6, 8), 'OOI22TTLLPPP', engine='cells')
+        self.assertTiles((6, 8), 'OOI22TTLPPPP', repair((6, 8), diagram, 'OOI22TTLPPPP'))
+        with self.assertRaises(ValueError):
+            repair((6, 8), diagram.replace('a', 'b'), 'OOI22TTLPPPP')
+
+    def test_command_line(self):
+        size, tile_string = read_instance(os.path.join(TEST_DIR, 'large-test-pass2.txt'))
+        previous = tetrominos.solve(size, tile_string, engine='dlx')
+        changed = tile_string.replace('5', '2', 1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'previous.txt')
+            with open(path, 'w') as f:
+                f.write(previous + '\n')
+            result = subprocess.run([sys.executable, 'repair.py', path, '--stats'], cwd=ROOT,
+                                    input='{} {}\n{}\n'.format(size[0], size[1], changed), stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE, universal_newlines=True)
+        self.assertEqual(result.stdout.strip(), gen_board_output(size, repair(size, previous, changed)))
+        self.assertIn('repair: ', result.stderr)
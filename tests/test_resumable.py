@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Resumable search tests"""
+
+# Imports
+import glob
+import os
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase
+
+import tetrominos
+from limits import SearchLimits
+from resumable import Checkpoint
+from stats import SearchStats
+from tetrominos import read_instance
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(TEST_DIR)
+# An unsolvable instance that takes a few thousand nodes
+FAIL = ((6, 6), '2IPTTTTTT')
+
+
+class TestResumable(TestCase):
+    def test_same_search_as_tiles(self):
+        for path in sorted(glob.glob(os.path.join(TEST_DIR, '*-test-*.txt'))):
+            # Too slow for the tiles engine
+            if os.path.basename(path) in ('large-test-fail.txt', 'large-test-pass.txt'):
+                continue
+            size, tile_string = read_instance(path)
+            nodes = []
+            outputs = []
+            for engine in ('tiles', 'stack'):
+                stats = SearchStats()
+                outputs.append(tetrominos.solve(size, tile_string, engine=engine, stats=stats))
+                nodes.append(stats.nodes)
+            self.assertEqual(outputs[0], outputs[1], path)
+            self.assertEqual(nodes[0], nodes[1], path)
+
+    def test_resume_after_a_limit(self):
+        expected = tetrominos.solve(*FAIL, engine='stack', prune_regions=True)
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = Checkpoint(os.path.join(directory, 'search.json'))
+            # Stop and save every 500 nodes until the search is done
+            runs = 0
+            output = tetrominos.UNKNOWN
+            while output == tetrominos.UNKNOWN:
+                output = tetrominos.solve(*FAIL, engine='stack', limits=SearchLimits(max_nodes=500),
+                                          checkpoint=checkpoint, prune_regions=True)
+                runs += 1
+            self.assertEqual(output, expected)
+            self.assertGreater(runs, 2)
+            self.assertEqual(checkpoint.saves, runs - 1)
+            self.assertGreater(checkpoint.resumed, 0)
+            # The checkpoint is gone once the search is done
+            self.assertFalse(os.listdir(directory))
+
+    def test_stop_on_request(self):
+        size, tile_string = read_instance(os.path.join(TEST_DIR, 'large-test-pass2.txt'))
+        expected = tetrominos.solve(size, tile_string, engine='stack')
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = Checkpoint(os.path.join(directory, 'search.json'))
+            checkpoint.request(stop=True)
+            self.assertEqual(tetrominos.solve(size, tile_string, engine='stack', checkpoint=checkpoint),
+                             tetrominos.UNKNOWN)
+            self.assertEqual(checkpoint.load()['moves'], [checkpoint.load()['moves'][0]])
+            resumed = Checkpoint(checkpoint.path)
+            self.assertEqual(tetrominos.solve(size, tile_string, engine='stack', checkpoint=resumed), expected)
+            self.assertEqual(resumed.resumed, 1)
+            # A checkpoint only resumes the instance it was saved from
+            checkpoint = Checkpoint(os.path.join(directory, 'search.json'))
+            checkpoint.request(stop=True)
+            tetrominos.solve(*FAIL, engine='stack', checkpoint=checkpoint)
+            with self.assertRaises(ValueError):
+                tetrominos.solve(size, tile_string, engine='stack', checkpoint=checkpoint)
+        with self.assertRaises(ValueError):
+            tetrominos.solve(*FAIL, engine='tiles', checkpoint=checkpoint)
+
+    def test_command_line(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'search.json')
+            command = [sys.executable, 'tetrominos.py', '--engine', 'stack', '--checkpoint', path]
+            instance = '{} {}\n{}\n'.format(FAIL[0][0], FAIL[0][1], FAIL[1])
+            result = subprocess.run(command + ['--max-nodes', '100'], cwd=ROOT, input=instance,
+                                    stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+            self.assertEqual(result.stdout, tetrominos.UNKNOWN + '\n')
+            self.assertTrue(os.path.exists(path))
+            result = subprocess.run(command, cwd=ROOT, input=instance, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                    universal_newlines=True)
+            self.assertEqual(result.stdout, '?\n')
+            self.assertIn('resumed at depth', result.stderr)
+            self.assertFalse(os.path.exists(path))
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Solution enumeration and counting tests"""
+
+# Imports
+import itertools
+from unittest import TestCase
+
+import solutions
+from bitboard import BitBoard
+from board import Board
+from tile import gen_tiles
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+
+
+class TestSolutions(TestCase):
+    def test_iter_solutions(self):
+        board = BitBoard((4, 6))
+        found = list(solutions.iter_solutions(board, gen_tiles('ITT5LP')))
+        self.assertEqual(len(found), 10)
+        outputs = {board.gen_board_output((4, 6), solution) for solution in found}
+        self.assertEqual(len(outputs), 10)
+        self.assertIn('abbbcc\nadbcce\nadfffe\naddfee', outputs)
+        self.assertEqual(board.free, board.full)
+
+    def test_iter_solutions_is_lazy(self):
+        first = next(solutions.iter_solutions(Board((6, 8)), gen_tiles('OOI22TTLLPPP')))
+        self.assertEqual(sorted(o.type for _, o in first), sorted('OOI22TTLLPPP'))
+
+    def test_distinct_pieces(self):
+        tiles = gen_tiles('ITT5LP')
+        found = list(solutions.iter_solutions(BitBoard((4, 6)), tiles, distinct_pieces=True))
+        self.assertEqual(len(found), 20)
+        for solution in found:
+            self.assertEqual([o.type for _, o in solution], list('ITT5LP'))
+        self.assertEqual(len({tuple(solution) for solution in found}), 20)
+
+    def test_count_solutions(self):
+        for size, tile_string in [((4, 6), 'ITT5LP'), ((6, 6), 'IIOOPPLLI'), ((3, 4), 'OOL'), ((4, 4), 'TTLP')]:
+            expected = sum(1 for _ in solutions.iter_solutions(BitBoard(size), gen_tiles(tile_string)))
+            self.assertEqual(solutions.count_solutions(BitBoard(size), gen_tiles(tile_string)), expected)
+            self.assertEqual(solutions.count_solutions(Board(size), gen_tiles(tile_string)), expected)
+        self.assertEqual(solutions.count_solutions(BitBoard((4, 6)), gen_tiles('ITT5LP'), distinct_pieces=True), 20)
+
+    def test_count_memo_is_reusable(self):
+        memo = {}
+        first = solutions.count_solutions(BitBoard((6, 6)), gen_tiles('IIOOPPLLI'), memo=memo)
+        self.assertGreater(len(memo), 0)
+        self.assertEqual(solutions.count_solutions(BitBoard((6, 6)), gen_tiles('IIOOPPLLI'), memo=memo), first)
+        self.assertEqual(list(itertools.islice(solutions.iter_solutions(BitBoard((3, 4)), gen_tiles('OOL')), 1)), [])
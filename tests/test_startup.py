@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Startup cost tests: the bitboard path must not import numpy or scipy"""
+
+# Imports
+import os
+import subprocess
+import sys
+from unittest import TestCase
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Importing tetrominos takes ~30ms without numpy and scipy and ~250ms with them
+IMPORT_BUDGET_US = 150000
+
+
+def run_python(*args, stdin=None):
+    """
+    Run a fresh interpreter in the repository root.
+    :return: (subprocess.CompletedProcess) The finished process, with text stdout and stderr
+    """
+    return subprocess.run([sys.executable] + list(args), cwd=ROOT, input=stdin, stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE, universal_newlines=True, check=True)
+
+
+def heavy_modules(code):
+    """
+    :param code: (str)   Python code to run in a fresh interpreter
+    :return:     ([str]) Which of numpy and scipy it imported
+    """
+    check = "; import sys; print(' '.join(m for m in ('numpy', 'scipy') if m in sys.modules))"
+    return run_python('-c', code + check).stdout.split()
+
+
+class TestStartup(TestCase):
+    def test_bitboard_path_is_stdlib_only(self):
+        self.assertEqual(heavy_modules('import tetrominos'), [])
+        for engine in ('tiles', 'cells', 'dlx'):
+            self.assertEqual(heavy_modules("import tetrominos; tetrominos.solve((4, 6), 'ITT5LP', engine='{}')"
+                                           .format(engine)), [])
+        self.assertEqual(heavy_modules('import batch, parallel, solutions, pruning, transposition, stats, limits'), [])
+
+    def test_numpy_is_loaded_on_use(self):
+        self.assertEqual(heavy_modules("import tetrominos; tetrominos.solve((4, 6), 'ITT5LP', backend='numpy')"),
+                         ['numpy'])
+        self.assertEqual(heavy_modules('from board import Board; Board((4, 4)).is_valid()'), ['numpy', 'scipy'])
+        self.assertEqual(heavy_modules("import tile; tile.SHAPES['T'][0].face"), ['numpy'])
+
+    def test_cli(self):
+        with open(os.path.join(ROOT, 'tests', 'small-test-pass.txt')) as f:
+            instance = f.read()
+        result = run_python('-X', 'importtime', 'tetrominos.py', stdin=instance)
+        self.assertEqual(result.stdout, 'abbbcc\nadbcce\nadfffe\naddfee\n')
+        imported = [line.split('|')[-1].strip() for line in result.stderr.splitlines()]
+        self.assertNotIn('numpy', imported)
+        self.assertNotIn('scipy', imported)
+
+    def test_import_time(self):
+        result = run_python('-X', 'importtime', '-c', 'import tetrominos')
+        cumulative = {line.split('|')[-1].strip(): int(line.split('|')[1])
+                      for line in result.stderr.splitlines() if line.startswith('import time:') and '|' in line
+                      and line.split('|')[1].strip().isdigit()}
+        self.assertLess(cumulative['tetrominos'], IMPORT_BUDGET_US)
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Search instrumentation tests"""
+
+# Imports
+import json
+from unittest import TestCase
+
+import tetrominos
+from bitboard import BitBoard
+from stats import SearchStats, instrumented_board
+from tile import tile_factory
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+
+
+class TestSearchStats(TestCase):
+    def test_tile_fits_reasons(self):
+        stats = SearchStats()
+        board = instrumented_board(BitBoard, (4, 4), stats)
+        board.place_tile(tile_factory('O'), (0, 0))
+        self.assertTrue(board.tile_fits(tile_factory('O'), (2, 2)))
+        self.assertFalse(board.tile_fits(tile_factory('O'), (3, 0)))
+        self.assertFalse(board.tile_fits(tile_factory('O'), (1, 1)))
+        self.assertEqual(stats.tile_fits, 3)
+        self.assertEqual((stats.prunes['out_of_bounds'], stats.prunes['overlap']), (1, 1))
+        self.assertEqual(stats.placements, 1)
+
+    def test_solve_with_stats(self):
+        for engine in tetrominos.DFS_ENGINES:
+            by_backend = []
+            for backend in sorted(tetrominos.BACKENDS):
+                stats = SearchStats()
+                self.assertEqual(tetrominos.solve((6, 6), '52OTTTTTT', backend=backend, engine=engine, stats=stats),
+                                 '?')
+                # Every node fails, and every placement either makes a node or is rejected by the partition check
+                self.assertEqual(stats.backtracks, stats.nodes)
+                self.assertEqual(stats.placements, stats.nodes + stats.prunes['partition'])
+                self.assertEqual(sum(stats.depth.values()), stats.nodes)
+                self.assertEqual(stats.prunes['duplicate_type'] > 0, engine == 'tiles')
+                by_backend.append((stats.nodes, stats.placements, stats.prunes['partition']))
+            self.assertEqual(by_backend[0], by_backend[1])
+
+    def test_report(self):
+        stats = SearchStats()
+        output = tetrominos.solve((4, 6), 'ITT5LP', backend='bitboard', stats=stats)
+        self.assertEqual(output, tetrominos.solve((4, 6), 'ITT5LP', backend='bitboard'))
+        self.assertEqual(stats.placements - stats.removals, 6)
+        self.assertGreater(stats.times['gen_board_output'], 0)
+        # The tiles engine looks for positions with tile_can_be_placed on either backend
+        self.assertGreater(stats.times['tile_can_be_placed'], 0)
+        report = json.loads(json.dumps(stats.as_dict()))
+        self.assertEqual(report['nodes'], stats.nodes)
+        self.assertEqual(report['depth']['6'], 1)
+        self.assertIn('duplicate_type', str(stats))
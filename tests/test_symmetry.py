@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Symmetry breaking tests"""
+
+# Imports
+import glob
+import os
+from itertools import combinations_with_replacement
+from unittest import TestCase
+
+import tetrominos
+from bitboard import BitBoard
+from output import read_board_output
+from stats import SearchStats
+from symmetry import break_symmetry, instance_symmetries, transform_placement, SYMMETRIES
+from tetrominos import read_instance
+from tile import gen_tiles, tile_counts, tile_factory, SHAPES, TILE_TYPES
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestSymmetry(TestCase):
+    def test_instance_symmetries(self):
+        self.assertEqual(instance_symmetries((4, 6), tile_counts('ITT5LP')), ['identity', 'rotate180'])
+        self.assertEqual(instance_symmetries((4, 6), tile_counts('IOTTLP')),
+                         ['identity', 'rotate180', 'mirror', 'flip'])
+        self.assertEqual(instance_symmetries((4, 4), tile_counts('LPLP')), list(SYMMETRIES))
+        self.assertEqual(instance_symmetries((4, 4), tile_counts('LLLL')),
+                         ['identity', 'rotate90', 'rotate180', 'rotate270'])
+
+    def test_transform_placement(self):
+        # A mirror turns an L into a P, and back
+        placement = ((0, 0), tile_factory('L').orientation)
+        mirrored = transform_placement((4, 4), 'mirror', placement)
+        self.assertEqual(mirrored, ((0, 2), SHAPES['P'][2]))
+        self.assertEqual(transform_placement((4, 4), 'mirror', mirrored), placement)
+        # Four quarter turns are the identity, and a quarter turn one way undoes one the other way
+        for tile_type in TILE_TYPES:
+            for orientation in SHAPES[tile_type]:
+                placement = ((1, 0), orientation)
+                turned = placement
+                for _ in range(4):
+                    turned = transform_placement((5, 5), 'rotate90', turned)
+                    self.assertEqual(turned[1].type, tile_type)
+                self.assertEqual(turned, placement)
+                self.assertEqual(transform_placement((5, 5), 'rotate270',
+                                                     transform_placement((5, 5), 'rotate90', placement)), placement)
+
+    def test_nothing_is_lost(self):
+        # Every small instance is solvable with symmetry breaking exactly when it is solvable without
+        for size in [(4, 4), (2, 8), (1, 8)]:
+            for tiles in combinations_with_replacement(TILE_TYPES, size[0] * size[1] // 4):
+                tile_string = ''.join(tiles)
+                for engine in tetrominos.DFS_ENGINES:
+                    expected = tetrominos.solve(size, tile_string, engine=engine)
+                    output = tetrominos.solve(size, tile_string, engine=engine, symmetric=True)
+                    self.assertEqual(output == '?', expected == '?', (size, tile_string, engine))
+                    if output != '?':
+                        solution = read_board_output(size, output)
+                        self.assertEqual(sorted(orientation.type for _, orientation in solution), sorted(tile_string))
+
+    def test_fixtures(self):
+        for path in sorted(glob.glob(os.path.join(TEST_DIR, '*-test-*.txt'))):
+            size, tile_string = read_instance(path)
+            expected = tetrominos.solve(size, tile_string, engine='cells')
+            for engine in tetrominos.DFS_ENGINES:
+                if engine == 'tiles' and 'large' in path:
+                    continue
+                output = tetrominos.solve(size, tile_string, engine=engine, symmetric=True, prune_regions=True)
+                self.assertEqual(output == '?', expected == '?', (path, engine))
+        with self.assertRaises(ValueError):
+            tetrominos.solve((4, 6), 'ITT5LP', engine='dlx', symmetric=True)
+
+    def test_fewer_nodes(self):
+        # An unsolvable square with the 4 turns as its symmetries
+        stats = SearchStats()
+        self.assertEqual(tetrominos.solve((6, 6), '2IPTTTTTT', stats=stats), '?')
+        plain = stats.nodes
+        stats = SearchStats()
+        self.assertEqual(tetrominos.solve((6, 6), '2IPTTTTTT', stats=stats, symmetric=True), '?')
+        self.assertLess(stats.nodes * 4, plain)
+
+    def test_solution_in_label_order(self):
+        board = BitBoard((4, 6))
+        solution = break_symmetry(tetrominos.tettile, board, gen_tiles('IOTTLP'))
+        self.assertTrue(board.is_solved())
+        self.assertEqual([position for position, _ in solution], sorted(position for position, _ in solution))
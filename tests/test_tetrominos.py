@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Solver tests"""
+
+# Imports
+import glob
+import os
+from collections import Counter
+from unittest import TestCase
+
+import tetrominos
+from output import read_board_output
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def read_instance(path):
+    with open(path) as f:
+        size, tile_string = f.read().strip().split('\n')
+    return tuple(map(int, size.split(' '))), tile_string
+
+
+class TestTetrominos(TestCase):
+    def assertSolves(self, size, tile_string, output):
+        solution = read_board_output(size, output)
+        self.assertEqual(Counter(orientation.type for _, orientation in solution), Counter(tile_string))
+
+    def test_solve_expected_outputs(self):
+        for path in sorted(glob.glob(os.path.join(TEST_DIR, 'test[0-9]-in.txt'))):
+            size, tile_string = read_instance(path)
+            with open(path.replace('-in.txt', '-out.txt')) as f:
+                expected = f.read().strip()
+            # The expected diagrams come from the original search, but any engine can prove there is no solution
+            engine = 'dlx' if expected == '?' else 'tiles'
+            self.assertEqual(tetrominos.solve(size, tile_string, backend='bitboard', engine=engine), expected)
+
+    def test_engines_agree(self):
+        for path in sorted(glob.glob(os.path.join(TEST_DIR, '*-test-*.txt'))):
+            size, tile_string = read_instance(path)
+            outputs = [tetrominos.solve(size, tile_string, backend='bitboard', engine=engine)
+                       for engine in sorted(tetrominos.ENGINES)
+                       # tiles and stack take too long to prove large failures
+                       if engine not in ('tiles', 'stack') or 'fail' not in path]
+            # The blocks engine can only prove a failure when the board is a single block
+            outputs = [output for output in outputs if output != tetrominos.UNKNOWN]
+            self.assertEqual(len({output == '?' for output in outputs}), 1, path)
+            for output in outputs:
+                if output != '?':
+                    self.assertSolves(size, tile_string, output)
+
+    def test_tettile_cells(self):
+        for backend in sorted(tetrominos.BACKENDS):
+            output = tetrominos.solve((6, 8), 'OOI22TTLLPPP', backend=backend, engine='cells')
+            self.assertSolves((6, 8), 'OOI22TTLLPPP', output)
+            self.assertEqual(tetrominos.solve((3, 4), 'OOL', backend=backend, engine='cells'), '?')
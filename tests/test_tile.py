@@ -7,11 +7,13 @@ Long description
 """
 
 # Imports
+import pickle
 from unittest import TestCase
 
 import numpy as np
 
-from tile import OTile, ITile, LTile, PTile, TwoTile, FiveTile, TTile
+from tile import (OTile, ITile, LTile, PTile, TwoTile, FiveTile, TTile, SHAPES, TILE_TYPES, find_orientation,
+                  tile_factory)
 
 __author__ = "Michael Lane"
 __email__ = "mikelane@gmail.com"
@@ -77,3 +79,46 @@ class TestTile(TestCase):
         self.assertEqual(tile.current_orientation, 3)
         self.assertEqual(np.all(tile.anchor == [0, 1]), True)
         self.assertEqual(TTile(), tile.rotate())
+
+    def test_shape_library(self):
+        self.assertEqual(sorted(SHAPES), sorted(TILE_TYPES))
+        self.assertEqual([len(SHAPES[t]) for t in TILE_TYPES], [2, 2, 2, 4, 4, 4, 1])
+        for tile_type, orientations in SHAPES.items():
+            for orientation in orientations:
+                self.assertEqual(len(orientation.cells), 4)
+                self.assertEqual(orientation.cells[0], tuple(orientation.anchor))
+                self.assertEqual(orientation.shape, orientation.face.shape)
+
+    def test_orientation_is_immutable(self):
+        orientation = SHAPES['L'][1]
+        with self.assertRaises(AttributeError):
+            orientation.anchor = np.array([0, 0])
+        with self.assertRaises(ValueError):
+            orientation.face[0, 0] = 5
+
+    def test_tiles_share_the_library(self):
+        first, second = tile_factory('T'), tile_factory('T')
+        self.assertIs(first.face, second.face)
+        first.rotate()
+        self.assertIs(first.orientation, SHAPES['T'][1])
+        self.assertIs(second.orientation, SHAPES['T'][0])
+
+    def test_find_orientation(self):
+        for tile_type in TILE_TYPES:
+            for orientation in SHAPES[tile_type]:
+                cells = [(5 + r, 3 + c) for r, c in reversed(orientation.cells)]
+                self.assertEqual(find_orientation(cells), ((5, 3), orientation))
+        self.assertIsNone(find_orientation([(0, 0), (0, 1), (1, 2), (1, 3)]))
+        self.assertIsNone(find_orientation([(0, 0), (0, 1), (0, 2)]))
+
+    def test_pickle(self):
+        for tile_type in TILE_TYPES:
+            for orientation in SHAPES[tile_type]:
+                self.assertIs(pickle.loads(pickle.dumps(orientation)), orientation)
+        tile = tile_factory('L')
+        tile.rotate()
+        copy = pickle.loads(pickle.dumps(tile))
+        self.assertEqual(copy.type, 'L')
+        self.assertIs(copy.orientation, SHAPES['L'][1])
+        copy.rotate()
+        self.assertIs(copy.orientation, SHAPES['L'][2])
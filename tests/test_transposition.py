@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Transposition table tests"""
+
+# Imports
+from unittest import TestCase
+
+import tetrominos
+from transposition import TranspositionTable, state_key
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+
+
+class TestTranspositionTable(TestCase):
+    def test_state_key(self):
+        self.assertNotEqual(state_key(0b1010, [1, 0, 0, 0, 0, 0, 0]), state_key(0b1010, [0, 1, 0, 0, 0, 0, 0]))
+        self.assertNotEqual(state_key(0b1010, [1, 0, 0, 0, 0, 0, 0]), state_key(0b1011, [1, 0, 0, 0, 0, 0, 0]))
+        self.assertEqual(state_key(0b1010, [26, 0, 0, 0, 0, 0, 3]), state_key(0b1010, [26, 0, 0, 0, 0, 0, 3]))
+
+    def test_hits_and_misses(self):
+        table = TranspositionTable()
+        self.assertFalse(table.is_dead(1))
+        table.add(1)
+        self.assertTrue(table.is_dead(1))
+        self.assertEqual((table.hits, table.misses, table.stores), (1, 1, 1))
+
+    def test_lru_eviction(self):
+        table = TranspositionTable(max_entries=2)
+        table.add(1)
+        table.add(2)
+        table.is_dead(1)  # 2 is now the least recently used
+        table.add(3)
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table.evictions, 1)
+        self.assertTrue(table.is_dead(1))
+        self.assertFalse(table.is_dead(2))
+
+    def test_byte_budget(self):
+        table = TranspositionTable(max_bytes=1000)
+        for key in range(100):
+            table.add(key << 100)
+        self.assertLessEqual(table.bytes, 1000)
+        self.assertEqual(table.stores - table.evictions, len(table))
+
+    def test_solve_with_table(self):
+        for engine in tetrominos.DFS_ENGINES:
+            table = TranspositionTable(max_entries=1000)
+            self.assertEqual(tetrominos.solve((6, 6), '52OTTTTTT', backend='bitboard', engine=engine, table=table), '?')
+            self.assertGreater(table.stores, 0)
+            self.assertEqual(tetrominos.solve((4, 6), 'ITT5LP', engine=engine, table=TranspositionTable()),
+                             tetrominos.solve((4, 6), 'ITT5LP', engine=engine))
+        with self.assertRaises(ValueError):
+            tetrominos.solve((4, 6), 'ITT5LP', engine='dlx', table=TranspositionTable())
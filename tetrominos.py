@@ -71,14 +71,28 @@ documents. For the sake of all that is holy, do not submit Notepad UTF-16 files.
 All submission materials must be placed in a ZIP file named "hw1-lastname.zip" and uploaded to the course Moodle.
 """
 
+import argparse
+import importlib
 import sys
 from collections import Counter
+from collections.abc import Mapping
 
-import numpy as np
 from typing import Union, List, Tuple
 
-from board import Board
-from tile import gen_tiles, Tile
+from bitboard import BitBoard
+from blocks import tettile_blocks
+from cache import SolutionCache
+from dlx import tettile_dlx
+from frontier import tettile_frontier
+from heuristics import CELL_ORDERS, VALUE_ORDERS, SearchOrder
+from tile import gen_tiles, tile_counts, Orientation, Tile, SHAPES, TILE_TYPES
+from pruning import RegionPruner
+from resumable import Checkpoint, tettile_stack
+from limits import SearchInterrupted, SearchLimits, limited
+from output import FORMATS, UNKNOWN
+from stats import SearchStats, instrumented
+from symmetry import break_symmetry
+from transposition import TranspositionTable, state_key
 
 __author__ = "Michael Lane"
 __email__ = "mikelane@gmail.com"
@@ -86,7 +100,38 @@ __copyright__ = "Copyright 2017, Michael Lane"
 __license__ = "MIT"
 
 
-def tettile(board: Board, tiles: List[Tile]) -> Union[List[Tuple[Tuple[int, int], Tile]], bool]:
+class _Backends(Mapping):
+    """Board classes by name. A backend's module is only imported the first time that backend is looked up, so a
+    bitboard search never pays for importing numpy."""
+
+    def __init__(self, classes):
+        self.classes = classes
+        self.loaded = {}
+
+    def __getitem__(self, name):
+        if name not in self.loaded:
+            module, class_name = self.classes[name]
+            self.loaded[name] = getattr(importlib.import_module(module), class_name)
+        return self.loaded[name]
+
+    def __iter__(self):
+        return iter(self.classes)
+
+    def __len__(self):
+        return len(self.classes)
+
+
+# The available board implementations. Both produce identical solutions, the bitboard is simply faster and only needs
+# the standard library.
+BACKENDS = _Backends({
+    'numpy': ('board', 'Board'),
+    'bitboard': ('bitboard', 'BitBoard'),
+})
+
+
+def tettile(board: Union['Board', BitBoard], tiles: List[Tile], table: TranspositionTable = None,
+            pruner: RegionPruner = None, stats: SearchStats = None,
+            order: SearchOrder = None) -> List[Tuple[Tuple[int, int], Orientation]]:
     """Attempt to tile the board with tetrominos tiles
     
     The pseudocode is as follows:
@@ -98,15 +143,14 @@ def tettile(board: Board, tiles: List[Tile]) -> Union[List[Tuple[Tuple[int, int]
             if the same type of tile is in the tiles_used set
                 continue
             Add the tile to the tiles_used set
-            for j from 0 up to the number of rotations for the tile
-                position <- location to place tile or False if it cannot be placed
+            for each orientation of the tile
+                position <- location to place orientation or False if it cannot be placed
                 if position is a location
-                    place tile on board
+                    place orientation on board
                     if the board is now in an invalid state
-                        remove the tile from the board
-                        rotate the tile
+                        remove the orientation from the board
                         continue
-                    append tuple (l, tile) to solution
+                    append tuple (l, orientation) to solution
                     if board is solved
                         return solution
                     result <- tettile(board, tiles except for current tile)
@@ -116,36 +160,63 @@ def tettile(board: Board, tiles: List[Tile]) -> Union[List[Tuple[Tuple[int, int]
                     else
                         remove the tile from the board
                         remove the tile from the solution
-                rotate tile
         return False
+
+    The orientations come from the precomputed shape library (see tile.SHAPES), so the tiles themselves are never
+    rotated and the solution holds immutable Orientation records.
+
+    If a transposition table is given, every (board occupancy, remaining tile types) state whose search fails is
+    remembered and never searched again. If a region pruner is given, states whose groups of free cells can't be
+    tiled with the remaining tiles (see pruning.py) are abandoned straight away. If a search order is given, the tiles
+    and their orientations are tried in that order instead (see heuristics.py).
+    :param board:  (Board)              The board to tile
+    :param tiles:  ([Tile])             The tiles to place
+    :param table:  (TranspositionTable) Memo of states known to have no solution, optional
+    :param pruner: (RegionPruner)       Region feasibility checks, optional
+    :param stats:  (SearchStats)        Counts the skipped duplicate tile types, optional. Everything else is counted
+                                        by the board (see stats.instrumented).
+    :param order:  (SearchOrder)        The value ordering of the tiles and orientations, optional
+    :return:       ([((int, int), Orientation)]) The placements or the empty list if no solution was found
         """
+    if pruner is not None and not pruner.feasible(board.occupancy(), tile_counts(tiles)):
+        return []
+    if table is not None:
+        key = state_key(board.occupancy(), tile_counts(tiles))
+        if table.is_dead(key):
+            return []
+    if order is not None:
+        tiles = order.tiles(tiles, tile_counts(tiles))
     solution = []
     tiles_used = set()
     for i, tile in enumerate(tiles):
         if tile.type in tiles_used:  # Prevent us from trying the same failed piece over and over
+            if stats is not None:
+                stats.prunes['duplicate_type'] += 1
             continue
         tiles_used |= set(tile.type)  # Add the current tile to the set of used tiles
-        for j in range(tile.num_orientations):
-            # Find the most northwestern possible tile position (or False if there isn't one)
-            position = board.tile_can_be_placed(tile)
-            if type(position) == np.ndarray:
+        # Find the most northwestern possible position of each orientation (or False if there isn't one)
+        if order is not None:
+            placements = order.placements(board, tile)
+        else:
+            placements = ((orientation, board.tile_can_be_placed(orientation)) for orientation in tile.orientations)
+        for orientation, position in placements:
+            if position is not False:
                 # If there's a position, place the tile
-                board.place_tile(tile, position)
+                board.place_tile(orientation, position)
                 # It might be the case that the placed tile partitioned the board such that
                 # there is at least one partition that doesn't have a multiple of 4 cells
-                if not board.is_valid():
+                if not board.is_valid(orientation, position):
                     # If that's the case, short circuit the search of this branch
-                    board.remove_tile(tile, position)
-                    tile.rotate()
+                    board.remove_tile(orientation, position)
                     continue
                 # Otherwise, append the tile to the list of possible solutions
-                solution.append((position, tile))
+                solution.append((position, orientation))
                 if board.is_solved():
                     # If the board is now solved, return the solution so it can bubble up
                     return solution
                 # If the board is not solved, call the function recursively, slicing out the current
                 # tile from the list of tiles passed into the recursive call
-                result = tettile(board, tiles[:i] + tiles[i + 1:])
+                result = tettile(board, tiles[:i] + tiles[i + 1:], table, pruner, stats, order)
                 if board.is_solved():
                     # If the recursion found a solution, append it to the solution that contains
                     # the current tile and return that to bubble it up
@@ -153,46 +224,338 @@ def tettile(board: Board, tiles: List[Tile]) -> Union[List[Tuple[Tuple[int, int]
                 else:
                     # If the recursion did not find a solution, remove the current tile from the list
                     # of solutions and from the board.
-                    board.remove_tile(tile, position)
+                    board.remove_tile(orientation, position)
                     solution.pop()
-            # Make sure to try all orientations of a piece at the given location
-            tile.rotate()
-    # Return the empty list if no solution was found
+    # Remember that this state is a dead end and return the empty list since no solution was found
+    if table is not None:
+        table.add(key)
     return solution
 
 
-if __name__ == '__main__':
+def tettile_cells(board: Union['Board', BitBoard], tiles: List[Tile], table: TranspositionTable = None,
+                  pruner: RegionPruner = None, order: SearchOrder = None) -> List[Tuple[Tuple[int, int], Orientation]]:
+    """Attempt to tile the board by always covering the first empty cell
+
+    Rather than picking a tile and then looking for a place to put it, pick the first empty cell in a left-to-right,
+    top-to-bottom scan and try every remaining tile type in every orientation that covers it. Since every cell before
+    it is already covered, the only way to cover it is with the tile's anchor (its most northern, most western cell).
+    That collapses the branching factor to "which piece and orientation covers this cell".
+
+    The remaining tiles are kept as a count per tile type (indexed like tile.TILE_TYPES) that is decremented and
+    incremented as tiles are placed and removed, so no lists are copied at any depth.
+
+    A search order can pick a different empty cell to cover and a different order to try the tiles in (see
+    heuristics.py).
+    :param board:  (Board)              The board to tile. Must be valid (see Board.is_valid) to begin with.
+    :param tiles:  ([Tile])             The tiles to place
+    :param table:  (TranspositionTable) Memo of states known to have no solution, optional (see tettile)
+    :param pruner: (RegionPruner)       Region feasibility checks, optional (see tettile)
+    :param order:  (SearchOrder)        The variable and value ordering, optional
+    :return:       ([((int, int), Orientation)]) The placements or the empty list if no solution was found
+    """
+    counts = tile_counts(tiles)
+    solution = []
+    if _cover_first_empty(board, counts, solution, table, pruner, order):
+        return solution
+    return []
+
+
+def covering_moves(board: Union['Board', BitBoard], cell: Tuple[int, int], counts: List[int]):
+    """
+    Every placement of a remaining tile type that covers an empty cell with the tile's anchor and fits on the board.
+    When cell is the first empty cell these are the only ways to cover it.
+    :param board:  (Board)     The board
+    :param cell:   (int, int)  The (row, col) of the empty cell
+    :param counts: ([int])     The number of tiles remaining of each type, indexed like tile.TILE_TYPES
+    :return:       (generator) (type index, Orientation, position) for each placement
+    """
+    row, col = cell
+    for index, tile_type in enumerate(TILE_TYPES):
+        if not counts[index]:
+            continue
+        for orientation in SHAPES[tile_type]:
+            # Line the tile's anchor up with the empty cell. The anchor is always in the tile's top row.
+            position = (row, col - orientation.cells[0][1])
+            if position[1] >= 0 and board.tile_fits(orientation, position):
+                yield index, orientation, position
+
+
+def _cover_first_empty(board: Union['Board', BitBoard], counts: List[int],
+                       solution: List[Tuple[Tuple[int, int], Orientation]], table: TranspositionTable = None,
+                       pruner: RegionPruner = None, order: SearchOrder = None) -> bool:
+    """
+    The recursive step of tettile_cells. On success the board is left solved and solution holds the placements.
+    :param board:    (Board)              The board to tile
+    :param counts:   ([int])              The number of tiles remaining of each type, indexed like tile.TILE_TYPES
+    :param solution: ([((int, int), Orientation)]) The placements made so far
+    :param table:    (TranspositionTable) Memo of states known to have no solution, optional
+    :param pruner:   (RegionPruner)       Region feasibility checks, optional
+    :param order:    (SearchOrder)        The variable and value ordering, optional
+    :return:         (bool)               True if the board was solved
+    """
+    cell = board.first_empty() if order is None else order.choose_cell(board, counts)
+    if cell is None:
+        return True
+    if cell is False:
+        return False
+    if pruner is not None and not pruner.feasible(board.occupancy(), counts):
+        return False
+    if table is not None:
+        key = state_key(board.occupancy(), counts)
+        if table.is_dead(key):
+            return False
+    moves = covering_moves(board, cell, counts) if order is None else order.moves(board, cell, counts)
+    for index, orientation, position in moves:
+        board.place_tile(orientation, position)
+        if board.is_valid(orientation, position):
+            counts[index] -= 1
+            solution.append((position, orientation))
+            if _cover_first_empty(board, counts, solution, table, pruner, order):
+                return True
+            solution.pop()
+            counts[index] += 1
+        board.remove_tile(orientation, position)
+    if table is not None:
+        table.add(key)
+    return False
+
+
+# The available searches. Each takes a board and a list of tiles and returns a list of (position, tile) placements.
+# The blocks engine may also give up and return None (see blocks.py).
+ENGINES = {
+    'tiles': tettile,
+    'cells': tettile_cells,
+    'dlx': tettile_dlx,
+    'blocks': tettile_blocks,
+    'stack': tettile_stack,
+    'frontier': tettile_frontier,
+}
+# The depth first engines, which accept a transposition table, a region pruner, a search order and search limits, and
+# can search one of each set of symmetric tilings only (see symmetry.py)
+DFS_ENGINES = ('tiles', 'cells')
+# The engines that accept a transposition table, a region pruner and search limits
+LIMITED_ENGINES = DFS_ENGINES + ('stack',)
+
+
+def read_instance(path: str = None) -> Tuple[Tuple[int, int], str]:
+    """
+    Read a single instance: the board size on the first line and the tile types on the second.
+    :param path: (str)             The instance file. Read from stdin if omitted.
+    :return:     ((int, int), str) The board size in (row, col) format and the tile string
+    """
     # Get the data from the file passed as a command line parameter. This was used to facilitate
     # development in the pycharm IDE.
-    if len(sys.argv) > 1:
-        with open(sys.argv[1]) as f:
+    if path:
+        with open(path) as f:
             size, tile_string = f.read().strip().split('\n')
         size = tuple(map(int, size.split(' ')))
     else:  # I expect stdin to be redirected at runtime
         size = tuple(map(int, input().split(' ')))
         tile_string = input()
+    return size, tile_string
+
 
+def passes_prechecks(size: Tuple[int, int], tile_string: str) -> bool:
+    """
+    The checks that rule out an instance before any search (see the reasons listed in board.py).
+    :param size:        (int, int) The board size in (row, col) format
+    :param tile_string: (str)      The tile types to place
+    :return:            (bool)     False if the instance certainly has no solution
+    """
     # Validate the number of cells is divisble by 4
-    if np.prod(size) % 4 != 0:
-        print('?')
-        exit()
+    if size[0] * size[1] % 4 != 0:
+        return False
 
     # Validate that the number of tiles is appropriate for this board
-    if len(tile_string) != np.prod(size) / 4:
-        print('?')
-        exit()
+    if len(tile_string) != size[0] * size[1] / 4:
+        return False
 
     # There must be an even number of Ts
     tiles_counter = Counter(tile_string)
     if tiles_counter['T'] % 2 != 0:
-        print('?')
-        exit()
-
-    board = Board(size)
+        return False
+    return True
+
+
+def solve(size: Tuple[int, int], tile_string: str, backend: str = 'bitboard', engine: str = 'tiles',
+          table: TranspositionTable = None, prune_regions: bool = False, stats: SearchStats = None,
+          limits: SearchLimits = None, output_format: str = 'diagram', cache: SolutionCache = None,
+          order: SearchOrder = None, symmetric: bool = False, checkpoint: Checkpoint = None) -> Union[str, bytes]:
+    """
+    Solve a single instance and return the printable result.
+    :param size:        (int, int)           The board size in (row, col) format
+    :param tile_string: (str)                The tile types to place, e.g. 'OOI22TTLLPPP'
+    :param backend:     (str)                Which board implementation to search with. One of BACKENDS.
+    :param engine:      (str)                Which search to run. One of ENGINES.
+    :param table:       (TranspositionTable) Memo of dead states, only for the engines in LIMITED_ENGINES. Optional.
+    :param prune_regions: (bool)             Use the region feasibility checks, only for the engines in
+                                             LIMITED_ENGINES.
+    :param stats:       (SearchStats)        Record what the search does into this, optional (see stats.py)
+    :param limits:      (SearchLimits)       Time, node and cancellation limits, only for the engines in
+                                             LIMITED_ENGINES. Optional (see limits.py).
+    :param output_format: (str)              How to write the result. One of output.FORMATS.
+    :param cache:       (SolutionCache)      Answer repeated instances from this and remember new answers. Optional
+                                             (see cache.py).
+    :param order:       (SearchOrder)        The branching heuristics, only for the engines in DFS_ENGINES, and only
+                                             the value ordering for the tiles engine. Optional (see heuristics.py).
+    :param symmetric:   (bool)               Search one of each set of symmetric tilings only, only for the engines in
+                                             DFS_ENGINES (see symmetry.py)
+    :param checkpoint:  (Checkpoint)         Save the search state to this and resume from it, only for the stack
+                                             engine. Optional (see resumable.py).
+    :return:            (str)                The solution diagram, '?' if there is no solution or UNKNOWN if a limit
+                                             was hit before the search finished. The other formats give a str or, for
+                                             'binary', bytes (see output.py).
+    """
+    write = FORMATS[output_format]
+    if not passes_prechecks(size, tile_string):
+        return write(size, [])
+
+    board_class = BACKENDS[backend]
+    if stats is not None:
+        board_class = instrumented(board_class, stats)
+    if limits is not None:
+        if engine not in LIMITED_ENGINES:
+            raise ValueError('ERROR: the {} engine does not take search limits'.format(engine))
+        board_class = limited(board_class, limits)
+    board = board_class(size)
     tiles = gen_tiles(tile_string)
 
     # Attempt to find a solution
-    solution = tettile(board, tiles)
-    # Print the solution or ?
-    print(Board().gen_board_output(board.board_size, solution))
+    options = {}
+    if table is not None:
+        options['table'] = table
+    if prune_regions:
+        options['pruner'] = RegionPruner(size)
+    if order is not None:
+        if engine == 'tiles' and order.cell != 'first':
+            raise ValueError('ERROR: the tiles engine places tiles, it has no cell order')
+        options['order'] = order
+    if symmetric and engine not in DFS_ENGINES:
+        raise ValueError('ERROR: the {} engine does not break symmetries'.format(engine))
+    if checkpoint is not None:
+        options['checkpoint'] = checkpoint
+    # The engines that accept each option
+    accepted = {'table': LIMITED_ENGINES, 'pruner': LIMITED_ENGINES, 'order': DFS_ENGINES, 'checkpoint': ('stack',)}
+    unsupported = [name for name in options if engine not in accepted[name]]
+    if unsupported:
+        raise ValueError('ERROR: the {} engine does not take the {} option(s)'.format(engine, ', '.join(unsupported)))
+    if stats is not None and engine == 'tiles':
+        options['stats'] = stats
+    solution = cache.get(size, tile_string) if cache is not None else None
+    if solution is None:
+        if prune_regions and not options['pruner'].feasible(board.occupancy(), tile_counts(tiles)):
+            solution = []
+        else:
+            try:
+                if symmetric:
+                    solution = break_symmetry(ENGINES[engine], board, tiles, **options)
+                else:
+                    solution = ENGINES[engine](board, tiles, **options)
+            except SearchInterrupted:
+                solution = None
+        if cache is not None and solution is not None:
+            cache.put(size, tile_string, solution)
+    # Return the solution, ? or UNKNOWN
+    if output_format == 'diagram':
+        return board.gen_board_output(board.board_size, solution)
+    return write(board.board_size, solution)
 
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Tetromino tiling solver')
+    parser.add_argument('input', nargs='?', help='Instance file. Read from stdin if omitted.')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='bitboard',
+                        help='Board implementation to search with (default: bitboard)')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='tiles',
+                        help='Search to run: tiles tries each remaining tile in turn, cells always covers the first '
+                             'empty cell, dlx solves it as an exact cover problem, blocks tiles a large board block by '
+                             'block, stack is tiles with a search that can be checkpointed, frontier sweeps the board '
+                             'with dynamic programming (default: tiles)')
+    parser.add_argument('--prune-regions', action='store_true',
+                        help='Check the groups of free cells against the remaining tiles (tiles, cells and stack '
+                             'engines only)')
+    parser.add_argument('--break-symmetry', action='store_true',
+                        help='Search one of each set of turned or mirrored tilings only (tiles and cells engines only)')
+    parser.add_argument('--stats', action='store_true', help='Print what the search did to stderr')
+    parser.add_argument('--cell-order', choices=CELL_ORDERS, default='first',
+                        help='Which empty cell to cover next: the first one or the one with the fewest covering '
+                             'placements (cells engine only, default: first)')
+    parser.add_argument('--value-order', choices=VALUE_ORDERS, default='input',
+                        help='Which tile to try first: in input order, the scarcest type or the placement leaving the '
+                             'fewest pockets (tiles and cells engines only, default: input)')
+    parser.add_argument('--output', choices=sorted(FORMATS), default='diagram',
+                        help='Print the assignment\'s diagram, a JSON list of placements, run-length encoded label '
+                             'rows or a binary label array (default: diagram)')
+    parser.add_argument('--timeout', type=float, metavar='SECONDS',
+                        help='Give up and print "{}" after this long (tiles, cells and stack engines only)'.format(
+                            UNKNOWN))
+    parser.add_argument('--max-nodes', type=int, metavar='N',
+                        help='Give up and print "{}" after placing N tiles (tiles, cells and stack engines '
+                             'only)'.format(UNKNOWN))
+    parser.add_argument('--memo-entries', type=int, metavar='N',
+                        help='Remember up to N dead search states (tiles, cells and stack engines only)')
+    parser.add_argument('--cache', metavar='FILE',
+                        help='Look the instance up in this solution cache, and store the answer if it isn\'t there')
+    parser.add_argument('--cache-entries', type=int, metavar='N', help='Keep up to N instances in the cache')
+    parser.add_argument('--cache-bytes', type=int, metavar='N', help='Keep the cache to about N bytes')
+    parser.add_argument('--memo-bytes', type=int, metavar='N',
+                        help='Remember dead search states using up to about N bytes (tiles, cells and stack engines '
+                             'only)')
+    parser.add_argument('--checkpoint', metavar='FILE',
+                        help='Save the search to FILE on SIGUSR1, and before stopping on SIGTERM, ^C or a limit. '
+                             'Carry on from FILE if it exists (stack engine only).')
+    parser.add_argument('--checkpoint-interval', type=float, metavar='SECONDS',
+                        help='Also save the search every SECONDS (stack engine only)')
+    args = parser.parse_args()
+
+    order = None
+    if args.cell_order != 'first' or args.value_order != 'input':
+        order = SearchOrder(args.cell_order, args.value_order)
+    if args.engine not in LIMITED_ENGINES and (args.prune_regions or args.memo_entries or args.memo_bytes
+                                               or args.timeout or args.max_nodes):
+        parser.error('--prune-regions, --timeout, --max-nodes, --memo-entries and --memo-bytes need one of the '
+                     'engines: {}'.format(', '.join(LIMITED_ENGINES)))
+    if args.engine not in DFS_ENGINES and (order or args.break_symmetry):
+        parser.error('--break-symmetry, --cell-order and --value-order need one of the engines: {}'.format(
+            ', '.join(DFS_ENGINES)))
+    if args.engine != 'stack' and (args.checkpoint or args.checkpoint_interval):
+        parser.error('--checkpoint and --checkpoint-interval need the stack engine')
+    if args.checkpoint_interval is not None and args.checkpoint is None:
+        parser.error('--checkpoint-interval needs --checkpoint')
+    if args.engine == 'tiles' and args.cell_order != 'first':
+        parser.error('--cell-order needs the cells engine')
+    limits = None
+    if args.timeout is not None or args.max_nodes is not None:
+        limits = SearchLimits(deadline=args.timeout, max_nodes=args.max_nodes)
+    table = None
+    if args.memo_entries is not None or args.memo_bytes is not None:
+        table = TranspositionTable(max_entries=args.memo_entries, max_bytes=args.memo_bytes)
+    cache = None
+    if args.cache is not None:
+        cache = SolutionCache(args.cache, max_entries=args.cache_entries, max_bytes=args.cache_bytes)
+    checkpoint = None
+    if args.checkpoint is not None:
+        checkpoint = Checkpoint(args.checkpoint, interval=args.checkpoint_interval)
+        checkpoint.handle_signals()
+
+    size, tile_string = read_instance(args.input)
+    # Print the solution or ?
+    stats = SearchStats() if args.stats else None
+    result = solve(size, tile_string, backend=args.backend, engine=args.engine, table=table,
+                   prune_regions=args.prune_regions, stats=stats, limits=limits, output_format=args.output,
+                   cache=cache, order=order, symmetric=args.break_symmetry, checkpoint=checkpoint)
+    if isinstance(result, bytes):
+        sys.stdout.buffer.write(result)
+    else:
+        print(result)
+    if limits is not None and limits.stopped is not None:
+        print('search stopped: {} limit reached'.format(limits.stopped), file=sys.stderr)
+    if table is not None:
+        print(table, file=sys.stderr)
+    if checkpoint is not None:
+        print(checkpoint, file=sys.stderr)
+    if cache is not None:
+        print(cache, file=sys.stderr)
+        cache.close()
+    if stats is not None:
+        print(stats, file=sys.stderr)
@@ -37,32 +37,192 @@ Note: Each tetromino, except for the 'O', can be rotated into at least 2 and up
 
 """
 
-import numpy as np
-from typing import List, Tuple, Union
+from typing import Iterable, List, Sequence, Tuple, Union
 
 __author__ = "Mike"
 __email__ = "mikelane@gmail.com"
 __copyright__ = "Copyright 2017, Mike"
 __license__ = "MIT"
-__all__ = ['Tile', 'tile_factory', 'gen_tiles']
+__all__ = ['Tile', 'Orientation', 'SHAPES', 'find_orientation', 'tile_factory', 'gen_tiles', 'tile_counts',
+           'TILE_TYPES']
+
+# Every tile type in the order they are described above
+TILE_TYPES = 'I52TLPO'
+
+
+class Orientation:
+    """A single orientation of a tile type
+
+    Orientations are built once, when this module is imported, and shared by every Tile of that type. They are frozen:
+    the face and anchor arrays are read only and no attribute can be reassigned.
+
+    Only the standard library is needed to build them. The face and anchor numpy arrays used by the numpy Board are
+    built the first time they are asked for, so the bitboard search never imports numpy.
+    """
+    __slots__ = ('type', 'index', 'rows', 'shape', 'cells', '_face', '_anchor')
+
+    def __init__(self, tile_type: str, index: int, face: Sequence[Sequence[int]]) -> None:
+        """
+        Orientation constructor
+        :param tile_type: (str)     The type of tile. Can be one of 'I', '5', '2', 'T', 'L', 'P', or 'O'
+        :param index:     (int)     Which orientation of the tile type this is
+        :param face:      ([[int]]) The tile data for this orientation, as nested lists or a numpy array
+        """
+        rows = tuple(tuple(int(value) for value in row) for row in face)
+        object.__setattr__(self, 'type', tile_type)
+        object.__setattr__(self, 'index', index)
+        object.__setattr__(self, 'rows', rows)
+        object.__setattr__(self, 'shape', (len(rows), len(rows[0])))
+        # The covered cells as (row, col) offsets from the top left corner of the face. The first one is the anchor,
+        # the most northern and most western 1.
+        object.__setattr__(self, 'cells', tuple((r, c) for r, row in enumerate(rows)
+                                                for c, value in enumerate(row) if value == 1))
+        object.__setattr__(self, '_face', None)
+        object.__setattr__(self, '_anchor', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Orientation is immutable')
+
+    def __reduce__(self):
+        # Unpickle to the shared Orientation in the shape library rather than a copy, which __setattr__ would refuse
+        return _lookup, (self.type, self.index)
+
+    def __repr__(self) -> str:
+        return 'Orientation({!r}, {})'.format(self.type, self.index)
+
+    @property
+    def face(self) -> 'numpy.ndarray':
+        """
+        :return: (numpy.ndarray) The tile data as a read only array
+        """
+        if self._face is None:
+            import numpy as np
+            face = np.array(self.rows)
+            face.setflags(write=False)
+            object.__setattr__(self, '_face', face)
+        return self._face
+
+    @property
+    def anchor(self) -> 'numpy.ndarray':
+        """
+        :return: (numpy.ndarray) The (row, col) of the anchor as a read only array
+        """
+        if self._anchor is None:
+            import numpy as np
+            anchor = np.array(self.cells[0])
+            anchor.setflags(write=False)
+            object.__setattr__(self, '_anchor', anchor)
+        return self._anchor
+
+    @property
+    def orientation(self) -> 'Orientation':
+        """
+        An orientation is its own orientation. This lets the boards accept either a Tile or an Orientation.
+        :return: (Orientation) self
+        """
+        return self
+
+
+def _rotate(face: Tuple[Tuple[int, ...], ...]) -> Tuple[Tuple[int, ...], ...]:
+    """
+    :param face: ((int, ...), ...) The tile data
+    :return:     ((int, ...), ...) The tile data rotated 90 degrees counterclockwise, like numpy.rot90
+    """
+    return tuple(zip(*face))[::-1]
+
+
+def _build_orientations(tile_type: str, face: List[List[int]], num_orientations: int) -> Tuple[Orientation, ...]:
+    """
+    Rotate a tile's face through each of its distinct orientations.
+    :param tile_type:        (str)           The type of tile
+    :param face:             ([[int]])       The tile data in its starting orientation
+    :param num_orientations: (int)           The number of distinct orientations for this tile
+    :return:                 (Orientation, ) Every orientation of the tile in rotation order
+    """
+    face = tuple(tuple(row) for row in face)
+    orientations = []
+    for index in range(num_orientations):
+        orientations.append(Orientation(tile_type, index, face))
+        face = _rotate(face)
+    return tuple(orientations)
+
+
+# The shape library. Every distinct orientation of every tile type, in the order Tile.rotate() visits them.
+SHAPES = {
+    'I': _build_orientations('I', [[1], [1], [1], [1]], num_orientations=2),
+    '5': _build_orientations('5', [[0, 1, 1], [1, 1, 0]], num_orientations=2),
+    '2': _build_orientations('2', [[1, 1, 0], [0, 1, 1]], num_orientations=2),
+    'T': _build_orientations('T', [[1, 1, 1], [0, 1, 0]], num_orientations=4),
+    'L': _build_orientations('L', [[1, 0], [1, 0], [1, 1]], num_orientations=4),
+    'P': _build_orientations('P', [[1, 1], [1, 0], [1, 0]], num_orientations=4),
+    'O': _build_orientations('O', [[1, 1], [1, 1]], num_orientations=1),
+}
+
+
+# Every orientation by the cells it covers, sorted and relative to the top left corner of its bounding box
+_BY_CELLS = {orientation.cells: orientation for orientations in SHAPES.values() for orientation in orientations}
+
+
+def find_orientation(cells: Iterable[Tuple[int, int]]) -> Union[Tuple[Tuple[int, int], Orientation], None]:
+    """
+    :param cells: ((int, int), ...) Cells of the board
+    :return:      ((int, int), Orientation) The placement covering exactly those cells, or None if they aren't a
+                                            tetromino
+    """
+    cells = list(cells)
+    top = min(r for r, _ in cells)
+    left = min(c for _, c in cells)
+    orientation = _BY_CELLS.get(tuple(sorted((r - top, c - left) for r, c in cells)))
+    return ((top, left), orientation) if orientation is not None else None
+
+
+def _lookup(tile_type: str, index: int) -> Orientation:
+    """
+    :param tile_type: (str) The type of tile
+    :param index:     (int) Which orientation of the tile type
+    :return:          (Orientation) The orientation from the shape library
+    """
+    return SHAPES[tile_type][index]
 
 
 class Tile:
-    """The base tile class"""
+    """The base tile class
 
-    def __init__(self, tile_type: str, face: np.ndarray, num_orientations: int, orientation: int = 0) -> None:
+    A Tile is a lightweight reference into the shape library: its type plus the index of its current orientation.
+    Rotating a tile just moves the index, the face, shape and anchor are looked up from the shared Orientation.
+    """
+    __slots__ = ('type', 'orientations', 'num_orientations', 'current_orientation')
+
+    def __init__(self, tile_type: str, orientation: int = 0) -> None:
         """
-        Tile constructor. Defaults to an 'O' tile
-        :param tile_type:        (str)           The type of tile. Can be one of 'I', '5', '2', 'T', 'L', 'P', or 'O'
-        :param face:             (numpy.ndarray) The tile data is stored as a numpy ndarray
-        :param num_orientations: (int)           The number of possible orientations for this tile 
+        Tile constructor
+        :param tile_type:   (str) The type of tile. Can be one of 'I', '5', '2', 'T', 'L', 'P', or 'O'
+        :param orientation: (int) The index of the starting orientation
         """
         self.type = tile_type
-        self.face = face
-        self.shape = face.shape
-        self.num_orientations = num_orientations
-        self.current_orientation = orientation
-        self.anchor = np.argwhere(self.face == 1)[0]
+        self.orientations = SHAPES[tile_type]
+        self.num_orientations = len(self.orientations)
+        self.current_orientation = orientation % self.num_orientations
+
+    @property
+    def orientation(self) -> Orientation:
+        return self.orientations[self.current_orientation]
+
+    @property
+    def face(self) -> 'numpy.ndarray':
+        return self.orientations[self.current_orientation].face
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.orientations[self.current_orientation].shape
+
+    @property
+    def anchor(self) -> 'numpy.ndarray':
+        return self.orientations[self.current_orientation].anchor
+
+    @property
+    def cells(self) -> Tuple[Tuple[int, int], ...]:
+        return self.orientations[self.current_orientation].cells
 
     def __str__(self) -> str:
         """
@@ -75,58 +235,65 @@ class Tile:
         return '{}'.format(type(self))
 
     def __eq__(self, other):
-        return (self.type == other.type) \
-               and (np.all(self.face == other.face)) \
-               and (self.num_orientations == other.num_orientations) \
-               and (self.current_orientation == other.current_orientation) \
-               and (np.all(self.anchor == other.anchor))
+        return (self.type == other.type) and (self.current_orientation == other.current_orientation)
 
     def rotate(self):
         """
-        Rotate the tile 90 degrees and update the current orientation and the tile's shape (height, width)
+        Rotate the tile 90 degrees by moving on to its next orientation
         :return: (Tile) Returns self to facilitate residual calculations
         """
-        self.face = np.rot90(self.face)
         self.current_orientation = (self.current_orientation + 1) % self.num_orientations
-        self.shape = self.face.shape
-        self.anchor = np.argwhere(self.face == 1)[0]  # Picks the most northern and most western 1
         return self
 
 
 # Collection of specific tile classes
 class OTile(Tile):
+    __slots__ = ()
+
     def __init__(self):
-        super().__init__('O', np.ones((2, 2), np.int), num_orientations=1)
+        super().__init__('O')
 
 
 class ITile(Tile):
+    __slots__ = ()
+
     def __init__(self):
-        super().__init__('I', np.ones((4, 1), np.int), num_orientations=2)
+        super().__init__('I')
 
 
 class LTile(Tile):
+    __slots__ = ()
+
     def __init__(self):
-        super().__init__('L', np.array([[1, 0], [1, 0], [1, 1]]), num_orientations=4)
+        super().__init__('L')
 
 
 class PTile(Tile):
+    __slots__ = ()
+
     def __init__(self):
-        super().__init__('P', np.array([[1, 1], [1, 0], [1, 0]]), num_orientations=4)
+        super().__init__('P')
 
 
 class TwoTile(Tile):
+    __slots__ = ()
+
     def __init__(self):
-        super().__init__('2', np.array([[1, 1, 0], [0, 1, 1]]), num_orientations=2)
+        super().__init__('2')
 
 
 class FiveTile(Tile):
+    __slots__ = ()
+
     def __init__(self):
-        super().__init__('5', np.array([[0, 1, 1], [1, 1, 0]]), num_orientations=2)
+        super().__init__('5')
 
 
 class TTile(Tile):
+    __slots__ = ()
+
     def __init__(self):
-        super().__init__('T', np.array([[1, 1, 1], [0, 1, 0]]), num_orientations=4)
+        super().__init__('T')
 
 
 def tile_factory(tile_type: str) -> Tile:
@@ -166,13 +333,25 @@ def gen_tiles(input_str: str) -> Union[List, List[Tuple[str, Tile]]]:
     return [tile_factory(c) for c in input_str]
 
 
+def tile_counts(tiles: Union[str, List[Tile]]) -> List[int]:
+    """
+    Count the tiles of each type.
+    :param tiles: (str or [Tile]) The tiles, or a string of tile types
+    :return:      ([int])         The number of tiles of each type, indexed like TILE_TYPES
+    """
+    counts = [0] * len(TILE_TYPES)
+    for tile in tiles:
+        counts[TILE_TYPES.index(getattr(tile, 'type', tile))] += 1
+    return counts
+
+
 if __name__ == '__main__':
     from pprint import pprint
 
     tiles = gen_tiles('OILP25T')
     pprint(tiles)
     print('-' * 100, '\n')
-    for _, tile in tiles:
+    for tile in tiles:
         for i in range(tile.num_orientations):
             print(tile)
             tile.rotate()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""HW 1 - Tetrominos: Transposition table
+
+CS542
+Michael Lane
+Homework 1: Tetrominos
+Due: 10 April 2017
+
+Different placement orders often lead to exactly the same sub-problem: the same cells are covered and the same tile
+types remain. With repeated pieces (TTTT, IIII, ...) this happens constantly. Whether a sub-problem can be solved only
+depends on the board occupancy and the remaining tile counts, so once a sub-search fails we remember that state and
+never search it again.
+
+The key is a single integer: the free cells bitmask shifted left, with the remaining count of each tile type packed
+into 5 bits per type underneath (there are at most 26 tiles, so 5 bits is plenty). It is exact, so a hit can never
+prune a solvable branch.
+
+The table is bounded by a number of entries and/or an approximate number of bytes. When full, the least recently
+used entry is evicted.
+"""
+
+import sys
+from collections import OrderedDict
+
+from typing import Sequence
+
+__author__ = "Michael Lane"
+__email__ = "mikelane@gmail.com"
+__copyright__ = "Copyright 2017, Michael Lane"
+__license__ = "MIT"
+__all__ = ['TranspositionTable', 'state_key']
+
+COUNT_BITS = 5
+# Rough cost of an OrderedDict entry on top of the key itself: the hash table slot and the linked list node
+ENTRY_OVERHEAD = 100
+
+
+def state_key(occupancy: int, counts: Sequence[int]) -> int:
+    """
+    Pack a search state into a single integer.
+    :param occupancy: (int)   The free cells of the board as a bitmask (see BitBoard.occupancy / Board.occupancy)
+    :param counts:    ([int]) The number of tiles remaining of each type, indexed like tile.TILE_TYPES
+    :return:          (int)   The key
+    """
+    key = occupancy
+    for count in counts:
+        key = (key << COUNT_BITS) | count
+    return key
+
+
+class TranspositionTable:
+    """A bounded, least recently used memo of search states that are known to have no solution"""
+
+    def __init__(self, max_entries: int = None, max_bytes: int = None) -> None:
+        """
+        Create an empty table. With no limits the table grows without bound.
+        :param max_entries: (int) Maximum number of states to remember
+        :param max_bytes:   (int) Approximate maximum memory use in bytes
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __str__(self) -> str:
+        lookups = self.hits + self.misses
+        return 'transposition table: {} entries (~{} bytes), {} hits, {} misses ({:.1%} hit rate), {} evictions'.format(
+            len(self), self.bytes, self.hits, self.misses, self.hits / lookups if lookups else 0, self.evictions)
+
+    def is_dead(self, key: int) -> bool:
+        """
+        Look up a state, counting the hit or miss. A hit makes the entry the most recently used.
+        :param key: (int)  The state key (see state_key)
+        :return:    (bool) True if the state is known to have no solution
+        """
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def add(self, key: int) -> None:
+        """
+        Remember that a state has no solution, evicting the least recently used states if the table is over budget.
+        :param key: (int) The state key (see state_key)
+        """
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return
+        size = sys.getsizeof(key) + ENTRY_OVERHEAD
+        self.entries[key] = size
+        self.bytes += size
+        self.stores += 1
+        while self.entries and ((self.max_entries is not None and len(self.entries) > self.max_entries)
+                                or (self.max_bytes is not None and self.bytes > self.max_bytes)):
+            _, size = self.entries.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.bytes = 0
+